@@ -1,3 +1,4 @@
+from common.admin import WebhookRequestAdminMixin
 from django.conf import settings
 from django.contrib import admin, messages
 from django.db.models import QuerySet
@@ -5,20 +6,26 @@ from django.http import HttpRequest
 from django.utils.html import format_html
 from message_sender.client import AtlasMessageSender
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, AsyncAsanaApiClient
 from asana.client.exception import AsanaApiClientError
 from asana.constants import ATLAS_WORKSPACE_ID
+from asana.identity_cache import get_shared_user_identity_cache
 from asana.repository import AsanaUserRepository
 from asana.utils import get_asana_profile_url_by_id
 
-from .models import AsanaWebhook, AsanaWebhookRequestData, AtlasAsanaUser, WebhookHandler
+from .models import AsanaEventSyncToken, AsanaWebhook, AsanaWebhookRequestData, AtlasAsanaUser, WebhookHandler
 
 message_sender = AtlasMessageSender(
     host=settings.MESSAGE_SENDER_HOST,
     api_key=settings.DOMAIN_MESSAGE_API_KEY,
 )
 asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
-asana_user_repository = AsanaUserRepository(api_client=asana_api_client)
+async_asana_api_client = AsyncAsanaApiClient(api_key=settings.ASANA_API_KEY)
+asana_user_repository = AsanaUserRepository(
+    api_client=asana_api_client,
+    async_api_client=async_asana_api_client,
+    identity_cache=get_shared_user_identity_cache(),
+)
 
 
 @admin.register(AtlasAsanaUser)
@@ -36,7 +43,7 @@ class AtlasUserAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_display_links = ("email", "name")
     list_filter = ("position",)
     search_fields = ("email", "name")
-    actions = ("update_asana_users",)
+    actions = ("update_asana_users", "revalidate_avatars")
     autocomplete_fields = ("owner",)
 
     @admin.display(description="Avatar")
@@ -65,6 +72,11 @@ class AtlasUserAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         except AsanaApiClientError as error:
             self.message_user(request, f"Не удалось обновить пользователей: {error}", level=messages.ERROR)
 
+    @admin.action(description="Перепроверить аватары")
+    def revalidate_avatars(self, request: HttpRequest, queryset: QuerySet[AtlasAsanaUser]) -> None:
+        result = asana_user_repository.avatar_service.sync(users=queryset, revalidate=True)
+        self.message_user(request, f"Успешно, {result}", level=messages.SUCCESS)
+
 
 @admin.register(WebhookHandler)
 class WebhookHandlerAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
@@ -81,6 +93,19 @@ class WebhookHandlerAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         return False
 
 
+@admin.register(AsanaEventSyncToken)
+class AsanaEventSyncTokenAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Delete token to force full rescan of resource on next sync."""
+
+    list_display = ("id", "resource_type", "resource_id", "updated")
+    list_filter = ("resource_type",)
+    readonly_fields = ("resource_id", "resource_type", "sync_token", "updated")
+
+    def has_add_permission(self, request: HttpRequest, obj: AsanaEventSyncToken | None = None) -> bool:
+        _ = request, obj
+        return False
+
+
 @admin.register(AsanaWebhook)
 class AsanaWebhookAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = (
@@ -106,7 +131,7 @@ class AsanaWebhookAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
 
 
 @admin.register(AsanaWebhookRequestData)
-class AsanaWebhookRequestDataAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+class AsanaWebhookRequestDataAdmin(WebhookRequestAdminMixin, admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = (
         "id",
         "webhook",
@@ -114,5 +139,6 @@ class AsanaWebhookRequestDataAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         "created",
     )
     list_filter = ("webhook", "status")
-    readonly_fields = ("headers", "payload", "additional_data", "created")
+    list_select_related = ("webhook",)
+    readonly_fields = ("headers", "payload", "additional_data", "archived_request_data", "created")
     ordering = ("-created",)
@@ -9,7 +9,7 @@ class AsanaConfig(AppConfig):
     name = "asana"
 
     def ready(self) -> None:
-        from asana import webhook_actions
+        from asana import signals, webhook_actions  # noqa: F401
 
         package = webhook_actions
 
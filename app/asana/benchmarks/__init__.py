@@ -0,0 +1,4 @@
+"""Benchmarks of asana integration on synthetic workspace served by fake asana api.
+
+Run: python manage.py benchmark_asana --scales 100 1000 10000 --output benchmark.json
+"""
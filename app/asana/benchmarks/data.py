@@ -0,0 +1,203 @@
+"""Synthetic asana workspace built from recorded responses in fixtures/.
+
+Objects are not stored: every object is rendered from fixture by its gid,
+so data of 10k tasks costs nothing until requested. Module must not import django,
+it is loaded by fake server process.
+"""
+
+import copy
+import json
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+WORKSPACE_ID = "1167322787740055"
+PROJECT_ID = "1206100000000001"
+CUSTOM_FIELD_BAYER_NAME = "Инициалы Баера"
+
+USER_GID_BASE = 1205000000000000
+MEMBERSHIP_GID_BASE = 1205010000000000
+SECTION_GID_BASE = 1206000000000000
+TASK_GID_BASE = 1207000000000000
+SUBTASK_GID_BASE = 1207100000000000
+STORY_GID_BASE = 1209000000000000
+# gids of task children: base + task index * CHILDREN_PER_TASK + child index
+CHILDREN_PER_TASK = 10
+
+
+@cache
+def load_fixture(name: str) -> dict[str, Any]:
+    with (FIXTURES_DIR / f"{name}.json").open(encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _fixture(name: str) -> dict[str, Any]:
+    return copy.deepcopy(load_fixture(name))
+
+
+def _index(gid: str, base: int, count: int) -> int | None:
+    """Return 1-based index of object by gid, None if object not exists."""
+    try:
+        index = int(gid) - base
+    except ValueError:
+        return None
+    return index if 1 <= index <= count else None
+
+
+@dataclass(frozen=True)
+class FakeAsanaData:
+    """Workspace with `members` users and one project with `tasks` tasks split by sections."""
+
+    members: int
+    tasks: int
+    tasks_per_section: int = 500
+    comments_per_task: int = 2
+    system_stories_per_task: int = 1
+    subtasks_per_task: int = 2
+
+    @property
+    def sections(self) -> int:
+        return max(1, -(-self.tasks // self.tasks_per_section))
+
+    def membership_ids(self) -> list[str]:
+        return [str(MEMBERSHIP_GID_BASE + index) for index in range(1, self.members + 1)]
+
+    def section_ids(self) -> list[str]:
+        return [str(SECTION_GID_BASE + index) for index in range(1, self.sections + 1)]
+
+    def task_ids(self) -> list[str]:
+        return [str(TASK_GID_BASE + index) for index in range(1, self.tasks + 1)]
+
+    def comment_ids(self, task_id: str) -> list[str]:
+        task_index = _index(task_id, TASK_GID_BASE, self.tasks)
+        if task_index is None:
+            return []
+        return [str(STORY_GID_BASE + task_index * CHILDREN_PER_TASK + k) for k in range(1, self.comments_per_task + 1)]
+
+    def _user_ref(self, user_index: int) -> dict[str, Any]:
+        return {"gid": str(USER_GID_BASE + user_index), "resource_type": "user", "name": f"User {user_index}"}
+
+    def _section_ref(self, section_index: int) -> dict[str, Any]:
+        return {
+            "gid": str(SECTION_GID_BASE + section_index),
+            "resource_type": "section",
+            "name": f"Section {section_index}",
+        }
+
+    def _task_section_index(self, task_index: int) -> int:
+        return (task_index - 1) // self.tasks_per_section + 1
+
+    def _task_user_index(self, task_index: int) -> int:
+        return (task_index - 1) % max(1, self.members) + 1
+
+    def workspace_membership(self, gid: str) -> dict[str, Any] | None:
+        index = _index(gid, MEMBERSHIP_GID_BASE, self.members)
+        if index is None:
+            return None
+        membership = _fixture("workspace_membership")
+        membership["gid"] = gid
+        membership["user"] = self._user_ref(index)
+        return membership
+
+    def workspace_memberships(self) -> list[dict[str, Any]]:
+        return [
+            {"gid": gid, "resource_type": "workspace_membership", "user": self._user_ref(index)}
+            for index, gid in enumerate(self.membership_ids(), start=1)
+        ]
+
+    def user_workspace_memberships(self, user_gid: str) -> list[dict[str, Any]] | None:
+        index = _index(user_gid, USER_GID_BASE, self.members)
+        if index is None:
+            return None
+        membership = self.workspace_membership(str(MEMBERSHIP_GID_BASE + index))
+        return [membership] if membership is not None else []
+
+    def user(self, gid: str, avatar_base_url: str) -> dict[str, Any] | None:
+        index = _index(gid, USER_GID_BASE, self.members)
+        if index is None:
+            return None
+        user = _fixture("user")
+        user["gid"] = gid
+        user["name"] = f"User {index}"
+        user["email"] = f"user{index}@example.com"
+        user["photo"] = {size: f"{avatar_base_url}avatars/{gid}.{size[6:]}.png" for size in user["photo"]}
+        return user
+
+    def project_sections(self) -> list[dict[str, Any]]:
+        sections = []
+        for index in range(1, self.sections + 1):
+            section = _fixture("section")
+            section.update(self._section_ref(index))
+            sections.append(section)
+        return sections
+
+    def section_tasks(self, section_gid: str) -> list[dict[str, Any]] | None:
+        section_index = _index(section_gid, SECTION_GID_BASE, self.sections)
+        if section_index is None:
+            return None
+        first = (section_index - 1) * self.tasks_per_section + 1
+        last = min(self.tasks, section_index * self.tasks_per_section)
+        return [
+            {"gid": str(TASK_GID_BASE + index), "resource_type": "task", "name": f"Task {index}"}
+            for index in range(first, last + 1)
+        ]
+
+    def task(self, gid: str) -> dict[str, Any] | None:
+        index = _index(gid, TASK_GID_BASE, self.tasks)
+        if index is None:
+            return None
+        task = _fixture("task")
+        task["gid"] = gid
+        task["name"] = f"Task {index}"
+        task["permalink_url"] = f"https://app.asana.com/0/{PROJECT_ID}/{gid}"
+        task["assignee"] = self._user_ref(self._task_user_index(index))
+        task["memberships"][0]["section"] = self._section_ref(self._task_section_index(index))
+        return task
+
+    def subtasks(self, task_gid: str) -> list[dict[str, Any]] | None:
+        task_index = _index(task_gid, TASK_GID_BASE, self.tasks)
+        if task_index is None:
+            return None
+        subtasks = []
+        for k in range(1, self.subtasks_per_task + 1):
+            subtask = _fixture("subtask")
+            subtask["gid"] = str(SUBTASK_GID_BASE + task_index * CHILDREN_PER_TASK + k)
+            subtask["name"] = f"Adaptation {k} of task {task_index}"
+            subtasks.append(subtask)
+        return subtasks
+
+    def _story(self, task_index: int, k: int) -> dict[str, Any]:
+        is_comment = k <= self.comments_per_task
+        story = _fixture("story_comment" if is_comment else "story_system")
+        story["gid"] = str(STORY_GID_BASE + task_index * CHILDREN_PER_TASK + k)
+        story["target"]["gid"] = str(TASK_GID_BASE + task_index)
+        user_index = self._task_user_index(task_index + k)
+        story["created_by"] = self._user_ref(user_index)
+        if is_comment:
+            # mention of other workspace member
+            mentioned = str(MEMBERSHIP_GID_BASE + self._task_user_index(task_index + k + 1))
+            story["text"] = (
+                f"Please check https://app.asana.com/1/{WORKSPACE_ID}/profile/{mentioned} "
+                "https://drive.example.com/preview"
+            )
+        return story
+
+    def stories(self, task_gid: str) -> list[dict[str, Any]] | None:
+        task_index = _index(task_gid, TASK_GID_BASE, self.tasks)
+        if task_index is None:
+            return None
+        count = self.comments_per_task + self.system_stories_per_task
+        return [self._story(task_index=task_index, k=k) for k in range(1, count + 1)]
+
+    def story(self, gid: str) -> dict[str, Any] | None:
+        try:
+            offset = int(gid) - STORY_GID_BASE
+        except ValueError:
+            return None
+        task_index, k = divmod(offset, CHILDREN_PER_TASK)
+        if not 1 <= task_index <= self.tasks or not 1 <= k <= self.comments_per_task + self.system_stories_per_task:
+            return None
+        return self._story(task_index=task_index, k=k)
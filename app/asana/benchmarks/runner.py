@@ -0,0 +1,95 @@
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
+
+from celery.app.task import Task as CeleryTask
+from django.db import transaction
+
+from .data import FakeAsanaData
+from .scenarios import SCENARIOS, BenchmarkContext
+from .server import FakeAsanaServer, ServerConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    scenario: str
+    scale: int
+    wall_time: float
+    # http requests to asana, batch request counted once
+    requests_count: int
+    batch_actions_count: int
+    # None if memory not traced, tracing slows down measured code
+    peak_memory: int | None
+    requests_by_endpoint: dict[str, int]
+    result: Any
+
+
+@dataclass
+class BenchmarkReport:
+    server_config: ServerConfig
+    created: str = field(default_factory=lambda: datetime.now(tz=UTC).isoformat())
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _run_scenario(name: str, scale: int, server: FakeAsanaServer, *, trace_memory: bool) -> BenchmarkResult:
+    context = BenchmarkContext(data=server.data, api_url=server.api_url)
+    # every scenario starts from empty db, celery tasks not sent
+    with transaction.atomic(), patch.object(CeleryTask, "apply_async"):
+        run = SCENARIOS[name](context)
+        server.reset_stats()
+        peak_memory = None
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = run()
+        wall_time = time.perf_counter() - started
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        transaction.set_rollback(True)
+    stats = server.get_stats()
+    return BenchmarkResult(
+        scenario=name,
+        scale=scale,
+        wall_time=round(wall_time, 4),
+        requests_count=sum(count for key, count in stats.items() if not key.startswith("batch:")),
+        batch_actions_count=sum(count for key, count in stats.items() if key.startswith("batch:")),
+        peak_memory=peak_memory,
+        requests_by_endpoint=dict(sorted(stats.items())),
+        result=result,
+    )
+
+
+def run_benchmarks(
+    scenarios: list[str],
+    scales: list[int],
+    server_config: ServerConfig | None = None,
+    on_result: Callable[[BenchmarkResult], None] | None = None,
+    *,
+    trace_memory: bool = True,
+) -> BenchmarkReport:
+    """Run every scenario on every scale against fake asana server, db changes rolled back.
+
+    Scale is number of workspace members and number of project tasks.
+    """
+    report = BenchmarkReport(server_config=server_config or ServerConfig())
+    for scale in scales:
+        data = FakeAsanaData(members=scale, tasks=scale)
+        with FakeAsanaServer(data=data, config=report.server_config) as server:
+            for name in scenarios:
+                logger.info("Benchmark %s, scale %s", name, scale)
+                result = _run_scenario(name=name, scale=scale, server=server, trace_memory=trace_memory)
+                report.results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return report
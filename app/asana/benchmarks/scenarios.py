@@ -0,0 +1,142 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from comment_notifier.collectors.comment_data import CommentDataCollector
+from comment_notifier.models import AsanaComment, AsanaWebhookProject
+from comment_notifier.services import ProjectCommentsGenerator
+from creative_quality.models import CreativeProjectSection, Task
+from creative_quality.services import CreativeProjectSectionService, CreativeService
+from creative_quality.use_cases import CreateCreativesForNewTasksUseCase, FetchMissingTasksUseCase
+
+from asana.client import AsanaApiClient, AsyncAsanaApiClient
+from asana.client.rate_limit import TokenBucket
+from asana.models import AtlasAsanaUser
+from asana.repository import AsanaUserRepository
+
+from .data import MEMBERSHIP_GID_BASE, PROJECT_ID, USER_GID_BASE, FakeAsanaData
+
+# benchmarks measure client code, not waits of rate limiter
+UNLIMITED_RATE = 10**9
+
+
+@dataclass(frozen=True)
+class BenchmarkContext:
+    data: FakeAsanaData
+    api_url: str
+
+    def make_api_client(self) -> AsanaApiClient:
+        client = AsanaApiClient(
+            api_key="benchmark",
+            rate_limiter=TokenBucket(rate=UNLIMITED_RATE, capacity=UNLIMITED_RATE),
+        )
+        client.API_ENDPOINT = self.api_url
+        return client
+
+    def make_async_api_client(self) -> AsyncAsanaApiClient:
+        client = AsyncAsanaApiClient(
+            api_key="benchmark",
+            rate_limiter=TokenBucket(rate=UNLIMITED_RATE, capacity=UNLIMITED_RATE),
+        )
+        client.API_ENDPOINT = self.api_url
+        return client
+
+
+# scenario prepares db and returns function to measure
+ScenarioSetup = Callable[[BenchmarkContext], Callable[[], Any]]
+SCENARIOS: dict[str, ScenarioSetup] = {}
+
+
+def scenario(name: str) -> Callable[[ScenarioSetup], ScenarioSetup]:
+    def decorator(setup: ScenarioSetup) -> ScenarioSetup:
+        SCENARIOS[name] = setup
+        return setup
+
+    return decorator
+
+
+def _create_half_of_users(data: FakeAsanaData) -> None:
+    """Save every second workspace member to db, so both create and update paths are measured."""
+    AtlasAsanaUser.objects.bulk_create(
+        AtlasAsanaUser(
+            membership_id=str(MEMBERSHIP_GID_BASE + index),
+            user_id=str(USER_GID_BASE + index),
+            name=f"User {index}",
+        )
+        for index in range(1, data.members + 1, 2)
+    )
+
+
+@scenario("users_update_all")
+def users_update_all(context: BenchmarkContext) -> Callable[[], Any]:
+    _create_half_of_users(context.data)
+    repository = AsanaUserRepository(
+        api_client=context.make_api_client(),
+        async_api_client=context.make_async_api_client(),
+    )
+
+    def run() -> dict[str, int]:
+        result = repository.update_all()
+        return {"created_count": result.created_count, "deleted_count": result.deleted_count}
+
+    return run
+
+
+@scenario("project_comments_generate")
+def project_comments_generate(context: BenchmarkContext) -> Callable[[], Any]:
+    project = AsanaWebhookProject.objects.create(name="benchmark", project_id=PROJECT_ID)
+    generator = ProjectCommentsGenerator(
+        asana_api_client=context.make_api_client(),
+        async_api_client=context.make_async_api_client(),
+    )
+
+    def run() -> dict[str, int]:
+        return {"comments_count": sum(1 for _ in generator.generate(project=project))}
+
+    return run
+
+
+@scenario("fetch_missing_tasks")
+def fetch_missing_tasks(context: BenchmarkContext) -> Callable[[], Any]:
+    CreativeProjectSection.objects.bulk_create(
+        CreativeProjectSection(section_id=section_id) for section_id in context.data.section_ids()
+    )
+    use_case = FetchMissingTasksUseCase(
+        creative_project_section_service=CreativeProjectSectionService(asana_api_client=context.make_api_client()),
+    )
+
+    def run() -> dict[str, int]:
+        result = use_case.execute()
+        return {"new_found": len(result["new_found"]), "with_errors": len(result["with_errors"])}
+
+    return run
+
+
+@scenario("create_creatives")
+def create_creatives(context: BenchmarkContext) -> Callable[[], Any]:
+    Task.objects.bulk_create(Task(task_id=task_id) for task_id in context.data.task_ids())
+    creative_service = CreativeService(asana_api_client=context.make_api_client())
+    use_case = CreateCreativesForNewTasksUseCase(creative_service=creative_service)
+
+    def run() -> dict[str, int]:
+        return use_case.execute()
+
+    return run
+
+
+@scenario("comment_data_collect")
+def comment_data_collect(context: BenchmarkContext) -> Callable[[], Any]:
+    _create_half_of_users(context.data)
+    comments = AsanaComment.objects.bulk_create(
+        AsanaComment(user_id="", task_id=task_id, comment_id=context.data.comment_ids(task_id)[0])
+        for task_id in context.data.task_ids()
+    )
+    collector = CommentDataCollector(asana_api_client=context.make_api_client())
+
+    def run() -> dict[str, int]:
+        mentions_count = 0
+        for comment in comments:
+            mentions_count += len(collector.collect(comment_model=comment).mention_users)
+        return {"comments_count": len(comments), "mentions_count": mentions_count}
+
+    return run
@@ -0,0 +1,281 @@
+"""Stand-in asana api server for benchmarks.
+
+Runs in separate process, so its allocations and GIL time are not measured together
+with benchmarked code. Counts requests per endpoint, stats read by control endpoints:
+GET /__benchmark__/stats, POST /__benchmark__/reset.
+"""
+
+import json
+import multiprocessing
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from typing import Any, Self
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+from .data import PROJECT_ID, WORKSPACE_ID, FakeAsanaData
+
+API_PREFIX = "/api/1.0/"
+CONTROL_PREFIX = "/__benchmark__/"
+# 1x1 png
+AVATAR_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082",
+)
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    # seconds added to every api request
+    latency: float = 0.0
+    # max items on page, even if client asks more
+    page_size: int = 100
+
+
+class NotFoundError(Exception):
+    pass
+
+
+class FakeAsanaApi:
+    def __init__(self, data: FakeAsanaData, config: ServerConfig):
+        self.data = data
+        self.config = config
+        self.stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+        self._routes: list[tuple[re.Pattern[str], Any]] = [
+            (re.compile(r"workspaces/(\d+)/workspace_memberships"), self._workspace_memberships),
+            (re.compile(r"workspace_memberships/(\d+)"), self._workspace_membership),
+            (re.compile(r"users/(\d+)/workspace_memberships"), self._user_workspace_memberships),
+            (re.compile(r"users/(\d+)"), self._user),
+            (re.compile(r"projects/(\d+)/sections"), self._project_sections),
+            (re.compile(r"sections/(\d+)/tasks"), self._section_tasks),
+            (re.compile(r"tasks/(\d+)/stories"), self._stories),
+            (re.compile(r"tasks/(\d+)/subtasks"), self._subtasks),
+            (re.compile(r"tasks/(\d+)"), self._task),
+            (re.compile(r"stories/(\d+)"), self._story),
+        ]
+
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def reset(self) -> None:
+        with self._stats_lock:
+            self.stats.clear()
+
+    @staticmethod
+    def _found(value: Any) -> Any:  # noqa: ANN401
+        if value is None:
+            raise NotFoundError
+        return value
+
+    def _workspace_memberships(self, workspace_id: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        if workspace_id != WORKSPACE_ID:
+            raise NotFoundError
+        return self.data.workspace_memberships()
+
+    def _workspace_membership(self, gid: str, base_url: str) -> dict[str, Any]:
+        _ = base_url
+        return self._found(self.data.workspace_membership(gid))
+
+    def _user_workspace_memberships(self, gid: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        return self._found(self.data.user_workspace_memberships(gid))
+
+    def _user(self, gid: str, base_url: str) -> dict[str, Any]:
+        return self._found(self.data.user(gid, avatar_base_url=base_url))
+
+    def _project_sections(self, project_id: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        if project_id != PROJECT_ID:
+            raise NotFoundError
+        return self.data.project_sections()
+
+    def _section_tasks(self, gid: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        return self._found(self.data.section_tasks(gid))
+
+    def _stories(self, gid: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        return self._found(self.data.stories(gid))
+
+    def _subtasks(self, gid: str, base_url: str) -> list[dict[str, Any]]:
+        _ = base_url
+        return self._found(self.data.subtasks(gid))
+
+    def _task(self, gid: str, base_url: str) -> dict[str, Any]:
+        _ = base_url
+        return self._found(self.data.task(gid))
+
+    def _story(self, gid: str, base_url: str) -> dict[str, Any]:
+        _ = base_url
+        return self._found(self.data.story(gid))
+
+    def _paginate(self, items: list[dict[str, Any]], params: dict[str, str]) -> dict[str, Any]:
+        limit = min(int(params.get("limit", self.config.page_size)), self.config.page_size)
+        offset = int(params.get("offset", "0"))
+        page = items[offset : offset + limit]
+        next_offset = offset + limit
+        next_page = {"offset": str(next_offset)} if next_offset < len(items) else None
+        return {"data": page, "next_page": next_page}
+
+    def get(self, path: str, params: dict[str, str], base_url: str) -> tuple[int, dict[str, Any]]:
+        """Return status code and body of GET request to api path without prefix."""
+        path = path.strip("/")
+        for pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            try:
+                result = handler(*match.groups(), base_url=base_url)
+            except NotFoundError:
+                break
+            if isinstance(result, list):
+                return HTTPStatus.OK, self._paginate(result, params=params)
+            return HTTPStatus.OK, {"data": result}
+        return HTTPStatus.NOT_FOUND, {"errors": [{"message": f"Unknown object: {path}"}]}
+
+    def batch(self, body: dict[str, Any], base_url: str) -> dict[str, Any]:
+        responses = []
+        for action in body["data"]["actions"]:
+            self.count(f"batch:{_ID_RE.sub('/{id}', action['relative_path'])}")
+            options = action.get("options", {})
+            params = {"limit": str(options["limit"])} if "limit" in options else {}
+            status_code, response_body = self.get(action["relative_path"], params=params, base_url=base_url)
+            responses.append({"status_code": status_code, "headers": {}, "body": response_body})
+        return {"data": responses}
+
+
+class FakeAsanaRequestHandler(BaseHTTPRequestHandler):
+    api: FakeAsanaApi
+    protocol_version = "HTTP/1.1"
+    # headers and body written separately, without it every response waits delayed ack
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        pass
+
+    @property
+    def _base_url(self) -> str:
+        return f"http://{self.headers['Host']}{API_PREFIX}"
+
+    def _send(self, status_code: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status_code: int, data: Any) -> None:  # noqa: ANN401
+        self._send(status_code, json.dumps(data).encode())
+
+    def _read_json(self) -> Any:  # noqa: ANN401
+        length = int(self.headers.get("Content-Length", "0"))
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == f"{CONTROL_PREFIX}stats":
+            self._send_json(HTTPStatus.OK, dict(self.api.stats))
+            return
+        if url.path.startswith(f"{API_PREFIX}avatars/"):
+            self.api.count("avatars")
+            time.sleep(self.api.config.latency)
+            self._send(HTTPStatus.OK, AVATAR_BYTES, content_type="image/png")
+            return
+        if not url.path.startswith(API_PREFIX):
+            self._send_json(HTTPStatus.NOT_FOUND, {})
+            return
+        path = url.path.removeprefix(API_PREFIX)
+        self.api.count(f"GET {_ID_RE.sub('/{id}', '/' + path).lstrip('/')}")
+        time.sleep(self.api.config.latency)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status_code, body = self.api.get(path, params=params, base_url=self._base_url)
+        self._send_json(status_code, body)
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        body = self._read_json()
+        if url.path == f"{CONTROL_PREFIX}reset":
+            self.api.reset()
+            self._send_json(HTTPStatus.OK, {})
+            return
+        if url.path == f"{API_PREFIX}batch":
+            self.api.count("POST batch")
+            time.sleep(self.api.config.latency)
+            self._send_json(HTTPStatus.OK, self.api.batch(body, base_url=self._base_url))
+            return
+        self._send_json(HTTPStatus.NOT_FOUND, {})
+
+
+def _serve(data: FakeAsanaData, config: ServerConfig, connection: Connection) -> None:
+    api = FakeAsanaApi(data=data, config=config)
+    handler_class = type("Handler", (FakeAsanaRequestHandler,), {"api": api})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    connection.send(server.server_address[1])
+    server.serve_forever()
+
+
+class FakeAsanaServer:
+    """Fake asana api in child process.
+
+    with FakeAsanaServer(data=FakeAsanaData(members=100, tasks=100)) as server:
+        client.API_ENDPOINT = server.api_url
+    """
+
+    def __init__(self, data: FakeAsanaData, config: ServerConfig | None = None):
+        self.data = data
+        self.config = config or ServerConfig()
+        self._process: multiprocessing.Process | None = None
+        self.port: int | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}{API_PREFIX}"
+
+    def start(self) -> None:
+        parent_connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(self.data, self.config, child_connection),
+            daemon=True,
+        )
+        self._process.start()
+        self.port = parent_connection.recv()
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _control(self, method: str, name: str) -> Any:  # noqa: ANN401
+        request = Request(f"{self.url}{CONTROL_PREFIX}{name}", method=method, data=b"" if method == "POST" else None)  # noqa: S310
+        with urlopen(request, timeout=10) as response:  # noqa: S310
+            return json.loads(response.read())
+
+    def reset_stats(self) -> None:
+        self._control("POST", "reset")
+
+    def get_stats(self) -> dict[str, int]:
+        return self._control("GET", "stats")
@@ -1,5 +1,17 @@
+from .async_client import AsyncAsanaApiClient
+from .batch import BatchAction, BatchActionResult
+from .cache import ResponseCache, get_shared_response_cache
 from .main import AsanaApiClient
+from .projections import Projection, StoryProjection, TaskProjection
 
 __all__ = [
     "AsanaApiClient",
+    "AsyncAsanaApiClient",
+    "BatchAction",
+    "BatchActionResult",
+    "Projection",
+    "ResponseCache",
+    "StoryProjection",
+    "TaskProjection",
+    "get_shared_response_cache",
 ]
@@ -0,0 +1,317 @@
+import asyncio
+import inspect
+import json
+import logging
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextvars import ContextVar
+from functools import wraps
+from http import HTTPStatus
+from types import TracebackType
+from typing import Any, NoReturn, Self, TypeVar
+
+import httpx
+from common.metrics import observe_call
+
+from .batch import BATCH_MAX_ACTIONS, BatchAction, BatchActionResult
+from .exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError, AsanaRateLimitError
+from .projections import Projection
+from .rate_limit import RateLimiter, get_retry_after, get_shared_rate_limiter
+from .utils import prepare_params
+
+logger = logging.getLogger(__name__)
+
+ReturnType = TypeVar("ReturnType")
+
+
+def async_asana_error_handler(func: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
+    """Обработка ошибок для корутин и асинхронных генераторов AsyncAsanaApiClient."""
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def generator_wrapper(self: "AsyncAsanaApiClient", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            try:
+                async for item in func(self, *args, **kwargs):
+                    yield item
+            except (httpx.HTTPError, json.JSONDecodeError) as error:
+                self._handle_error(handler_name=func.__name__, error=error)
+
+        return generator_wrapper
+
+    @wraps(func)
+    async def wrapper(self: "AsyncAsanaApiClient", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        try:
+            return await func(self, *args, **kwargs)  # type: ignore[misc]
+        except (httpx.HTTPError, json.JSONDecodeError) as error:
+            self._handle_error(handler_name=func.__name__, error=error)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class AsyncAsanaApiClient:
+    """Asyncio variant of AsanaApiClient for fan-out workloads.
+
+    Connection pool opened on enter of async context and bound to running event loop,
+    number of simultaneous requests limited by max_concurrency:
+
+        async with AsyncAsanaApiClient(api_key=key) as client:
+            users = await asyncio.gather(*(client.get_user(user_id=i) for i in user_ids))
+    """
+
+    API_ENDPOINT = "https://app.asana.com/api/1.0/"
+    DEFAULT_REQUEST_TIMEOUT = 6
+    DEFAULT_MAX_CONCURRENCY = 10
+    PAGE_LIMIT = 100
+    MAX_RATE_LIMIT_RETRIES = 3
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int | None = None,
+        max_concurrency: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.api_key = api_key
+        self._rate_limiter = rate_limiter
+        self.timeout = timeout or self.DEFAULT_REQUEST_TIMEOUT
+        self.max_concurrency = max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        self.transport = transport
+        # opened connection stored in context, so one instance can be used from several threads/event loops
+        self._connection: ContextVar[tuple[httpx.AsyncClient, asyncio.Semaphore] | None] = ContextVar(
+            f"asana_async_connection_{id(self)}",
+            default=None,
+        )
+
+    async def __aenter__(self) -> Self:
+        client = httpx.AsyncClient(
+            base_url=self.API_ENDPOINT,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+            transport=self.transport,
+        )
+        self._connection.set((client, asyncio.Semaphore(self.max_concurrency)))
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        connection = self._connection.get()
+        if connection is not None:
+            await connection[0].aclose()
+        self._connection.set(None)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        if self._rate_limiter is None:
+            self._rate_limiter = get_shared_rate_limiter()
+        return self._rate_limiter
+
+    async def _request(self, method: str, path: str, cost: int = 1, **kwargs: Any) -> httpx.Response:  # noqa: ANN401
+        connection = self._connection.get()
+        if connection is None:
+            msg = f"{self.__class__.__name__} must be used inside 'async with'"
+            raise RuntimeError(msg)
+        client, semaphore = connection
+        if "params" in kwargs:
+            kwargs["params"] = prepare_params(kwargs["params"])
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            wait = self.rate_limiter.reserve(cost=cost)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            async with semaphore:
+                with observe_call(service="asana", method=method, url=path) as call:
+                    response = await client.request(method, path, **kwargs)
+                    call.set_response(response)
+            if response.status_code != HTTPStatus.TOO_MANY_REQUESTS or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            retry_after = get_retry_after(headers=response.headers, attempt=attempt)
+            logger.warning("Asana rate limit on %s %s, retry after %s s", method, path, retry_after)
+            self.rate_limiter.pause(seconds=retry_after)
+        response.raise_for_status()
+        return response
+
+    async def _paginate(self, path: str, params: dict[str, Any] | None = None) -> AsyncIterator[dict[str, Any]]:
+        params = {**(params or {}), "limit": self.PAGE_LIMIT}
+        while True:
+            response = await self._request("GET", path, params=params)
+            response_data = response.json()
+            for item in response_data["data"]:
+                yield item
+            next_page = response_data.get("next_page")
+            if not next_page:
+                return
+            params["offset"] = next_page["offset"]
+
+    def _handle_error(self, handler_name: str, error: Exception) -> NoReturn:
+        if isinstance(error, httpx.HTTPStatusError):
+            msg = f"AsyncAsanaApiClient {handler_name}: {error.response.text}"
+            response = error.response
+            logger.info("Response status code: %s", response.status_code)
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                raise AsanaNotFoundError(msg, response=response) from error
+            if response.status_code == HTTPStatus.FORBIDDEN:
+                raise AsanaForbiddenError(msg, response=response) from error
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                retry_after = get_retry_after(headers=response.headers, attempt=self.MAX_RATE_LIMIT_RETRIES)
+                raise AsanaRateLimitError(msg, response=response, retry_after=retry_after) from error
+            raise AsanaApiClientError(msg, response=response) from error
+        if isinstance(error, json.JSONDecodeError):
+            msg = f"AsyncAsanaApiClient {handler_name}: Ошибка разбора JSON ответа"
+        else:
+            msg = f"AsyncAsanaApiClient {handler_name}: Ошибка запроса клиента трекера, {error}"
+        raise AsanaApiClientError(msg) from error
+
+    async def _get_data(self, path: str, opt_fields: list[str] | None = None) -> Any:  # noqa: ANN401
+        params = {"opt_fields": opt_fields} if opt_fields else None
+        response = await self._request("GET", path, params=params)
+        return response.json()["data"]
+
+    async def _get_projected(self, path: str, projection: Projection | None = None) -> dict[str, Any]:
+        if projection is None:
+            return await self._get_data(path)
+        data = await self._get_data(path, opt_fields=projection.opt_fields)
+        return projection.wrap(data)
+
+    @async_asana_error_handler
+    async def get_user(self, user_id: str) -> dict[str, Any]:
+        return await self._get_data(f"users/{user_id}")
+
+    @async_asana_error_handler
+    async def get_workspace_membership(self, membership_id: str) -> dict[str, Any]:
+        return await self._get_data(f"workspace_memberships/{membership_id}")
+
+    @async_asana_error_handler
+    async def iter_workspace_memberships_for_workspace(self, workspace_id: str) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"workspaces/{workspace_id}/workspace_memberships"):
+            yield item
+
+    async def get_workspace_memberships_for_workspace(self, workspace_id: str) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_workspace_memberships_for_workspace(workspace_id=workspace_id)]
+
+    @async_asana_error_handler
+    async def get_comment(self, comment_id: str, projection: Projection | None = None) -> dict[str, Any]:
+        return await self._get_projected(f"stories/{comment_id}", projection=projection)
+
+    @async_asana_error_handler
+    async def iter_stories_from_task(
+        self,
+        task_id: str,
+        opt_fields: list[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"tasks/{task_id}/stories", params={"opt_fields": opt_fields or []}):
+            yield item
+
+    async def get_stories_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_stories_from_task(task_id=task_id, opt_fields=opt_fields)]
+
+    async def get_comments_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        stories = await self.get_stories_from_task(task_id=task_id, opt_fields=opt_fields)
+        return [story for story in stories if story["resource_subtype"] == "comment_added"]
+
+    @async_asana_error_handler
+    async def get_task(self, task_id: str, projection: Projection | None = None) -> dict[str, Any]:
+        return await self._get_projected(f"tasks/{task_id}", projection=projection)
+
+    @async_asana_error_handler
+    async def update_task(
+        self,
+        task_id: str,
+        data: dict[str, Any],
+        opt_fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        response = await self._request(
+            "PUT",
+            f"tasks/{task_id}",
+            json={"data": data},
+            params={"opt_fields": opt_fields or []},
+        )
+        return response.json()["data"]
+
+    async def mark_task_completed(self, task_id: str) -> dict[str, Any]:
+        return await self.update_task(task_id=task_id, data={"completed": True}, opt_fields=["completed", "name"])
+
+    @async_asana_error_handler
+    async def iter_sub_tasks(self, task_id: str, opt_fields: list[str] | None = None) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"tasks/{task_id}/subtasks", params={"opt_fields": opt_fields or []}):
+            yield item
+
+    async def get_sub_tasks(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_sub_tasks(task_id=task_id, opt_fields=opt_fields)]
+
+    @async_asana_error_handler
+    async def iter_workspace_memberships_for_user(self, user_id: str) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"users/{user_id}/workspace_memberships"):
+            yield item
+
+    async def get_workspace_memberships_for_user(self, user_id: str) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_workspace_memberships_for_user(user_id=user_id)]
+
+    @async_asana_error_handler
+    async def iter_webhooks(self, workspace_id: str) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate("webhooks", params={"workspace": workspace_id}):
+            yield item
+
+    async def get_webhooks(self, workspace_id: str) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_webhooks(workspace_id=workspace_id)]
+
+    @async_asana_error_handler
+    async def iter_project_sections(self, project_id: str) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"projects/{project_id}/sections"):
+            yield item
+
+    async def get_project_sections(self, project_id: str) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_project_sections(project_id=project_id)]
+
+    @async_asana_error_handler
+    async def iter_section_tasks(
+        self,
+        section_id: str,
+        opt_fields: list[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        async for item in self._paginate(f"sections/{section_id}/tasks", params={"opt_fields": opt_fields or []}):
+            yield item
+
+    async def get_section_tasks(self, section_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return [item async for item in self.iter_section_tasks(section_id=section_id, opt_fields=opt_fields)]
+
+    @async_asana_error_handler
+    async def get_project(self, project_id: str, opt_fields: list[str] | None = None) -> dict[str, Any]:
+        return await self._get_data(f"projects/{project_id}", opt_fields=opt_fields)
+
+    @async_asana_error_handler
+    async def get_section(self, section_id: str, opt_fields: list[str] | None = None) -> dict[str, Any]:
+        return await self._get_data(f"sections/{section_id}", opt_fields=opt_fields)
+
+    @async_asana_error_handler
+    async def batch(self, actions: Sequence[BatchAction]) -> list[BatchActionResult]:
+        """Execute actions via /batch, chunks of 10 actions sent concurrently.
+
+        Raises:
+             AsanaApiClientError: if batch request itself failed
+
+        """
+        chunks = [actions[start : start + BATCH_MAX_ACTIONS] for start in range(0, len(actions), BATCH_MAX_ACTIONS)]
+        responses = await asyncio.gather(
+            *(
+                self._request(
+                    "POST",
+                    "batch",
+                    cost=len(chunk),
+                    json={"data": {"actions": [action.to_api() for action in chunk]}},
+                )
+                for chunk in chunks
+            ),
+        )
+        return [
+            BatchActionResult(
+                action=action,
+                status_code=action_response["status_code"],
+                body=action_response.get("body"),
+            )
+            for chunk, response in zip(chunks, responses, strict=True)
+            for action, action_response in zip(chunk, response.json()["data"], strict=True)
+        ]
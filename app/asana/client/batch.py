@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+
+from .exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError
+from .projections import Projection
+
+BATCH_MAX_ACTIONS = 10
+
+
+@dataclass(frozen=True)
+class BatchAction:
+    """Single action of Asana batch request.
+
+    relative_path without api prefix, e.g. "/tasks/123".
+    """
+
+    relative_path: str
+    method: str = "get"
+    data: dict[str, Any] | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+    projection: Projection | None = None
+
+    @classmethod
+    def get(
+        cls,
+        relative_path: str,
+        opt_fields: list[str] | None = None,
+        limit: int | None = None,
+        projection: Projection | None = None,
+    ) -> "BatchAction":
+        options: dict[str, Any] = {}
+        if projection is not None:
+            opt_fields = projection.opt_fields
+        if opt_fields:
+            options["fields"] = opt_fields
+        if limit is not None:
+            options["limit"] = limit
+        return cls(relative_path=relative_path, options=options, projection=projection)
+
+    def to_api(self) -> dict[str, Any]:
+        action: dict[str, Any] = {"relative_path": self.relative_path, "method": self.method}
+        if self.data is not None:
+            action["data"] = self.data
+        if self.options:
+            action["options"] = self.options
+        return action
+
+
+@dataclass(frozen=True)
+class BatchActionResult:
+    action: BatchAction
+    status_code: int
+    body: dict[str, Any] | None
+
+    @property
+    def is_success(self) -> bool:
+        return HTTPStatus.OK <= self.status_code < HTTPStatus.MULTIPLE_CHOICES
+
+    @property
+    def error(self) -> AsanaApiClientError | None:
+        if self.is_success:
+            return None
+        msg = f"AsanaApiClient batch {self.action.method} {self.action.relative_path}: {self.status_code} {self.body}"
+        if self.status_code == HTTPStatus.NOT_FOUND:
+            return AsanaNotFoundError(msg)
+        if self.status_code == HTTPStatus.FORBIDDEN:
+            return AsanaForbiddenError(msg)
+        return AsanaApiClientError(msg)
+
+    @property
+    def has_next_page(self) -> bool:
+        return bool(self.body and self.body.get("next_page"))
+
+    def get_data(self) -> Any:  # noqa: ANN401
+        """Return "data" of action response.
+
+        Raises:
+             AsanaApiClientError: if action failed
+
+        """
+        error = self.error
+        if error is not None:
+            raise error
+        assert self.body is not None  # noqa: S101
+        data = self.body["data"]
+        if self.action.projection is not None and isinstance(data, dict):
+            return self.action.projection.wrap(data)
+        return data
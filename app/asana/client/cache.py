@@ -0,0 +1,162 @@
+import copy
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from cachetools import TLRUCache
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+logger = logging.getLogger(__name__)
+
+# seconds, resources not listed here are not cached
+DEFAULT_CACHE_TTLS: dict[str, int] = {
+    "project": 60 * 60,
+    "section": 60 * 60,
+    "project_sections": 60 * 10,
+    "user": 60 * 60,
+    "workspace_membership": 60 * 60,
+}
+
+
+def make_params_key(params: Mapping[str, Any] | None) -> str:
+    return json.dumps(params or {}, sort_keys=True)
+
+
+class ResponseCache:
+    """Two tier cache of asana responses: in-process LRU and redis (django cache alias).
+
+    One entry per asana object holds responses for all requested params (opt_fields),
+    so object invalidated by one delete. Local tier lives max LOCAL_MAX_TTL when redis
+    tier used: invalidation from webhook reaches other processes only through redis.
+    Redis errors ignored, cache works as miss.
+    """
+
+    KEY_PREFIX = "asana"
+    LOCAL_MAX_TTL = 60
+
+    def __init__(
+        self,
+        ttls: Mapping[str, int] | None = None,
+        local_maxsize: int = 1024,
+        redis_cache_alias: str | None = "redis",
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.redis_cache_alias = redis_cache_alias
+        self._local: TLRUCache[tuple[str, str], dict[str, Any]] = TLRUCache(
+            maxsize=local_maxsize,
+            ttu=self._local_expire_at,
+            timer=timer,
+        )
+        self._lock = threading.Lock()
+
+    def _local_expire_at(self, key: tuple[str, str], value: dict[str, Any], now: float) -> float:  # noqa: ARG002
+        ttl = self.ttls[key[0]]
+        if self._redis_cache is not None:
+            ttl = min(ttl, self.LOCAL_MAX_TTL)
+        return now + ttl
+
+    @property
+    def _redis_cache(self) -> BaseCache | None:
+        if self.redis_cache_alias is None or not settings.REDIS_ENABLED:
+            return None
+        return caches[self.redis_cache_alias]
+
+    def _redis_key(self, resource: str, gid: str) -> str:
+        return f"{self.KEY_PREFIX}:{resource}:{gid}"
+
+    def _get_redis_entry(self, resource: str, gid: str) -> dict[str, Any] | None:
+        redis_cache = self._redis_cache
+        if redis_cache is None:
+            return None
+        try:
+            return redis_cache.get(self._redis_key(resource=resource, gid=gid))
+        except Exception:
+            logger.warning("Asana cache: redis get error", exc_info=True)
+            return None
+
+    def is_cacheable(self, resource: str) -> bool:
+        return resource in self.ttls
+
+    def get(self, resource: str, gid: int | str, params_key: str) -> Any | None:  # noqa: ANN401
+        if not self.is_cacheable(resource):
+            return None
+        key = (resource, str(gid))
+        with self._lock:
+            entry = self._local.get(key)
+        # copies returned, callers can modify data without changing cached entry
+        if entry is not None and params_key in entry:
+            return copy.deepcopy(entry[params_key])
+        redis_entry = self._get_redis_entry(resource=resource, gid=str(gid))
+        if redis_entry is None or params_key not in redis_entry:
+            return None
+        with self._lock:
+            self._local[key] = redis_entry
+        return copy.deepcopy(redis_entry[params_key])
+
+    def set(self, resource: str, gid: int | str, params_key: str, data: Any) -> None:  # noqa: ANN401
+        if not self.is_cacheable(resource):
+            return
+        key = (resource, str(gid))
+        redis_entry = self._get_redis_entry(resource=resource, gid=str(gid)) or {}
+        with self._lock:
+            entry = {**redis_entry, **self._local.get(key, {}), params_key: copy.deepcopy(data)}
+            self._local[key] = entry
+        redis_cache = self._redis_cache
+        if redis_cache is None:
+            return
+        try:
+            redis_cache.set(self._redis_key(resource=resource, gid=str(gid)), entry, timeout=self.ttls[resource])
+        except Exception:
+            logger.warning("Asana cache: redis set error", exc_info=True)
+
+    def invalidate(self, resource: str, gid: int | str) -> None:
+        with self._lock:
+            self._local.pop((resource, str(gid)), None)
+        redis_cache = self._redis_cache
+        if redis_cache is None:
+            return
+        try:
+            redis_cache.delete(self._redis_key(resource=resource, gid=str(gid)))
+        except Exception:
+            logger.warning("Asana cache: redis delete error", exc_info=True)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def invalidate_by_events(self, events: Iterable[dict[str, Any]]) -> None:
+        """Drop cached objects changed by asana webhook events."""
+        for event in events:
+            resource = event.get("resource") or {}
+            parent = event.get("parent") or {}
+            resource_type = resource.get("resource_type")
+            gid = resource.get("gid")
+            if gid is None:
+                continue
+            if resource_type == "project":
+                self.invalidate(resource="project", gid=gid)
+                self.invalidate(resource="project_sections", gid=gid)
+            elif resource_type == "section":
+                self.invalidate(resource="section", gid=gid)
+                if parent.get("resource_type") == "project":
+                    self.invalidate(resource="project_sections", gid=parent["gid"])
+            elif resource_type in ("user", "workspace_membership"):
+                self.invalidate(resource=resource_type, gid=gid)
+
+
+_shared_response_cache: ResponseCache | None = None
+_shared_response_cache_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> ResponseCache:
+    global _shared_response_cache  # noqa: PLW0603
+    if _shared_response_cache is None:
+        with _shared_response_cache_lock:
+            if _shared_response_cache is None:
+                _shared_response_cache = ResponseCache()
+    return _shared_response_cache
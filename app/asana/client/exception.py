@@ -1,3 +1,4 @@
+import httpx
 from common.exception import AppExceptionError
 from requests import Response
 
@@ -5,7 +6,7 @@ from requests import Response
 class AsanaApiClientError(AppExceptionError):
     """Common client error."""
 
-    def __init__(self, message: str, response: Response | None = None) -> None:
+    def __init__(self, message: str, response: Response | httpx.Response | None = None) -> None:
         super().__init__(message)
         self.response = response
 
@@ -16,3 +17,32 @@ class AsanaNotFoundError(AsanaApiClientError):
 
 class AsanaForbiddenError(AsanaApiClientError):
     """403 Forbidden."""
+
+
+class AsanaRateLimitError(AsanaApiClientError):
+    """429 Too Many Requests after all retries."""
+
+    def __init__(
+        self,
+        message: str,
+        response: Response | httpx.Response | None = None,
+        retry_after: float = 0,
+    ) -> None:
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
+class AsanaSyncTokenExpiredError(AsanaApiClientError):
+    """412 Precondition Failed of events api: sync token missing or expired.
+
+    sync_token - fresh token, events after it can be fetched next time.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        response: Response | httpx.Response | None = None,
+        sync_token: str = "",
+    ) -> None:
+        super().__init__(message, response=response)
+        self.sync_token = sync_token
@@ -1,19 +1,49 @@
+import inspect
 import json
 import logging
+from collections.abc import Iterator, Sequence
 from functools import wraps
 from http import HTTPStatus
 from typing import Any, Callable, NoReturn, TypeVar
 
 import requests
+from common.metrics import observe_call
 from requests.exceptions import HTTPError, RequestException
 
-from .exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError
+from .batch import BATCH_MAX_ACTIONS, BatchAction, BatchActionResult
+from .cache import ResponseCache, make_params_key
+from .exception import (
+    AsanaApiClientError,
+    AsanaForbiddenError,
+    AsanaNotFoundError,
+    AsanaRateLimitError,
+    AsanaSyncTokenExpiredError,
+)
+from .projections import Projection
+from .rate_limit import RateLimiter, acquire, get_retry_after, get_shared_rate_limiter
+from .session import SessionConfig, get_shared_session
+from .utils import prepare_params
+
+logger = logging.getLogger(__name__)
 
 ReturnType = TypeVar("ReturnType")
 
 
 def asana_error_handler(func: Callable[..., ReturnType]) -> Callable[..., ReturnType]:
-    """Автоматическая обработка ошибок для методов AsanaApiClient."""
+    """Автоматическая обработка ошибок для методов AsanaApiClient.
+
+    Для генераторов ошибки перехватываются во время итерации.
+    """
+    if inspect.isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(self: "AsanaApiClient", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            try:
+                yield from func(self, *args, **kwargs)
+            except (RequestException, HTTPError, json.JSONDecodeError) as error:
+                self._handle_error(handler_name=func.__name__, error=error)
+
+        return generator_wrapper
 
     @wraps(func)
     def wrapper(self: "AsanaApiClient", *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
@@ -28,24 +58,114 @@ def asana_error_handler(func: Callable[..., ReturnType]) -> Callable[..., Return
 class AsanaApiClient:
     API_ENDPOINT = "https://app.asana.com/api/1.0/"
     DEFAULT_REQUEST_TIMEOUT = 6
+    PAGE_LIMIT = 100
+    MAX_RATE_LIMIT_RETRIES = 3
 
-    def __init__(self, api_key: str, timeout: int | None = None):
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int | None = None,
+        session_config: SessionConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+    ):
         self.api_key = api_key
-        self.timeout = timeout if timeout else self.DEFAULT_REQUEST_TIMEOUT
+        self.timeout = timeout or self.DEFAULT_REQUEST_TIMEOUT
+        self.session_config = session_config or SessionConfig()
+        self._rate_limiter = rate_limiter
+        self.cache = cache
 
     @property
     def _auth_headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.api_key}"}
 
+    @property
+    def session(self) -> requests.Session:
+        return get_shared_session(config=self.session_config)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        if self._rate_limiter is None:
+            self._rate_limiter = get_shared_rate_limiter()
+        return self._rate_limiter
+
+    def _request(self, method: str, path: str, cost: int = 1, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+        """Send request under rate limiter, on 429 pause all clients for Retry-After and repeat.
+
+        cost: number of rate limit units of request, for batch - number of actions.
+        """
+        if "params" in kwargs:
+            kwargs["params"] = prepare_params(kwargs["params"])
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            acquire(self.rate_limiter, cost=cost)
+            with observe_call(service="asana", method=method, url=path) as call:
+                response = self.session.request(
+                    method,
+                    f"{self.API_ENDPOINT}{path}",
+                    headers=self._auth_headers,
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+                call.set_response(response)
+            if response.status_code != HTTPStatus.TOO_MANY_REQUESTS or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            retry_after = get_retry_after(headers=response.headers, attempt=attempt)
+            logger.warning("Asana rate limit on %s %s, retry after %s s", method, path, retry_after)
+            self.rate_limiter.pause(seconds=retry_after)
+        response.raise_for_status()
+        return response
+
+    def _get_cached(self, resource: str, gid: int | str, params: dict[str, Any] | None = None) -> Any | None:  # noqa: ANN401
+        if self.cache is None:
+            return None
+        return self.cache.get(resource=resource, gid=gid, params_key=make_params_key(params))
+
+    def _set_cached(self, resource: str, gid: int | str, data: Any, params: dict[str, Any] | None = None) -> None:  # noqa: ANN401
+        if self.cache is not None:
+            self.cache.set(resource=resource, gid=gid, params_key=make_params_key(params), data=data)
+
+    def _get_object(self, resource: str, gid: int | str, path: str, params: dict[str, Any] | None = None) -> Any:  # noqa: ANN401
+        """Get object data from cache if resource cacheable or from asana."""
+        data = self._get_cached(resource=resource, gid=gid, params=params)
+        if data is None:
+            response = self._request("GET", path, params=params)
+            data = response.json()["data"]
+            self._set_cached(resource=resource, gid=gid, data=data, params=params)
+        return data
+
+    def _get_projected(self, path: str, projection: Projection | None = None) -> dict[str, Any]:
+        if projection is None:
+            return self._request("GET", path).json()["data"]
+        response = self._request("GET", path, params={"opt_fields": projection.opt_fields})
+        return projection.wrap(response.json()["data"])
+
+    def _paginate(self, path: str, params: dict[str, Any] | None = None) -> Iterator[dict[str, Any]]:
+        """Lazily iterate over all items of collection endpoint following next_page offset."""
+        params = {**(params or {}), "limit": self.PAGE_LIMIT}
+        while True:
+            response = self._request("GET", path, params=params)
+            response_data = response.json()
+            yield from response_data["data"]
+            next_page = response_data.get("next_page")
+            if not next_page:
+                return
+            params["offset"] = next_page["offset"]
+
     def _handle_error(self, handler_name: str, error: Exception) -> NoReturn:
         if isinstance(error, HTTPError):
             msg = f"AsanaApiClient {handler_name}: {error.response.text}"
             response = error.response
-            logging.info("Response status code: %s", response.status_code)
+            logger.info("Response status code: %s", response.status_code)
             if response.status_code == HTTPStatus.NOT_FOUND:
                 raise AsanaNotFoundError(msg, response=response) from error
             if response.status_code == HTTPStatus.FORBIDDEN:
                 raise AsanaForbiddenError(msg, response=response) from error
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                retry_after = get_retry_after(headers=response.headers, attempt=self.MAX_RATE_LIMIT_RETRIES)
+                raise AsanaRateLimitError(msg, response=response, retry_after=retry_after) from error
+            if response.status_code == HTTPStatus.PRECONDITION_FAILED:
+                sync_token = response.json().get("sync", "")
+                raise AsanaSyncTokenExpiredError(msg, response=response, sync_token=sync_token) from error
         if isinstance(error, json.JSONDecodeError):
             msg = f"AsanaApiClient {handler_name}: Ошибка разбора JSON ответа"
             response = None
@@ -55,171 +175,176 @@ class AsanaApiClient:
         raise AsanaApiClientError(msg, response=response) from error
 
     @asana_error_handler
-    def get_user(self, user_id: int) -> dict[str, Any]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}users/{user_id}",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def get_user(self, user_id: str) -> dict[str, Any]:
+        return self._get_object(resource="user", gid=user_id, path=f"users/{user_id}")
 
     @asana_error_handler
-    def get_workspace_membership(self, membership_id: int) -> dict[str, Any]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}workspace_memberships/{membership_id}",
-            headers=self._auth_headers,
-            timeout=self.timeout,
+    def get_workspace_membership(self, membership_id: str) -> dict[str, Any]:
+        return self._get_object(
+            resource="workspace_membership",
+            gid=membership_id,
+            path=f"workspace_memberships/{membership_id}",
         )
-        response.raise_for_status()
-        return response.json()["data"]
 
     @asana_error_handler
-    def get_workspace_memberships_for_workspace(self, workspace_id: int) -> list[dict[str, Any]]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}workspaces/{workspace_id}/workspace_memberships",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-            params={"limit": 99},
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def iter_workspace_memberships_for_workspace(self, workspace_id: str) -> Iterator[dict[str, Any]]:
+        yield from self._paginate(f"workspaces/{workspace_id}/workspace_memberships")
+
+    def get_workspace_memberships_for_workspace(self, workspace_id: str) -> list[dict[str, Any]]:
+        return list(self.iter_workspace_memberships_for_workspace(workspace_id=workspace_id))
 
     @asana_error_handler
-    def get_comment(self, comment_id: int) -> dict[str, Any]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}stories/{comment_id}",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def get_comment(self, comment_id: str, projection: Projection | None = None) -> dict[str, Any]:
+        return self._get_projected(path=f"stories/{comment_id}", projection=projection)
 
     @asana_error_handler
-    def get_stories_from_task(self, task_id: int, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+    def iter_stories_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> Iterator[dict[str, Any]]:
         if opt_fields is None:
             opt_fields = []
-        response = requests.get(
-            f"{self.API_ENDPOINT}tasks/{task_id}/stories",
-            headers=self._auth_headers,
-            params={"opt_fields": opt_fields},
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+        yield from self._paginate(f"tasks/{task_id}/stories", params={"opt_fields": opt_fields})
 
-    @asana_error_handler
-    def get_comments_from_task(self, task_id: int, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
-        stories = self.get_stories_from_task(task_id=task_id, opt_fields=opt_fields)
-        return [story for story in stories if story["resource_subtype"] == "comment_added"]
+    def get_stories_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return list(self.iter_stories_from_task(task_id=task_id, opt_fields=opt_fields))
+
+    def iter_comments_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> Iterator[dict[str, Any]]:
+        stories = self.iter_stories_from_task(task_id=task_id, opt_fields=opt_fields)
+        return (story for story in stories if story["resource_subtype"] == "comment_added")
+
+    def get_comments_from_task(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return list(self.iter_comments_from_task(task_id=task_id, opt_fields=opt_fields))
 
     @asana_error_handler
-    def get_task(self, task_id: int) -> dict[str, Any]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}tasks/{task_id}",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def get_task(self, task_id: str, projection: Projection | None = None) -> dict[str, Any]:
+        """Get task, only fields of projection if given."""
+        return self._get_projected(path=f"tasks/{task_id}", projection=projection)
 
     @asana_error_handler
-    def update_task(self, task_id: int, data: dict[str, Any], opt_fields: list[str] | None = None) -> dict[str, Any]:
+    def update_task(self, task_id: str, data: dict[str, Any], opt_fields: list[str] | None = None) -> dict[str, Any]:
         if opt_fields is None:
             opt_fields = []
         data = {"data": data}
-        response = requests.put(
-            f"{self.API_ENDPOINT}tasks/{task_id}",
-            headers=self._auth_headers,
+        response = self._request(
+            "PUT",
+            f"tasks/{task_id}",
             json=data,
             params={"opt_fields": opt_fields},
-            timeout=self.timeout,
         )
-        response.raise_for_status()
         return response.json()["data"]
 
     def mark_task_completed(self, task_id: str) -> dict[str, Any]:
         return self.update_task(task_id=task_id, data={"completed": True}, opt_fields=["completed", "name"])
 
     @asana_error_handler
-    def get_sub_tasks(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+    def iter_sub_tasks(self, task_id: str, opt_fields: list[str] | None = None) -> Iterator[dict[str, Any]]:
         if opt_fields is None:
             opt_fields = []
-        response = requests.get(
-            f"{self.API_ENDPOINT}tasks/{task_id}/subtasks",
-            headers=self._auth_headers,
-            params={"opt_fields": opt_fields},
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+        yield from self._paginate(f"tasks/{task_id}/subtasks", params={"opt_fields": opt_fields})
+
+    def get_sub_tasks(self, task_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return list(self.iter_sub_tasks(task_id=task_id, opt_fields=opt_fields))
 
     @asana_error_handler
-    def get_workspace_memberships_for_user(self, user_id: int) -> list[dict[str, Any]]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}users/{user_id}/workspace_memberships",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def iter_workspace_memberships_for_user(self, user_id: str) -> Iterator[dict[str, Any]]:
+        yield from self._paginate(f"users/{user_id}/workspace_memberships")
+
+    def get_workspace_memberships_for_user(self, user_id: str) -> list[dict[str, Any]]:
+        return list(self.iter_workspace_memberships_for_user(user_id=user_id))
 
     @asana_error_handler
-    def get_webhooks(self, workspace_id: int) -> list[dict[str, Any]]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}webhooks",
-            headers=self._auth_headers,
-            params={"workspace": workspace_id},
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def iter_webhooks(self, workspace_id: str) -> Iterator[dict[str, Any]]:
+        yield from self._paginate("webhooks", params={"workspace": workspace_id})
+
+    def get_webhooks(self, workspace_id: str) -> list[dict[str, Any]]:
+        return list(self.iter_webhooks(workspace_id=workspace_id))
 
     @asana_error_handler
-    def get_project_sections(self, project_id: int) -> list[dict[str, Any]]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}projects/{project_id}/sections",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        return response.json()["data"]
+    def iter_project_sections(self, project_id: str) -> Iterator[dict[str, Any]]:
+        yield from self._paginate(f"projects/{project_id}/sections")
+
+    def get_project_sections(self, project_id: str) -> list[dict[str, Any]]:
+        sections = self._get_cached(resource="project_sections", gid=project_id)
+        if sections is None:
+            sections = list(self.iter_project_sections(project_id=project_id))
+            self._set_cached(resource="project_sections", gid=project_id, data=sections)
+        return sections
 
     @asana_error_handler
-    def get_section_tasks(self, section_id: int) -> list[dict[str, Any]]:
-        response = requests.get(
-            f"{self.API_ENDPOINT}sections/{section_id}/tasks",
-            headers=self._auth_headers,
-            timeout=self.timeout,
-        )
-        response.raise_for_status()
-        if "next_page" in response.text:
-            msg = "get_section_tasks have 'next_page' param in response"
-            raise AsanaApiClientError(msg)
-        return response.json()["data"]
+    def iter_section_tasks(self, section_id: str, opt_fields: list[str] | None = None) -> Iterator[dict[str, Any]]:
+        if opt_fields is None:
+            opt_fields = []
+        yield from self._paginate(f"sections/{section_id}/tasks", params={"opt_fields": opt_fields})
+
+    def get_section_tasks(self, section_id: str, opt_fields: list[str] | None = None) -> list[dict[str, Any]]:
+        return list(self.iter_section_tasks(section_id=section_id, opt_fields=opt_fields))
 
     @asana_error_handler
-    def get_project(self, project_id: int, opt_fields: list[str] | None = None) -> dict[str, Any]:
+    def get_project(self, project_id: str, opt_fields: list[str] | None = None) -> dict[str, Any]:
         if opt_fields is None:
             opt_fields = []
-        response = requests.get(
-            f"{self.API_ENDPOINT}projects/{project_id}",
-            headers=self._auth_headers,
+        return self._get_object(
+            resource="project",
+            gid=project_id,
+            path=f"projects/{project_id}",
             params={"opt_fields": opt_fields},
-            timeout=self.timeout,
         )
-        response.raise_for_status()
-        return response.json()["data"]
 
     @asana_error_handler
-    def get_section(self, section_id: int, opt_fields: list[str] | None = None) -> dict[str, Any]:
+    def get_section(self, section_id: str, opt_fields: list[str] | None = None) -> dict[str, Any]:
         if opt_fields is None:
             opt_fields = []
-        response = requests.get(
-            f"{self.API_ENDPOINT}sections/{section_id}",
-            headers=self._auth_headers,
+        return self._get_object(
+            resource="section",
+            gid=section_id,
+            path=f"sections/{section_id}",
             params={"opt_fields": opt_fields},
-            timeout=self.timeout,
         )
-        response.raise_for_status()
-        return response.json()["data"]
+
+    @asana_error_handler
+    def get_events(self, resource_id: int | str, sync_token: str | None = None) -> tuple[list[dict[str, Any]], str]:
+        """Get all events of resource happened after sync_token and new sync token.
+
+        Raises:
+             AsanaSyncTokenExpiredError: if sync_token is None or expired, error contains fresh sync token
+             AsanaApiClientError: if cant get events
+
+        """
+        events: list[dict[str, Any]] = []
+        while True:
+            params: dict[str, Any] = {"resource": resource_id}
+            if sync_token is not None:
+                params["sync"] = sync_token
+            response_data = self._request("GET", "events", params=params).json()
+            events.extend(response_data["data"])
+            sync_token = response_data["sync"]
+            if not response_data.get("has_more"):
+                return events, sync_token
+
+    @asana_error_handler
+    def batch(self, actions: Sequence[BatchAction]) -> list[BatchActionResult]:
+        """Execute independent actions via /batch, up to 10 actions per http request.
+
+        Results returned in order of actions. Errors of single actions not raised,
+        check BatchActionResult.error or use BatchActionResult.get_data().
+
+        Raises:
+             AsanaApiClientError: if batch request itself failed
+
+        """
+        results: list[BatchActionResult] = []
+        for start in range(0, len(actions), BATCH_MAX_ACTIONS):
+            chunk = actions[start : start + BATCH_MAX_ACTIONS]
+            response = self._request(
+                "POST",
+                "batch",
+                cost=len(chunk),
+                json={"data": {"actions": [action.to_api() for action in chunk]}},
+            )
+            results.extend(
+                BatchActionResult(
+                    action=action,
+                    status_code=action_response["status_code"],
+                    body=action_response.get("body"),
+                )
+                for action, action_response in zip(chunk, response.json()["data"], strict=True)
+            )
+        return results
@@ -0,0 +1,101 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# asana returns these fields for any opt_fields
+ALWAYS_RETURNED_FIELDS = frozenset({"gid", "resource_type"})
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Named set of opt_fields requested from asana.
+
+    Nested fields written with dot: "custom_fields.name".
+    """
+
+    name: str
+    fields: tuple[str, ...]
+
+    @property
+    def opt_fields(self) -> list[str]:
+        return list(self.fields)
+
+    @property
+    def top_level_fields(self) -> frozenset[str]:
+        return frozenset(field.split(".", 1)[0] for field in self.fields) | ALWAYS_RETURNED_FIELDS
+
+    def wrap(self, data: dict[str, Any]) -> "ProjectionDict":
+        return ProjectionDict(data, projection=self)
+
+
+_warned_fields: set[tuple[str, str]] = set()
+_warned_fields_lock = threading.Lock()
+
+
+class ProjectionDict(dict[str, Any]):
+    """Response data which warns when code reads field not requested by projection.
+
+    Field outside projection means preset must be extended, else code gets KeyError
+    or silently default value. Every field warned once per process.
+    """
+
+    def __init__(self, data: dict[str, Any], projection: Projection):
+        super().__init__(data)
+        self.projection = projection
+
+    def _check_field(self, key: str) -> None:
+        if key in self.projection.top_level_fields:
+            return
+        warn_key = (self.projection.name, key)
+        with _warned_fields_lock:
+            if warn_key in _warned_fields:
+                return
+            _warned_fields.add(warn_key)
+        logger.warning("Field '%s' read outside of asana projection '%s'", key, self.projection.name)
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        self._check_field(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        self._check_field(key)
+        return super().get(key, default)
+
+
+class TaskProjection:
+    CREATIVE = Projection(
+        name="creative_task",
+        fields=(
+            "name",
+            "permalink_url",
+            "completed",
+            "assignee",
+            "custom_fields.name",
+            "custom_fields.display_value",
+            "custom_fields.text_value",
+        ),
+    )
+    OFFBOARDING = Projection(
+        name="offboarding_task",
+        fields=(
+            "permalink_url",
+            "custom_fields.name",
+            "custom_fields.type",
+            "custom_fields.text_value",
+            "custom_fields.date_value",
+        ),
+    )
+    COMMENT = Projection(
+        name="comment_task",
+        fields=("name", "permalink_url"),
+    )
+
+
+class StoryProjection:
+    COMMENT = Projection(
+        name="comment_story",
+        fields=("text", "created_by", "resource_subtype"),
+    )
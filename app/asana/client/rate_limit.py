@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Protocol
+
+from common.redis import get_redis
+from django.conf import settings
+from redis import Redis, RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(Protocol):
+    def reserve(self, cost: int = 1) -> float:
+        """Take cost tokens and return seconds caller must wait before request."""
+        ...
+
+    def pause(self, seconds: float) -> None:
+        """Stop all callers for seconds, e.g. after 429 with Retry-After."""
+        ...
+
+
+class TokenBucket:
+    """Thread-safe in-process token bucket.
+
+    Tokens may go negative: every caller reserves own slot in queue and waits its turn,
+    so concurrent callers are spread evenly at `rate` requests per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        # moment for which _tokens is valid, in future while paused
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: int = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated_at:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+            self._tokens -= cost
+            wait = self._updated_at - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            paused_until = time.monotonic() + seconds
+            if paused_until > self._updated_at:
+                self._tokens = min(self._tokens, 0)
+                self._updated_at = paused_until
+
+
+# same algorithm as TokenBucket, time from redis server so workers clocks not matter
+_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local redis_time = redis.call('TIME')
+local now = tonumber(redis_time[1]) * 1000 + math.floor(tonumber(redis_time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+if now > updated_at then
+    tokens = math.min(capacity, tokens + (now - updated_at) * rate / 1000)
+    updated_at = now
+end
+tokens = tokens - cost
+local wait = updated_at - now
+if tokens < 0 then
+    wait = wait - tokens * 1000 / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', updated_at)
+redis.call('PEXPIRE', KEYS[1], ttl)
+return math.ceil(wait)
+"""
+
+_PAUSE_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+local redis_time = redis.call('TIME')
+local now = tonumber(redis_time[1]) * 1000 + math.floor(tonumber(redis_time[2]) / 1000)
+local paused_until = now + tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or 0
+local updated_at = tonumber(state[2]) or now
+if paused_until > updated_at then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tokens, 0)), 'updated_at', paused_until)
+end
+redis.call('PEXPIRE', KEYS[1], ttl)
+return 0
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket shared by all workers through redis.
+
+    If redis not available falls back to in-process bucket, requests still limited per process.
+    After redis error redis not used for REDIS_RETRY_INTERVAL, so every request not waits socket timeout.
+    """
+
+    REDIS_RETRY_INTERVAL = 30
+
+    def __init__(self, redis: Redis, key: str, rate: float, capacity: float, fallback: TokenBucket):
+        self.redis = redis
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.fallback = fallback
+        self._reserve_script = redis.register_script(_RESERVE_SCRIPT)
+        self._pause_script = redis.register_script(_PAUSE_SCRIPT)
+        self._redis_unavailable_until = 0.0
+
+    @property
+    def _is_redis_available(self) -> bool:
+        return time.monotonic() >= self._redis_unavailable_until
+
+    def _mark_redis_unavailable(self, error: RedisError) -> None:
+        logger.warning("Redis rate limiter unavailable, use local bucket: %s", error)
+        self._redis_unavailable_until = time.monotonic() + self.REDIS_RETRY_INTERVAL
+
+    @property
+    def _ttl_ms(self) -> int:
+        # state older than full refill time equals to full bucket
+        return int(self.capacity / self.rate * 1000) + 60_000
+
+    def reserve(self, cost: int = 1) -> float:
+        if not self._is_redis_available:
+            return self.fallback.reserve(cost=cost)
+        try:
+            wait_ms = self._reserve_script(keys=[self.key], args=[self.rate, self.capacity, cost, self._ttl_ms])
+        except RedisError as error:
+            self._mark_redis_unavailable(error=error)
+            return self.fallback.reserve(cost=cost)
+        return int(wait_ms) / 1000
+
+    def pause(self, seconds: float) -> None:
+        self.fallback.pause(seconds=seconds)
+        if not self._is_redis_available:
+            return
+        try:
+            self._pause_script(keys=[self.key], args=[int(seconds * 1000), self._ttl_ms])
+        except RedisError as error:
+            self._mark_redis_unavailable(error=error)
+
+
+def acquire(rate_limiter: RateLimiter, cost: int = 1) -> None:
+    """Block until request allowed by rate limiter."""
+    wait = rate_limiter.reserve(cost=cost)
+    if wait > 0:
+        logger.debug("Rate limit: wait %.3f s", wait)
+        time.sleep(wait)
+
+
+_shared_rate_limiter: RateLimiter | None = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Return rate limiter of asana token shared by all clients of process (and workers if redis enabled)."""
+    global _shared_rate_limiter  # noqa: PLW0603
+    if _shared_rate_limiter is None:
+        with _shared_rate_limiter_lock:
+            if _shared_rate_limiter is None:
+                rate = settings.ASANA_RATE_LIMIT_PER_MINUTE / 60
+                # allow short bursts but not whole minute quota at once
+                capacity = max(1.0, rate * 5)
+                local_bucket = TokenBucket(rate=rate, capacity=capacity)
+                redis = get_redis()
+                if redis is None:
+                    _shared_rate_limiter = local_bucket
+                else:
+                    _shared_rate_limiter = RedisTokenBucket(
+                        redis=redis,
+                        key="asana:rate_limit",
+                        rate=rate,
+                        capacity=capacity,
+                        fallback=local_bucket,
+                    )
+    return _shared_rate_limiter
+
+
+def get_retry_after(headers: Mapping[str, str], attempt: int) -> float:
+    """Seconds to wait after 429, Retry-After header or exponential backoff if header missing."""
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            logger.warning("Invalid Retry-After header: %s", retry_after)
+    return float(2**attempt)
@@ -0,0 +1,60 @@
+import os
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True)
+class SessionConfig:
+    """Connection pool and transport retry settings of http session."""
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    status_forcelist: tuple[int, ...] = (500, 502, 503, 504)
+    allowed_methods: tuple[str, ...] = ("GET", "PUT")
+
+
+def build_session(config: SessionConfig) -> requests.Session:
+    retries = Retry(
+        total=config.max_retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.status_forcelist,
+        allowed_methods=frozenset(config.allowed_methods),
+        # last response returned as is, raise_for_status() make error from it
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_sessions: dict[tuple[int, SessionConfig], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_shared_session(config: SessionConfig) -> requests.Session:
+    """Return session shared by all clients of process with same config.
+
+    Sessions are keyed by pid: after fork (celery prefork pool) child must not reuse
+    sockets opened by parent, so every process builds own pool.
+    """
+    key = (os.getpid(), config)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = build_session(config=config)
+                _sessions[key] = session
+    return session
@@ -0,0 +1,14 @@
+from typing import Any
+
+
+def prepare_params(params: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Convert opt_fields list to comma separated string as asana api expects, drop empty opt_fields."""
+    if not params or "opt_fields" not in params:
+        return params
+    params = dict(params)
+    opt_fields = params.pop("opt_fields")
+    if isinstance(opt_fields, (list, tuple)):
+        opt_fields = ",".join(opt_fields)
+    if opt_fields:
+        params["opt_fields"] = opt_fields
+    return params
@@ -9,8 +9,41 @@ CONSTANCE_CONFIG = {
         "Название поля с указанием ссылки на работу в таске на досках дизайна",
         str,
     ),
+    "ASANA_AVATAR_MAX_SIZE": (
+        0,
+        "Максимальный размер стороны аватара пользователя асаны в px, 0 - без изменения размера",
+        int,
+    ),
+    "ASANA_AVATAR_WEBP": (
+        False,
+        "Сохранять аватары пользователей асаны в WebP",
+        bool,
+    ),
+    "ASANA_WEBHOOK_HANDLER_TIMEOUT": (
+        300,
+        "Время ожидания обработчика вебхука асаны в секундах, при нескольких обработчиках",
+        int,
+    ),
+    "ASANA_WEBHOOK_ARCHIVE_AFTER_DAYS": (
+        30,
+        "Через сколько дней заголовки и тело запросов вебхуков асаны сжимаются в архив",
+        int,
+    ),
+    "ASANA_WEBHOOK_RETENTION_DAYS": (
+        0,
+        "Через сколько дней запросы вебхуков асаны удаляются, 0 - хранить всегда",
+        int,
+    ),
 }
 
 CONSTANCE_CONFIG_FIELDSETS = {
-    "ASANA": ("DESIGN_TASK_BAYER_CUSTOM_FIELD_NAME", "DESIGN_TASK_LINK_ON_WORK_FIELD_NAME"),
+    "ASANA": (
+        "DESIGN_TASK_BAYER_CUSTOM_FIELD_NAME",
+        "DESIGN_TASK_LINK_ON_WORK_FIELD_NAME",
+        "ASANA_AVATAR_MAX_SIZE",
+        "ASANA_AVATAR_WEBP",
+        "ASANA_WEBHOOK_HANDLER_TIMEOUT",
+        "ASANA_WEBHOOK_ARCHIVE_AFTER_DAYS",
+        "ASANA_WEBHOOK_RETENTION_DAYS",
+    ),
 }
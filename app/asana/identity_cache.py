@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Literal, cast
+
+from cachetools import TLRUCache
+from common.redis import get_redis
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from redis import RedisError
+
+from .models import AtlasAsanaUser
+
+logger = logging.getLogger(__name__)
+
+UserKeyField = Literal["membership_id", "user_id"]
+USER_KEY_FIELDS: tuple[UserKeyField, ...] = ("membership_id", "user_id")
+
+
+@dataclass(frozen=True)
+class MissingUser:
+    """Cached miss: user cant be loaded from asana (deleted or not atlas workspace member)."""
+
+    reason: str = ""
+
+
+CacheEntry = AtlasAsanaUser | MissingUser
+
+
+class AsanaUserIdentityCache:
+    """Two tier identity map of asana users: in-process LRU and redis (django cache alias).
+
+    Same user cached by membership_id and by user_id. Misses cached for MISSING_TTL,
+    so mentions of deleted or foreign users not repeat api calls. Local tier lives max
+    LOCAL_MAX_TTL when redis tier used: invalidation reaches other processes only through redis.
+    Redis errors ignored, cache works as miss.
+    """
+
+    KEY_PREFIX = "asana_user"
+    TTL = 60 * 60
+    MISSING_TTL = 60 * 5
+    LOCAL_MAX_TTL = 60
+
+    def __init__(
+        self,
+        local_maxsize: int = 4096,
+        redis_cache_alias: str | None = "redis",
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.redis_cache_alias = redis_cache_alias
+        self._local: TLRUCache[tuple[UserKeyField, str], CacheEntry] = TLRUCache(
+            maxsize=local_maxsize,
+            ttu=self._local_expire_at,
+            timer=timer,
+        )
+        self._lock = threading.Lock()
+
+    def _get_ttl(self, entry: CacheEntry) -> int:
+        return self.MISSING_TTL if isinstance(entry, MissingUser) else self.TTL
+
+    def _local_expire_at(self, key: tuple[UserKeyField, str], value: CacheEntry, now: float) -> float:  # noqa: ARG002
+        ttl = self._get_ttl(value)
+        if self._redis_cache is not None:
+            ttl = min(ttl, self.LOCAL_MAX_TTL)
+        return now + ttl
+
+    @property
+    def _redis_cache(self) -> BaseCache | None:
+        if self.redis_cache_alias is None or not settings.REDIS_ENABLED:
+            return None
+        return caches[self.redis_cache_alias]
+
+    def _redis_key(self, field: UserKeyField, value: str) -> str:
+        return f"{self.KEY_PREFIX}:{field}:{value}"
+
+    def get_many(self, field: UserKeyField, values: Iterable[str]) -> dict[str, CacheEntry]:
+        """Return cached users and misses by field values, values not in cache skipped."""
+        result: dict[str, CacheEntry] = {}
+        not_local: list[str] = []
+        with self._lock:
+            for value in dict.fromkeys(values):
+                entry = self._local.get((field, value))
+                if entry is None:
+                    not_local.append(value)
+                else:
+                    result[value] = entry
+        redis_cache = self._redis_cache
+        if not not_local or redis_cache is None:
+            return result
+        redis_keys = {self._redis_key(field=field, value=value): value for value in not_local}
+        try:
+            redis_entries = redis_cache.get_many(list(redis_keys))
+        except Exception:
+            logger.warning("Asana user cache: redis get error", exc_info=True)
+            return result
+        with self._lock:
+            for redis_key, entry in redis_entries.items():
+                value = redis_keys[redis_key]
+                self._local[(field, value)] = entry
+                result[value] = entry
+        return result
+
+    def get(self, field: UserKeyField, value: str) -> CacheEntry | None:
+        return self.get_many(field=field, values=[value]).get(value)
+
+    def _set_many(self, entries: dict[tuple[UserKeyField, str], CacheEntry]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                self._local[key] = entry
+        redis_cache = self._redis_cache
+        if redis_cache is None:
+            return
+        # redis set_many has one timeout, entries grouped by ttl
+        by_ttl: dict[int, dict[str, CacheEntry]] = {}
+        for (field, value), entry in entries.items():
+            by_ttl.setdefault(self._get_ttl(entry), {})[self._redis_key(field=field, value=value)] = entry
+        try:
+            for ttl, redis_entries in by_ttl.items():
+                redis_cache.set_many(redis_entries, timeout=ttl)
+        except Exception:
+            logger.warning("Asana user cache: redis set error", exc_info=True)
+
+    def set_many(self, users: Iterable[AtlasAsanaUser]) -> None:
+        self._set_many({(field, getattr(user, field)): user for user in users for field in USER_KEY_FIELDS})
+
+    def set(self, user: AtlasAsanaUser) -> None:
+        self.set_many(users=[user])
+
+    def set_missing(self, field: UserKeyField, values: Iterable[str], reason: str = "") -> None:
+        self._set_many({(field, value): MissingUser(reason=reason) for value in values})
+
+    def invalidate_many(self, users: Iterable[AtlasAsanaUser]) -> None:
+        keys = [(field, getattr(user, field)) for user in users for field in USER_KEY_FIELDS]
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        redis_cache = self._redis_cache
+        if redis_cache is None:
+            return
+        try:
+            redis_cache.delete_many([self._redis_key(field=field, value=value) for field, value in keys])
+        except Exception:
+            logger.warning("Asana user cache: redis delete error", exc_info=True)
+
+    def invalidate(self, user: AtlasAsanaUser) -> None:
+        self.invalidate_many(users=[user])
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+_shared_user_identity_cache: AsanaUserIdentityCache | None = None
+_shared_user_identity_cache_lock = threading.Lock()
+
+
+def get_shared_user_identity_cache() -> AsanaUserIdentityCache:
+    global _shared_user_identity_cache  # noqa: PLW0603
+    if _shared_user_identity_cache is None:
+        with _shared_user_identity_cache_lock:
+            if _shared_user_identity_cache is None:
+                _shared_user_identity_cache = AsanaUserIdentityCache()
+    return _shared_user_identity_cache
+
+
+USERS_GENERATION_KEY = "asana_user:generation"
+_local_users_generation = 0
+_local_users_generation_lock = threading.Lock()
+
+
+def get_users_generation() -> int | None:
+    """Return counter changed on every change of asana users table, None if it cant be read.
+
+    Shared through redis if enabled, so data built from users table (mention map)
+    rebuilt by all processes after change.
+    """
+    redis = get_redis()
+    if redis is None:
+        return _local_users_generation
+    try:
+        value = cast("bytes | None", redis.get(USERS_GENERATION_KEY))
+    except RedisError:
+        logger.warning("Asana users generation: redis get error", exc_info=True)
+        return None
+    return int(value) if value else 0
+
+
+def reset_local_users_generation() -> None:
+    global _local_users_generation  # noqa: PLW0603
+    with _local_users_generation_lock:
+        _local_users_generation = 0
+
+
+def bump_users_generation() -> None:
+    global _local_users_generation  # noqa: PLW0603
+    with _local_users_generation_lock:
+        _local_users_generation += 1
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        redis.incr(USERS_GENERATION_KEY)
+    except RedisError:
+        logger.warning("Asana users generation: redis incr error", exc_info=True)
@@ -0,0 +1,58 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from asana.benchmarks.runner import BenchmarkResult, run_benchmarks
+from asana.benchmarks.scenarios import SCENARIOS
+from asana.benchmarks.server import ServerConfig
+
+
+class Command(BaseCommand):
+    help = "Benchmark asana integration against fake asana api, runs on temporary test database"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--scales", nargs="+", type=int, default=[100, 1000, 10000])
+        parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every api request")
+        parser.add_argument("--page-size", type=int, default=100, help="Max items on page of fake api")
+        parser.add_argument("--no-memory", action="store_true", help="Not trace peak memory, it slows down code")
+        parser.add_argument("--output", type=Path, help="Path of json report")
+        parser.add_argument("--verbose-logs", action="store_true", help="Keep logs of benchmarked code")
+
+    def _write_result(self, result: BenchmarkResult) -> None:
+        self.stdout.write(
+            f"{result.scenario:<28} scale={result.scale:<6} time={result.wall_time:>9.3f}s "
+            f"requests={result.requests_count:<6} batch_actions={result.batch_actions_count:<6} "
+            f"peak_memory={'-' if result.peak_memory is None else f'{result.peak_memory / 1024 / 1024:.1f}MiB'}",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        _ = args
+        server_config = ServerConfig(latency=options["latency"], page_size=options["page_size"])
+        if not options["verbose_logs"]:
+            # logging of benchmarked code is noise in output and in measured time
+            logging.disable(logging.WARNING)
+        old_databases_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with (
+                tempfile.TemporaryDirectory() as media_root,
+                override_settings(MEDIA_ROOT=media_root, REDIS_ENABLED=False),
+            ):
+                report = run_benchmarks(
+                    scenarios=options["scenarios"],
+                    scales=options["scales"],
+                    server_config=server_config,
+                    on_result=self._write_result,
+                    trace_memory=not options["no_memory"],
+                )
+        finally:
+            teardown_databases(old_databases_config, verbosity=0)
+            logging.disable(logging.NOTSET)
+        if options["output"]:
+            options["output"].write_text(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+            self.stdout.write(f"Report saved: {options['output']}")
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("asana", "0025_atlasasanauser_loaded_avatar_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AsanaEventSyncToken",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("resource_id", models.CharField(max_length=50, unique=True)),
+                (
+                    "resource_type",
+                    models.CharField(
+                        choices=[("project", "Проект"), ("section", "Секция"), ("task", "Задача")], max_length=50
+                    ),
+                ),
+                ("sync_token", models.CharField(max_length=254)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
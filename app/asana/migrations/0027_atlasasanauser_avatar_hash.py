@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("asana", "0026_asanaeventsynctoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="atlasasanauser",
+            name="avatar_etag",
+            field=models.CharField(blank=True, max_length=254),
+        ),
+        migrations.AddField(
+            model_name="atlasasanauser",
+            name="avatar_last_modified",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="atlasasanauser",
+            name="avatar_sha256",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("asana", "0027_atlasasanauser_avatar_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="asanawebhookrequestdata",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Ожидает"),
+                    ("success", "Успешно"),
+                    ("partial", "Частично"),
+                    ("failed", "Ошибка"),
+                    ("no_handlers", "Нет слушателей"),
+                    ("duplicate", "Повтор"),
+                ],
+                default="pending",
+                max_length=30,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:57
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes of big tables created without write lock
+    atomic = False
+
+    dependencies = [
+        ("asana", "0028_asanawebhookrequestdata_status_duplicate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asanawebhookrequestdata",
+            name="archived_data",
+            field=models.BinaryField(default=None, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="asanawebhookrequestdata",
+            index=models.Index(fields=["webhook", "status", "created"], name="asana_whreq_wh_status_created"),
+        ),
+        AddIndexConcurrently(
+            model_name="asanawebhookrequestdata",
+            index=models.Index(fields=["created"], name="asana_whreq_created"),
+        ),
+    ]
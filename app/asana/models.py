@@ -33,6 +33,19 @@ class AtlasAsanaUser(models.Model):
         blank=True,
         max_length=254,
     )
+    avatar_sha256 = models.CharField(
+        blank=True,
+        max_length=64,
+    )
+    # validators of loaded avatar response for conditional GET
+    avatar_etag = models.CharField(
+        blank=True,
+        max_length=254,
+    )
+    avatar_last_modified = models.CharField(
+        blank=True,
+        max_length=64,
+    )
     owner = models.ForeignKey(
         to=AtlasUser,
         on_delete=models.SET_NULL,
@@ -100,6 +113,7 @@ class ProcessingStatus(models.TextChoices):
     PARTIAL = "partial", "Частично"
     FAILED = "failed", "Ошибка"
     NO_HANDLERS = "no_handlers", "Нет слушателей"
+    DUPLICATE = "duplicate", "Повтор"
 
 
 class AsanaWebhookRequestData(models.Model):
@@ -118,10 +132,31 @@ class AsanaWebhookRequestData(models.Model):
         blank=True,
         default=dict,
     )
+    # False while saved by webhook queue and process task not sent
+    is_dispatched = models.BooleanField(
+        default=True,
+    )
+    # gzip json of headers and payload of old request, fields itself cleared
+    archived_data = models.BinaryField(
+        null=True,
+        default=None,
+        editable=False,
+    )
     created = models.DateTimeField(
         auto_now_add=True,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(fields=("webhook", "status", "created"), name="asana_whreq_wh_status_created"),
+            models.Index(fields=("created",), name="asana_whreq_created"),
+            models.Index(
+                fields=("is_dispatched",),
+                condition=models.Q(is_dispatched=False),
+                name="asana_whreq_not_dispatched",
+            ),
+        )
+
     def __str__(self) -> str:
         return f"<AsanaWebhookRequestData:{self.pk}>"
 
@@ -140,3 +175,25 @@ class WebhookHandler(models.Model):
 
     def __str__(self) -> str:
         return self.name
+
+
+class AsanaEventSyncToken(models.Model):
+    """Last processed sync token of asana events api for resource."""
+
+    resource_id = models.CharField(
+        max_length=50,
+        unique=True,
+    )
+    resource_type = models.CharField(
+        max_length=50,
+        choices=AsanaResourceType,
+    )
+    sync_token = models.CharField(
+        max_length=254,
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.resource_type}:{self.resource_id}"
@@ -1,17 +1,37 @@
+import asyncio
+import hashlib
 import logging
-from dataclasses import dataclass
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from enum import Enum
+from http import HTTPStatus
+from io import BytesIO
 from typing import Any
 
 import requests
 from common.exception import AppExceptionError
+from common.metrics import observe_call
+from constance import config
 from django.core.files.base import ContentFile
+from django.db import transaction
 from message_sender.models import AtlasUser
+from PIL import Image
 from requests.exceptions import RequestException
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, AsyncAsanaApiClient, BatchAction
+from asana.client.exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError
+from asana.client.session import SessionConfig, get_shared_session
 
 from .constants import ATLAS_WORKSPACE_ID
+from .identity_cache import (
+    AsanaUserIdentityCache,
+    MissingUser,
+    UserKeyField,
+    bump_users_generation,
+    get_shared_user_identity_cache,
+)
 from .models import AtlasAsanaUser
 from .services import map_messenger_position_to_asana
 from .utils import clean_user_avatar_url
@@ -39,109 +59,276 @@ class AsanaUserDTO:
         )
 
 
+class AvatarSyncAction(Enum):
+    UPDATE = "update"
+    LOAD = "load"
+    DELETE = "delete"
+    NOTHING = "nothing"
+
+
+def get_avatar_sync_action(asana_user: AtlasAsanaUser) -> AvatarSyncAction:
+    """Compare actual asana avatar url of user with url of loaded avatar."""
+    loaded_url = asana_user.loaded_avatar_url
+    actual_url = asana_user.avatar_url
+
+    # asana avatar not exist
+    if not actual_url:
+        if loaded_url:
+            return AvatarSyncAction.DELETE
+        return AvatarSyncAction.NOTHING
+
+    # asana avatar exist
+    if not loaded_url:
+        return AvatarSyncAction.LOAD
+
+    # not equal urls
+    if clean_user_avatar_url(loaded_url) != clean_user_avatar_url(actual_url):
+        return AvatarSyncAction.UPDATE
+
+    return AvatarSyncAction.NOTHING
+
+
+@dataclass(frozen=True)
+class AvatarDownload:
+    url: str
+    # None if avatar not modified since last download
+    content: bytes | None
+    etag: str = ""
+    last_modified: str = ""
+
+
+@dataclass(frozen=True)
+class AvatarSyncResult:
+    loaded_count: int = 0
+    # downloaded bytes equal to saved avatar or server answered 304
+    not_modified_count: int = 0
+    deleted_count: int = 0
+    failed_count: int = 0
+
+
 class AvatarService:
-    """Download asana avatar by url for asana user model."""
+    """Download asana avatars for asana user models.
+
+    Downloads run concurrently in thread pool, models saved by calling thread.
+    Avatar file rewritten only if sha256 of downloaded bytes changed.
+    """
+
+    MAX_WORKERS = 8
+    DOWNLOAD_TIMEOUT = 10
 
-    def _download_avatar(self, url: str) -> ContentFile:  # type: ignore[type-arg]
-        resp = requests.get(url, timeout=10)
+    def __init__(self, session: requests.Session | None = None, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.session = session or get_shared_session(SessionConfig(pool_maxsize=max_workers))
+
+    def _download_avatar(self, url: str, etag: str = "", last_modified: str = "") -> AvatarDownload:
+        """Download avatar, conditional GET if validators of previous download passed.
+
+        Raises:
+             RequestException: if cant download avatar
+
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        with observe_call(service="asana_avatars", method="GET", url=url) as call:
+            resp = self.session.get(url, headers=headers, timeout=self.DOWNLOAD_TIMEOUT)
+            call.set_response(resp)
+        if resp.status_code == HTTPStatus.NOT_MODIFIED:
+            return AvatarDownload(url=url, content=None, etag=etag, last_modified=last_modified)
         resp.raise_for_status()
-        return ContentFile(resp.content)
+        return AvatarDownload(
+            url=url,
+            content=resp.content,
+            etag=resp.headers.get("ETag", ""),
+            last_modified=resp.headers.get("Last-Modified", ""),
+        )
+
+    def _prepare_image(self, content: bytes) -> tuple[bytes, str]:
+        """Resize and re-encode avatar by constance settings, return bytes and file extension."""
+        max_size: int = config.ASANA_AVATAR_MAX_SIZE
+        to_webp: bool = config.ASANA_AVATAR_WEBP
+        if not max_size and not to_webp:
+            return content, "png"
+        try:
+            with Image.open(BytesIO(content)) as image:
+                if max_size:
+                    image.thumbnail((max_size, max_size))
+                output = BytesIO()
+                image.save(output, format="WEBP" if to_webp else "PNG")
+        except OSError:
+            logger.exception("Cant convert avatar image, original saved")
+            return content, "png"
+        return output.getvalue(), "webp" if to_webp else "png"
+
+    def _save(self, asana_user: AtlasAsanaUser, download: AvatarDownload) -> bool:
+        """Save downloaded avatar to user, return False if avatar not changed."""
+        update_fields = ["loaded_avatar_url", "avatar_etag", "avatar_last_modified"]
+        is_avatar_update = False
+        if download.content is not None:
+            content_sha256 = hashlib.sha256(download.content).hexdigest()
+            if content_sha256 != asana_user.avatar_sha256 or not asana_user.avatar:
+                content, extension = self._prepare_image(download.content)
+                if asana_user.avatar:
+                    asana_user.avatar.delete(save=False)
+                asana_user.avatar.save(f"{asana_user.user_id}.{extension}", ContentFile(content), save=False)
+                asana_user.avatar_sha256 = content_sha256
+                update_fields += ["avatar", "avatar_sha256"]
+                is_avatar_update = True
+        asana_user.loaded_avatar_url = download.url
+        asana_user.avatar_etag = download.etag
+        asana_user.avatar_last_modified = download.last_modified
+        asana_user.save(update_fields=update_fields)
+        return is_avatar_update
 
     def load(self, asana_user: AtlasAsanaUser) -> bool:
         is_avatar_update = False
         if asana_user.avatar_url:
             try:
-                avatar_file = self._download_avatar(url=asana_user.avatar_url)
+                download = self._download_avatar(url=asana_user.avatar_url)
             except RequestException:
                 logger.exception("Cant load avatar for asana user %s, url: %s", asana_user, asana_user.avatar_url)
             else:
-                filename = f"{asana_user.user_id}.png"
-                asana_user.avatar.save(
-                    filename,
-                    avatar_file,
-                    save=False,
-                )
-                asana_user.loaded_avatar_url = asana_user.avatar_url
-                asana_user.save()
-                is_avatar_update = True
+                is_avatar_update = self._save(asana_user=asana_user, download=download)
         return is_avatar_update
 
     def delete(self, asana_user: AtlasAsanaUser) -> None:
         asana_user.avatar.delete(save=False)
         asana_user.loaded_avatar_url = ""
-        asana_user.save()
+        asana_user.avatar_sha256 = ""
+        asana_user.avatar_etag = ""
+        asana_user.avatar_last_modified = ""
+        asana_user.save(
+            update_fields=["avatar", "loaded_avatar_url", "avatar_sha256", "avatar_etag", "avatar_last_modified"],
+        )
+
+    def sync(self, users: Iterable[AtlasAsanaUser], *, revalidate: bool = False) -> AvatarSyncResult:
+        """Load, update or delete avatars of users by their avatar_url.
+
+        With revalidate avatars with not changed url checked by conditional GET too.
+        Users with same avatar url share one download.
+        """
+        deleted_count = 0
+        # url -> (etag, last_modified), users
+        downloads: dict[str, tuple[tuple[str, str], list[AtlasAsanaUser]]] = {}
+        for user in users:
+            action = get_avatar_sync_action(asana_user=user)
+            if action == AvatarSyncAction.DELETE:
+                logger.info("Need delete avatar for user %s", user)
+                self.delete(asana_user=user)
+                deleted_count += 1
+                continue
+            if action in (AvatarSyncAction.LOAD, AvatarSyncAction.UPDATE):
+                logger.info("Need load new avatar for user %s", user)
+                validators = ("", "")
+            elif revalidate and user.avatar_url and user.avatar:
+                validators = (user.avatar_etag, user.avatar_last_modified)
+            else:
+                continue
+            downloads.setdefault(user.avatar_url, (validators, []))[1].append(user)
+
+        loaded_count = not_modified_count = failed_count = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download_avatar, url, etag, last_modified): url
+                for url, ((etag, last_modified), _) in downloads.items()
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                url_users = downloads[url][1]
+                try:
+                    download = future.result()
+                except RequestException:
+                    logger.exception("Cant load avatar for asana users %s, url: %s", url_users, url)
+                    failed_count += len(url_users)
+                    continue
+                for user in url_users:
+                    if self._save(asana_user=user, download=download):
+                        loaded_count += 1
+                    else:
+                        not_modified_count += 1
+        return AvatarSyncResult(
+            loaded_count=loaded_count,
+            not_modified_count=not_modified_count,
+            deleted_count=deleted_count,
+            failed_count=failed_count,
+        )
+
+
+def is_missing_user_error(error: Exception) -> bool:
+    """User not exist in asana or not member of atlas workspace, not transient api error."""
+    if isinstance(error, (AsanaNotFoundError, AsanaForbiddenError)):
+        return True
+    return isinstance(error, AppExceptionError) and not isinstance(error, AsanaApiClientError)
 
 
 class AsanaUserRepository:
+    # fields synced from asana and messenger users by update_all
+    SYNC_FIELDS = ("name", "email", "avatar_url", "owner_id", "position")
+    BULK_BATCH_SIZE = 500
+
     @dataclass(frozen=True)
     class UpdateUsersResult:
         created_user_ids: list[int]
         created_count: int
         deleted_count: int
+        updated_count: int = 0
+        # number of updated users by changed field
+        changed_fields: dict[str, int] = field(default_factory=dict)
+        avatars: AvatarSyncResult = field(default_factory=AvatarSyncResult)
 
-    class AvatarSyncAction(Enum):
-        UPDATE = "update"
-        LOAD = "load"
-        DELETE = "delete"
-        NOTHING = "nothing"
+    @dataclass(frozen=True)
+    class GetManyResult:
+        users: dict[str, AtlasAsanaUser]
+        not_found_membership_ids: list[str]
+
+    @dataclass(frozen=True)
+    class LoadManyResult(GetManyResult):
+        # not found in asana, without transient errors
+        missing_in_asana_ids: list[str]
 
-    def __init__(self, api_client: AsanaApiClient):
+    def __init__(
+        self,
+        api_client: AsanaApiClient,
+        async_api_client: AsyncAsanaApiClient | None = None,
+        identity_cache: AsanaUserIdentityCache | None = None,
+    ):
         self.api_client = api_client
+        self.async_api_client = async_api_client
+        self.identity_cache = identity_cache
         self.avatar_service = AvatarService()
 
-    def get_avatar_sync_action(self, user: AtlasAsanaUser, user_dto: AsanaUserDTO) -> AvatarSyncAction:
-        # TODO: not user api url, check url from model field
-        db_url: str | None = user.loaded_avatar_url
-        api_url: str | None = user_dto.photo_url
-
-        # asana avatar not exist
-        if api_url is None:
-            if db_url:
-                return self.AvatarSyncAction.DELETE
-            return self.AvatarSyncAction.NOTHING
-
-        # asana avatar exist
-        if not db_url:
-            return self.AvatarSyncAction.LOAD
-
-        # not equal urls
-        if clean_user_avatar_url(db_url) != clean_user_avatar_url(api_url):
-            return self.AvatarSyncAction.UPDATE
-
-        return self.AvatarSyncAction.NOTHING
+    @staticmethod
+    def _get_owners_by_email() -> dict[str, AtlasUser]:
+        """Return messenger users by email, first user wins for duplicated emails."""
+        owners: dict[str, AtlasUser] = {}
+        for owner in AtlasUser.objects.exclude(email="").order_by("pk"):
+            owners.setdefault(owner.email, owner)
+        return owners
+
+    @staticmethod
+    def _get_user_fields(user_dto: AsanaUserDTO, owner: AtlasUser | None) -> dict[str, Any]:
+        position = map_messenger_position_to_asana(messenger_position=owner.role) if owner else None
+        return {
+            "name": user_dto.name,
+            "email": user_dto.email,
+            "avatar_url": user_dto.photo_url if user_dto.photo_url else "",
+            "owner_id": owner.pk if owner else None,
+            "position": position if position else "",
+        }
 
     def _create_user(self, user_dto: AsanaUserDTO) -> AtlasAsanaUser:
         try:
             owner = AtlasUser.objects.get(email=user_dto.email)
-            position = map_messenger_position_to_asana(messenger_position=owner.role)
         except AtlasUser.DoesNotExist:
             owner = None
-            position = None
         return AtlasAsanaUser.objects.create(
             membership_id=user_dto.membership_id,
-            name=user_dto.name,
             user_id=user_dto.user_id,
-            avatar_url=user_dto.photo_url if user_dto.photo_url else "",
-            email=user_dto.email,
-            owner=owner,
-            position=position if position else "",
+            **self._get_user_fields(user_dto=user_dto, owner=owner),
         )
 
-    def _update_user(self, user: AtlasAsanaUser, user_dto: AsanaUserDTO) -> AtlasAsanaUser:
-        user.name = user_dto.name
-        user.email = user_dto.email
-        user.avatar_url = user_dto.photo_url if user_dto.photo_url else ""
-        try:
-            owner = AtlasUser.objects.get(email=user_dto.email)
-            position = map_messenger_position_to_asana(messenger_position=owner.role)
-        except AtlasUser.DoesNotExist:
-            owner = None
-            position = None
-        user.owner = owner
-        user.position = position if position else ""
-        user.save()
-        return user
-
     def _create_by_membership_id(self, membership_id: str) -> AtlasAsanaUser:
         """Create user by membership_id.
 
@@ -166,9 +353,9 @@ class AsanaUserRepository:
         """
         user_data = self.api_client.get_user(user_id=user_id)
         atlas_user_membership_id = None
-        user_memberships = self.api_client.get_workspace_memberships_for_user(user_id=user_id)
-        logger.info("user_memberships: %s", user_memberships)
+        user_memberships = self.api_client.iter_workspace_memberships_for_user(user_id=user_id)
         for membership_data in user_memberships:
+            logger.info("user membership: %s", membership_data)
             if membership_data["workspace"]["gid"] == str(ATLAS_WORKSPACE_ID):
                 atlas_user_membership_id = membership_data["gid"]
                 break
@@ -182,21 +369,13 @@ class AsanaUserRepository:
         )
         return self._create_user(user_dto=user_dto)
 
-    def get(
-        self,
-        *,
-        membership_id: str | None = None,
-        user_id: str | None = None,
-    ) -> AtlasAsanaUser:
-        """Get user by usr_id or membership_id.
+    def _get(self, *, membership_id: str | None, user_id: str | None) -> AtlasAsanaUser:
+        """Get user from DB or load it from asana.
 
         Raises:
              AsanaApiClientError: if cant get data from asana
 
         """
-        if membership_id is None and user_id is None:
-            msg = "Either membership_id or user_id must be provided"
-            raise ValueError(msg)
         try:
             if membership_id is not None:
                 user = AtlasAsanaUser.objects.get(membership_id=membership_id)
@@ -214,9 +393,154 @@ class AsanaUserRepository:
         else:
             return user
 
+    def get(
+        self,
+        *,
+        membership_id: str | None = None,
+        user_id: str | None = None,
+    ) -> AtlasAsanaUser:
+        """Get user by usr_id or membership_id.
+
+        Users and users not found in asana taken from identity cache if configured.
+
+        Raises:
+             AsanaApiClientError: if cant get data from asana
+
+        """
+        if membership_id is None and user_id is None:
+            msg = "Either membership_id or user_id must be provided"
+            raise ValueError(msg)
+        if self.identity_cache is None:
+            return self._get(membership_id=membership_id, user_id=user_id)
+        field: UserKeyField = "membership_id" if membership_id is not None else "user_id"
+        value = membership_id if membership_id is not None else user_id
+        assert value is not None  # noqa: S101
+        cached = self.identity_cache.get(field=field, value=value)
+        if isinstance(cached, MissingUser):
+            msg = f"Asana user not found by {field} {value} (cached): {cached.reason}"
+            raise AsanaNotFoundError(msg)
+        if cached is not None:
+            return cached
+        try:
+            user = self._get(membership_id=membership_id, user_id=user_id)
+        except AppExceptionError as error:
+            if is_missing_user_error(error):
+                self.identity_cache.set_missing(field=field, values=[value], reason=str(error))
+            raise
+        self.identity_cache.set(user=user)
+        return user
+
+    def _load_many_from_asana(self, membership_ids: list[str]) -> LoadManyResult:
+        """Load users by membership ids from asana by batch requests and create them.
+
+        Raises:
+             AsanaApiClientError: if batch request failed
+
+        """
+        users: dict[str, AtlasAsanaUser] = {}
+        not_found_ids: list[str] = []
+        missing_in_asana_ids: list[str] = []
+        if not membership_ids:
+            return self.LoadManyResult(users=users, not_found_membership_ids=[], missing_in_asana_ids=[])
+        logger.info("Try load users from Asana by membership_ids: %s", membership_ids)
+        memberships_data: dict[str, dict[str, Any]] = {}
+        memberships_results = self.api_client.batch(
+            [BatchAction.get(f"/workspace_memberships/{membership_id}") for membership_id in membership_ids],
+        )
+        for membership_id, membership_result in zip(membership_ids, memberships_results, strict=True):
+            if membership_result.error is not None:
+                logger.warning("Cant load membership %s: %s", membership_id, membership_result.error)
+                not_found_ids.append(membership_id)
+                if is_missing_user_error(membership_result.error):
+                    missing_in_asana_ids.append(membership_id)
+            else:
+                memberships_data[membership_id] = membership_result.get_data()
+        users_results = self.api_client.batch(
+            [BatchAction.get(f"/users/{data['user']['gid']}") for data in memberships_data.values()],
+        )
+        for (membership_id, membership_data), user_result in zip(
+            memberships_data.items(),
+            users_results,
+            strict=True,
+        ):
+            if user_result.error is not None:
+                logger.warning("Cant load user of membership %s: %s", membership_id, user_result.error)
+                not_found_ids.append(membership_id)
+                if is_missing_user_error(user_result.error):
+                    missing_in_asana_ids.append(membership_id)
+                continue
+            user_dto = AsanaUserDTO.from_api(membership_data=membership_data, user_data=user_result.get_data())
+            users[membership_id] = self._create_user(user_dto=user_dto)
+        return self.LoadManyResult(
+            users=users,
+            not_found_membership_ids=not_found_ids,
+            missing_in_asana_ids=missing_in_asana_ids,
+        )
+
+    def get_many(self, membership_ids: Sequence[str]) -> GetManyResult:
+        """Get users by membership ids, users missing in DB loaded from asana by batch requests.
+
+        Users that cant be loaded from asana returned in not_found_membership_ids.
+        Users and users not found in asana taken from identity cache if configured.
+
+        Raises:
+             AsanaApiClientError: if batch request failed
+
+        """
+        membership_ids = list(dict.fromkeys(membership_ids))
+        users: dict[str, AtlasAsanaUser] = {}
+        not_found_ids: list[str] = []
+        if self.identity_cache is not None:
+            for membership_id, cached in self.identity_cache.get_many("membership_id", membership_ids).items():
+                if isinstance(cached, MissingUser):
+                    not_found_ids.append(membership_id)
+                else:
+                    users[membership_id] = cached
+            membership_ids = [
+                membership_id
+                for membership_id in membership_ids
+                if membership_id not in users and membership_id not in not_found_ids
+            ]
+            if not membership_ids:
+                return self.GetManyResult(users=users, not_found_membership_ids=not_found_ids)
+        db_users = {
+            user.membership_id: user for user in AtlasAsanaUser.objects.filter(membership_id__in=membership_ids)
+        }
+        users.update(db_users)
+        missing_ids = [membership_id for membership_id in membership_ids if membership_id not in users]
+        loaded = self._load_many_from_asana(membership_ids=missing_ids)
+        users.update(loaded.users)
+        not_found_ids.extend(loaded.not_found_membership_ids)
+        if self.identity_cache is not None:
+            self.identity_cache.set_many(users=[*db_users.values(), *loaded.users.values()])
+            if loaded.missing_in_asana_ids:
+                self.identity_cache.set_missing(field="membership_id", values=loaded.missing_in_asana_ids)
+        return self.GetManyResult(users=users, not_found_membership_ids=not_found_ids)
+
+    async def _fetch_users_data_concurrently(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        assert self.async_api_client is not None  # noqa: S101
+        async with self.async_api_client as client:
+            users_data = await asyncio.gather(*(client.get_user(user_id=user_id) for user_id in user_ids))
+        return dict(zip(user_ids, users_data, strict=True))
+
+    def _fetch_users_data(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Load users data, concurrently if async client configured.
+
+        Raises:
+             AsanaApiClientError: if cant get data from asana
+
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if self.async_api_client is None:
+            return {user_id: self.api_client.get_user(user_id=user_id) for user_id in user_ids}
+        return asyncio.run(self._fetch_users_data_concurrently(user_ids=user_ids))
+
     def update_all(self) -> UpdateUsersResult:
         """Update all users.
 
+        Existing users and owners loaded by one query each, changes written by bulk queries,
+        only users with changed fields are updated.
+
         Raises:
              AsanaApiClientError: if cant get data from asana
 
@@ -225,47 +549,63 @@ class AsanaUserRepository:
             workspace_id=ATLAS_WORKSPACE_ID,
         )
         logger.info("Memberships in asana: %s", len(atlas_asana_memberships))
-        exist_memberships_in_db = [str(i) for i in AtlasAsanaUser.objects.values_list("membership_id", flat=True)]
+        users_data = self._fetch_users_data(
+            user_ids=[membership_data["user"]["gid"] for membership_data in atlas_asana_memberships],
+        )
         actual_memberships_ids: set[str] = {membership_data["gid"] for membership_data in atlas_asana_memberships}
-        deleted_count, deleted_by_model = AtlasAsanaUser.objects.exclude(
-            membership_id__in=actual_memberships_ids,
-        ).delete()
-        logger.info("Deleted: %s", deleted_count)
-        logger.info("Memberships in DB: %s", len(exist_memberships_in_db))
-        created_ids: list[int] = []
-        updated_ids: list[int] = []
-        for membership_data in atlas_asana_memberships:
-            membership_id = membership_data["gid"]
-            user_data = self.api_client.get_user(user_id=membership_data["user"]["gid"])
-            user_dto = AsanaUserDTO.from_api(
-                membership_data=membership_data,
-                user_data=user_data,
-            )
-            if membership_data["gid"] not in exist_memberships_in_db:
-                # create user
-                logger.info("Detect new Memberships: %s", membership_id)
-                user = self._create_user(user_dto=user_dto)
-                created_ids.append(user.pk)
-                self.avatar_service.load(asana_user=user)
-            else:
-                # update exist user
-                logger.info("Update Memberships: %s", membership_id)
-                user = AtlasAsanaUser.objects.get(membership_id=membership_data["gid"])
-                avatar_action = self.get_avatar_sync_action(user=user, user_dto=user_dto)
-                logger.info("Avatar action: %s", avatar_action)
-                user = self._update_user(user=user, user_dto=user_dto)
-                updated_ids.append(user.pk)
-                if avatar_action in (self.AvatarSyncAction.UPDATE, self.AvatarSyncAction.LOAD):
-                    logger.info("Need load new avatar for user %s", user)
-                    self.avatar_service.load(asana_user=user)
-                if avatar_action == self.AvatarSyncAction.DELETE:
-                    logger.info("Need delete avatar for user %s", user)
-                    self.avatar_service.delete(asana_user=user)
-
-        logger.info("New created: %s", len(created_ids))
-        logger.info("Updated: %s", len(updated_ids))
+        owners_by_email = self._get_owners_by_email()
+
+        new_users: list[AtlasAsanaUser] = []
+        changed_users: list[AtlasAsanaUser] = []
+        changed_fields: Counter[str] = Counter()
+        with transaction.atomic():
+            deleted_count, _ = AtlasAsanaUser.objects.exclude(membership_id__in=actual_memberships_ids).delete()
+            logger.info("Deleted: %s", deleted_count)
+            exist_users = {user.membership_id: user for user in AtlasAsanaUser.objects.select_for_update()}
+            logger.info("Memberships in DB: %s", len(exist_users))
+            for membership_data in atlas_asana_memberships:
+                user_dto = AsanaUserDTO.from_api(
+                    membership_data=membership_data,
+                    user_data=users_data[membership_data["user"]["gid"]],
+                )
+                user_fields = self._get_user_fields(user_dto=user_dto, owner=owners_by_email.get(user_dto.email))
+                user = exist_users.get(user_dto.membership_id)
+                if user is None:
+                    logger.info("Detect new Memberships: %s", user_dto.membership_id)
+                    new_users.append(
+                        AtlasAsanaUser(membership_id=user_dto.membership_id, user_id=user_dto.user_id, **user_fields),
+                    )
+                    continue
+                user_changed_fields = [name for name, value in user_fields.items() if getattr(user, name) != value]
+                if user_changed_fields:
+                    logger.info("Update Memberships: %s, fields: %s", user_dto.membership_id, user_changed_fields)
+                    for name in user_changed_fields:
+                        setattr(user, name, user_fields[name])
+                    changed_users.append(user)
+                    changed_fields.update(user_changed_fields)
+            AtlasAsanaUser.objects.bulk_create(new_users, batch_size=self.BULK_BATCH_SIZE)
+            if changed_users:
+                AtlasAsanaUser.objects.bulk_update(
+                    changed_users,
+                    fields=[name for name in self.SYNC_FIELDS if name in changed_fields],
+                    batch_size=self.BULK_BATCH_SIZE,
+                )
+        # bulk queries not send model signals, cached users invalidated here
+        if new_users or changed_users:
+            get_shared_user_identity_cache().invalidate_many(users=[*new_users, *changed_users])
+            bump_users_generation()
+
+        logger.info("New created: %s", len(new_users))
+        logger.info("Updated: %s, changed fields: %s", len(changed_users), dict(changed_fields))
+        # avatars synced after users committed, slow downloads not block users update
+        avatars_result = self.avatar_service.sync(users=[*new_users, *exist_users.values()])
+        logger.info("Avatars: %s", avatars_result)
+        created_ids = [user.pk for user in new_users]
         return self.UpdateUsersResult(
             created_user_ids=created_ids,
             created_count=len(created_ids),
             deleted_count=deleted_count,
+            updated_count=len(changed_users),
+            changed_fields=dict(changed_fields),
+            avatars=avatars_result,
         )
@@ -1,9 +1,20 @@
+import logging
 import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
 
+from common.redis import get_redis
 from django.db.models import QuerySet
 
-from .constants import Position
-from .models import AtlasAsanaUser
+from .client import AsanaApiClient
+from .client.exception import AsanaSyncTokenExpiredError
+from .constants import AsanaResourceType, Position
+from .identity_cache import get_users_generation
+from .models import AsanaEventSyncToken, AtlasAsanaUser
+
+logger = logging.getLogger(__name__)
 
 
 def get_user_profile_url_mention_map(asana_users: QuerySet[AtlasAsanaUser] | list[AtlasAsanaUser]) -> dict[str, str]:
@@ -26,18 +37,115 @@ def map_messenger_position_to_asana(messenger_position: str) -> Position | None:
 
 
 class AsanaCommentPrettifier:
+    """Replace profile urls of known users on mentions and other urls on "[link]".
+
+    Every url found by one regex pass and replaced by dict lookup, so work not depends on users count.
+    """
+
+    URL_PATTERN = re.compile(r"https?://[^\s]+")
+    PROFILE_URL_PATTERN = re.compile(r"https://app\.asana\.com/\d+/\d+/profile/\d+")
+
     def __init__(self, profile_urls_mention_map: dict[str, str]):
         self.profile_urls_mention_map = profile_urls_mention_map
 
     def _replace_asana_profile_urls_on_mention(self, text: str) -> str:
-        for profile_url, mention in self.profile_urls_mention_map.items():
-            text = text.replace(profile_url, mention)
-        return text
+        return self.PROFILE_URL_PATTERN.sub(
+            lambda match: self.profile_urls_mention_map.get(match.group(), match.group()),
+            text,
+        )
 
     def _replace_links(self, text: str) -> str:
-        url_pattern = re.compile(r"https?://[^\s]+")
-        return url_pattern.sub("[link]", text)
+        return self.URL_PATTERN.sub("[link]", text)
 
     def prettify(self, comment_text: str) -> str:
         comment_text = self._replace_asana_profile_urls_on_mention(text=comment_text)
         return self._replace_links(text=comment_text)
+
+
+# without redis users generation changed only in own process, prettifier rebuilt after TTL too
+COMMENT_PRETTIFIER_LOCAL_TTL = 60
+# users generation, monotonic expire time (None: until generation changed), prettifier
+_comment_prettifier: tuple[int, float | None, AsanaCommentPrettifier] | None = None
+_comment_prettifier_lock = threading.Lock()
+
+
+def get_comment_prettifier() -> AsanaCommentPrettifier:
+    """Return prettifier with mentions of all asana users, rebuilt only after users table changed."""
+    global _comment_prettifier  # noqa: PLW0603
+    generation = get_users_generation()
+    with _comment_prettifier_lock:
+        if generation is not None and _comment_prettifier is not None:
+            cached_generation, expire_at, prettifier = _comment_prettifier
+            if cached_generation == generation and (expire_at is None or time.monotonic() < expire_at):
+                return prettifier
+    asana_users = AtlasAsanaUser.objects.only("membership_id", "name")
+    prettifier = AsanaCommentPrettifier(profile_urls_mention_map=get_user_profile_url_mention_map(asana_users))
+    if generation is not None:
+        expire_at = time.monotonic() + COMMENT_PRETTIFIER_LOCAL_TTL if get_redis() is None else None
+        with _comment_prettifier_lock:
+            _comment_prettifier = (generation, expire_at, prettifier)
+    return prettifier
+
+
+def clear_comment_prettifier() -> None:
+    global _comment_prettifier  # noqa: PLW0603
+    with _comment_prettifier_lock:
+        _comment_prettifier = None
+
+
+@dataclass
+class EventsDelta:
+    resource_id: str
+    resource_type: AsanaResourceType
+    events: list[dict[str, Any]]
+    sync_token: str
+    is_full_rescan_required: bool
+
+
+@dataclass
+class AsanaEventsSyncService:
+    """Incremental sync of resource by asana events api.
+
+    Token saved only by commit() after caller processed delta, so not processed
+    events replayed on next run. Full rescan required on first sync and when token
+    expired (asana keeps events about 24 hours).
+    """
+
+    asana_api_client: AsanaApiClient
+
+    def fetch(self, resource_id: str, resource_type: AsanaResourceType) -> EventsDelta:
+        """Fetch events of resource since last committed sync token.
+
+        Raises:
+             AsanaApiClientError: if cant get events from asana
+
+        """
+        sync_token = (
+            AsanaEventSyncToken.objects.filter(resource_id=resource_id).values_list("sync_token", flat=True).first()
+        )
+        try:
+            events, new_sync_token = self.asana_api_client.get_events(resource_id=resource_id, sync_token=sync_token)
+        except AsanaSyncTokenExpiredError as error:
+            logger.info("Events sync token of %s %s missing or expired, full rescan", resource_type, resource_id)
+            return EventsDelta(
+                resource_id=resource_id,
+                resource_type=resource_type,
+                events=[],
+                sync_token=error.sync_token,
+                is_full_rescan_required=True,
+            )
+        logger.info("Events of %s %s since last sync: %s", resource_type, resource_id, len(events))
+        return EventsDelta(
+            resource_id=resource_id,
+            resource_type=resource_type,
+            events=events,
+            sync_token=new_sync_token,
+            is_full_rescan_required=False,
+        )
+
+    def commit(self, delta: EventsDelta) -> None:
+        """Save sync token of processed delta."""
+        AsanaEventSyncToken.objects.update_or_create(
+            resource_id=delta.resource_id,
+            defaults={"resource_type": delta.resource_type, "sync_token": delta.sync_token},
+        )
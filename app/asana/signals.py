@@ -0,0 +1,32 @@
+from typing import Any
+
+from constance.signals import config_updated
+from creative_quality.models import CreativeProjectSection
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .identity_cache import bump_users_generation, get_shared_user_identity_cache
+from .models import AsanaWebhook, AtlasAsanaUser, WebhookHandler
+from .webhook_actions.routing import get_shared_routing_cache
+
+
+@receiver(post_save, sender=AtlasAsanaUser)
+@receiver(post_delete, sender=AtlasAsanaUser)
+def invalidate_asana_user_cache(sender: type[AtlasAsanaUser], instance: AtlasAsanaUser, **kwargs: Any) -> None:  # noqa: ANN401
+    _ = sender, kwargs
+    get_shared_user_identity_cache().invalidate(user=instance)
+    bump_users_generation()
+
+
+@receiver(m2m_changed, sender=AsanaWebhook.handlers.through)
+@receiver(post_save, sender=WebhookHandler)
+@receiver(post_delete, sender=WebhookHandler)
+@receiver(post_delete, sender=AsanaWebhook)
+# values of handlers event filters (target sections)
+@receiver(post_save, sender=CreativeProjectSection)
+@receiver(post_delete, sender=CreativeProjectSection)
+@receiver(config_updated)
+def clear_webhook_routing_cache(sender: type[Model] | None, **kwargs: Any) -> None:  # noqa: ANN401
+    _ = sender, kwargs
+    get_shared_routing_cache().clear()
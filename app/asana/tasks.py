@@ -2,17 +2,24 @@ from dataclasses import asdict
 from typing import Any
 
 from celery import Task, shared_task
+from common.webhook_queue import WebhookQueue
 from django.conf import settings
 
 from asana.webhook_actions import WebhookDispatcher
 
-from .client import AsanaApiClient
+from .client import AsanaApiClient, AsyncAsanaApiClient
+from .identity_cache import get_shared_user_identity_cache
 from .models import AsanaWebhookRequestData
 from .repository import AsanaUserRepository
 from .use_cases import FetchNewAsanaUsers
 
 asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
-asana_user_repository = AsanaUserRepository(api_client=asana_api_client)
+async_asana_api_client = AsyncAsanaApiClient(api_key=settings.ASANA_API_KEY)
+asana_user_repository = AsanaUserRepository(
+    api_client=asana_api_client,
+    async_api_client=async_asana_api_client,
+    identity_cache=get_shared_user_identity_cache(),
+)
 
 
 @shared_task(bind=True, max_retries=1, default_retry_delay=60 * 3)
@@ -30,6 +37,14 @@ def process_asana_webhook_task(
         return None
 
 
+webhook_queue = WebhookQueue(
+    name="asana",
+    model=AsanaWebhookRequestData,
+    owner_field="webhook",
+    process_task_name=process_asana_webhook_task.name,  # type: ignore[attr-defined]
+)
+
+
 @shared_task
 def fetch_new_asana_users() -> dict[str, Any]:
     use_case = FetchNewAsanaUsers(asana_users_repository=asana_user_repository)
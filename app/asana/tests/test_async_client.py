@@ -0,0 +1,76 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any
+
+import httpx
+import pytest
+
+from asana.client import AsyncAsanaApiClient
+from asana.client.exception import AsanaNotFoundError
+
+# asyncio event loop needs local socketpair
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+MAX_CONCURRENCY = 2
+
+
+def run_with_handler(
+    handler: Callable[[httpx.Request], Coroutine[Any, Any, httpx.Response]],
+    call: Callable[[AsyncAsanaApiClient], Awaitable[Any]],
+) -> Any:  # noqa: ANN401
+    client = AsyncAsanaApiClient(
+        api_key="key",
+        max_concurrency=MAX_CONCURRENCY,
+        transport=httpx.MockTransport(handler),
+    )
+
+    async def main() -> Any:  # noqa: ANN401
+        async with client:
+            return await call(client)
+
+    return asyncio.run(main())
+
+
+def test_pagination() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer key"
+        if request.url.params.get("offset") == "page2":
+            return httpx.Response(200, json={"data": [{"gid": "2"}], "next_page": None})
+        return httpx.Response(200, json={"data": [{"gid": "1"}], "next_page": {"offset": "page2"}})
+
+    tasks = run_with_handler(handler, lambda client: client.get_section_tasks(section_id="1"))
+    assert [task["gid"] for task in tasks] == ["1", "2"]
+
+
+def test_concurrency_bounded() -> None:
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"data": {"gid": request.url.path.rsplit("/", 1)[-1]}})
+
+    async def call(client: AsyncAsanaApiClient) -> list[dict[str, Any]]:
+        return await asyncio.gather(*(client.get_user(user_id=user_id) for user_id in range(6)))
+
+    users = run_with_handler(handler, call)
+    assert [user["gid"] for user in users] == [str(user_id) for user_id in range(6)]
+    assert max_in_flight == MAX_CONCURRENCY
+
+
+def test_not_found_error() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(404, json={"errors": [{"message": "Not found"}]})
+
+    with pytest.raises(AsanaNotFoundError):
+        run_with_handler(handler, lambda client: client.get_task(task_id="1"))
+
+
+def test_request_outside_context() -> None:
+    client = AsyncAsanaApiClient(api_key="key")
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.get_user(user_id=1))
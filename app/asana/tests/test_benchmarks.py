@@ -0,0 +1,28 @@
+import pytest
+from django.conf import LazySettings
+
+from asana.benchmarks.runner import run_benchmarks
+from asana.benchmarks.scenarios import SCENARIOS
+from asana.benchmarks.server import ServerConfig
+
+# fake asana server listens on localhost
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+SCALE = 4
+
+
+@pytest.mark.django_db
+def test_run_benchmarks(settings: LazySettings, tmp_path: str) -> None:
+    settings.MEDIA_ROOT = tmp_path
+    report = run_benchmarks(scenarios=list(SCENARIOS), scales=[SCALE], server_config=ServerConfig(page_size=3))
+    results = {result.scenario: result for result in report.results}
+    assert set(results) == set(SCENARIOS)
+    assert all(result.requests_count > 0 and result.peak_memory for result in results.values())
+    # memberships on 2 pages, one user request per member
+    assert results["users_update_all"].requests_by_endpoint["GET workspaces/{id}/workspace_memberships"] == 2
+    assert results["users_update_all"].requests_by_endpoint["GET users/{id}"] == SCALE
+    assert results["users_update_all"].result == {"created_count": SCALE // 2, "deleted_count": 0}
+    assert results["project_comments_generate"].result == {"comments_count": SCALE * 2}
+    assert results["fetch_missing_tasks"].result == {"new_found": SCALE, "with_errors": 0}
+    assert results["create_creatives"].result == {"created_count": SCALE}
+    assert results["comment_data_collect"].result["comments_count"] == SCALE
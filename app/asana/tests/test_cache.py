@@ -0,0 +1,87 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from asana.client import AsanaApiClient, ResponseCache
+from asana.client.cache import make_params_key
+
+
+def make_response(data: dict) -> Mock:  # type: ignore[type-arg]
+    response = Mock(spec=requests.Response)
+    response.json.return_value = {"data": data}
+    return response
+
+
+class TestResponseCache:
+    def test_params_stored_separately(self) -> None:
+        cache = ResponseCache()
+        cache.set(resource="project", gid=1, params_key=make_params_key({"opt_fields": ["name"]}), data={"name": "a"})
+        assert cache.get(resource="project", gid="1", params_key=make_params_key({"opt_fields": ["name"]})) == {
+            "name": "a",
+        }
+        assert cache.get(resource="project", gid=1, params_key=make_params_key(None)) is None
+
+    def test_returns_copy(self) -> None:
+        cache = ResponseCache()
+        cache.set(resource="project", gid=1, params_key="{}", data={"name": "a", "members": ["1"]})
+        data = cache.get(resource="project", gid=1, params_key="{}")
+        assert data is not None
+        data["name"] = "b"
+        data["members"].append("2")
+        assert cache.get(resource="project", gid=1, params_key="{}") == {"name": "a", "members": ["1"]}
+
+    def test_not_cacheable_resource(self) -> None:
+        cache = ResponseCache()
+        cache.set(resource="task", gid=1, params_key="{}", data={"gid": "1"})
+        assert cache.get(resource="task", gid=1, params_key="{}") is None
+
+    def test_ttl(self) -> None:
+        timer = Mock(return_value=100)
+        cache = ResponseCache(ttls={"project": 10}, timer=timer)
+        cache.set(resource="project", gid=1, params_key="{}", data={"gid": "1"})
+        timer.return_value = 109
+        assert cache.get(resource="project", gid=1, params_key="{}") == {"gid": "1"}
+        timer.return_value = 111
+        assert cache.get(resource="project", gid=1, params_key="{}") is None
+
+    @pytest.mark.parametrize(
+        ("event", "resource", "gid"),
+        [
+            ({"resource": {"gid": "1", "resource_type": "project"}}, "project", "1"),
+            ({"resource": {"gid": "1", "resource_type": "project"}}, "project_sections", "1"),
+            ({"resource": {"gid": "2", "resource_type": "section"}}, "section", "2"),
+            (
+                {
+                    "resource": {"gid": "2", "resource_type": "section"},
+                    "parent": {"gid": "1", "resource_type": "project"},
+                },
+                "project_sections",
+                "1",
+            ),
+            ({"resource": {"gid": "3", "resource_type": "user"}}, "user", "3"),
+        ],
+    )
+    def test_invalidate_by_events(self, event: dict, resource: str, gid: str) -> None:  # type: ignore[type-arg]
+        cache = ResponseCache()
+        cache.set(resource=resource, gid=gid, params_key="{}", data={"gid": gid})
+        cache.invalidate_by_events(events=[event])
+        assert cache.get(resource=resource, gid=gid, params_key="{}") is None
+
+
+def test_client_use_cache() -> None:
+    client = AsanaApiClient(api_key="key", cache=ResponseCache())
+    with patch.object(client, "_request", return_value=make_response({"name": "project"})) as mock_request:
+        first = client.get_project(project_id=1, opt_fields=["name"])
+        second = client.get_project(project_id=1, opt_fields=["name"])
+        client.get_project(project_id=1, opt_fields=["permalink_url"])
+    assert first == second == {"name": "project"}
+    assert mock_request.call_count == 2
+
+
+def test_client_without_cache() -> None:
+    client = AsanaApiClient(api_key="key")
+    with patch.object(client, "_request", return_value=make_response({"gid": "1"})) as mock_request:
+        client.get_user(user_id=1)
+        client.get_user(user_id=1)
+    assert mock_request.call_count == 2
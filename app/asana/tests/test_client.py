@@ -0,0 +1,131 @@
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from asana.client import AsanaApiClient, BatchAction, BatchActionResult, Projection, TaskProjection
+from asana.client.exception import AsanaApiClientError, AsanaNotFoundError
+from asana.client.utils import prepare_params
+
+
+class TestPagination:
+    @staticmethod
+    def _response(data: list[dict[str, Any]], offset: str | None) -> Mock:
+        response = Mock(spec=requests.Response)
+        response.json.return_value = {
+            "data": data,
+            "next_page": {"offset": offset} if offset else None,
+        }
+        return response
+
+    def test_follow_offsets_lazily(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        pages = [
+            self._response(data=[{"gid": "1"}, {"gid": "2"}], offset="page2"),
+            self._response(data=[{"gid": "3"}], offset=None),
+        ]
+        with patch.object(client, "_request", side_effect=pages) as mock_request:
+            tasks = client.iter_section_tasks(section_id="10")
+            assert mock_request.call_count == 0
+            assert next(tasks) == {"gid": "1"}
+            assert mock_request.call_count == 1
+            assert [task["gid"] for task in tasks] == ["2", "3"]
+        assert mock_request.call_count == 2
+        second_call_params = mock_request.call_args_list[1].kwargs["params"]
+        assert second_call_params["offset"] == "page2"
+        assert second_call_params["limit"] == AsanaApiClient.PAGE_LIMIT
+
+    def test_list_method_return_all_pages(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        pages = [
+            self._response(data=[{"gid": "1"}], offset="page2"),
+            self._response(data=[{"gid": "2"}], offset=None),
+        ]
+        with patch.object(client, "_request", side_effect=pages):
+            memberships = client.get_workspace_memberships_for_workspace(workspace_id="1")
+        assert [membership["gid"] for membership in memberships] == ["1", "2"]
+
+    def test_error_raised_on_iteration(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        with patch.object(client, "_request", side_effect=requests.ConnectionError("boom")):
+            tasks = client.iter_section_tasks(section_id="10")
+            with pytest.raises(AsanaApiClientError):
+                list(tasks)
+
+
+class TestBatch:
+    @staticmethod
+    def _batch_response(status_codes: list[int]) -> Mock:
+        response = Mock(spec=requests.Response)
+        response.json.return_value = {
+            "data": [
+                {"status_code": status_code, "body": {"data": {"gid": str(i)}}}
+                for i, status_code in enumerate(status_codes)
+            ],
+        }
+        return response
+
+    def test_actions_chunked_by_ten(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        actions = [BatchAction.get(f"/tasks/{i}", opt_fields=["name"]) for i in range(12)]
+        responses = [self._batch_response([200] * 10), self._batch_response([200] * 2)]
+        with patch.object(client, "_request", side_effect=responses) as mock_request:
+            results = client.batch(actions)
+        assert mock_request.call_count == 2
+        first_actions = mock_request.call_args_list[0].kwargs["json"]["data"]["actions"]
+        assert len(first_actions) == 10
+        assert first_actions[0] == {"relative_path": "/tasks/0", "method": "get", "options": {"fields": ["name"]}}
+        assert len(results) == 12
+        assert results[11].action == actions[11]
+
+    def test_action_errors(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        actions = [BatchAction.get("/tasks/1"), BatchAction.get("/tasks/2"), BatchAction.get("/tasks/3")]
+        with patch.object(client, "_request", return_value=self._batch_response([200, 404, 500])):
+            ok, not_found, failed = client.batch(actions)
+        assert ok.error is None
+        assert ok.get_data() == {"gid": "0"}
+        assert isinstance(not_found.error, AsanaNotFoundError)
+        with pytest.raises(AsanaNotFoundError):
+            not_found.get_data()
+        assert type(failed.error) is AsanaApiClientError
+
+
+class TestProjection:
+    def test_get_task_request_projection_fields(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        response = Mock(spec=requests.Response, status_code=200)
+        response.json.return_value = {"data": {"gid": "1", "name": "task", "permalink_url": "url"}}
+        with patch.object(client.session, "request", return_value=response) as mock_request:
+            task_data = client.get_task(task_id="1", projection=TaskProjection.COMMENT)
+        assert mock_request.call_args.kwargs["params"] == {"opt_fields": "name,permalink_url"}
+        assert task_data["name"] == "task"
+
+    def test_warn_on_field_outside_projection(self) -> None:
+        projection = Projection(name="test_projection", fields=("name", "custom_fields.name"))
+        task_data = projection.wrap({"gid": "1", "name": "task", "custom_fields": [], "notes": ""})
+        with patch("asana.client.projections.logger") as mock_logger:
+            _ = task_data["name"], task_data["gid"], task_data.get("custom_fields")
+            mock_logger.warning.assert_not_called()
+            _ = task_data.get("notes"), task_data["notes"]
+        mock_logger.warning.assert_called_once()
+
+    def test_batch_action_projection(self) -> None:
+        action = BatchAction.get("/tasks/1", projection=TaskProjection.COMMENT)
+        assert action.to_api()["options"] == {"fields": ["name", "permalink_url"]}
+        result = BatchActionResult(action=action, status_code=200, body={"data": {"gid": "1", "name": "task"}})
+        assert result.get_data().projection == TaskProjection.COMMENT
+
+
+@pytest.mark.parametrize(
+    ("params", "expected"),
+    [
+        (None, None),
+        ({"opt_fields": []}, {}),
+        ({"opt_fields": ["name", "completed"], "limit": 10}, {"opt_fields": "name,completed", "limit": 10}),
+        ({"workspace": 1}, {"workspace": 1}),
+    ],
+)
+def test_prepare_params(params: dict[str, Any] | None, expected: dict[str, Any] | None) -> None:
+    assert prepare_params(params) == expected
@@ -0,0 +1,17 @@
+from asana.client import AsanaApiClient
+from asana.client.session import SessionConfig
+
+
+def test_clients_share_session() -> None:
+    first = AsanaApiClient(api_key="first")
+    second = AsanaApiClient(api_key="second")
+    assert first.session is second.session
+
+
+def test_session_per_config() -> None:
+    default = AsanaApiClient(api_key="key")
+    custom = AsanaApiClient(api_key="key", session_config=SessionConfig(pool_maxsize=20))
+    assert default.session is not custom.session
+    adapter = custom.session.get_adapter("https://app.asana.com/")
+    assert adapter._pool_maxsize == 20  # type: ignore[attr-defined]
+    assert adapter.max_retries.total == 3  # type: ignore[attr-defined]
@@ -0,0 +1,75 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from asana.client import AsanaApiClient
+from asana.client.exception import AsanaSyncTokenExpiredError
+from asana.constants import AsanaResourceType
+from asana.models import AsanaEventSyncToken
+from asana.services import AsanaEventsSyncService
+
+OLD_SYNC = "old"
+NEW_SYNC = "new"
+
+
+def make_response(status_code: int, payload: dict) -> Mock:  # type: ignore[type-arg]
+    response = Mock(spec=requests.Response, status_code=status_code, text=str(payload))
+    response.json.return_value = payload
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+class TestGetEvents:
+    def test_follow_has_more(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        responses = [
+            make_response(200, {"data": [{"action": "added"}], "sync": "token1", "has_more": True}),
+            make_response(200, {"data": [{"action": "changed"}], "sync": "token2", "has_more": False}),
+        ]
+        with patch.object(client.session, "request", side_effect=responses) as mock_request:
+            events, new_sync = client.get_events(resource_id="1", sync_token=OLD_SYNC)
+        assert events == [{"action": "added"}, {"action": "changed"}]
+        assert new_sync == "token2"
+        assert [call.kwargs["params"]["sync"] for call in mock_request.call_args_list] == [OLD_SYNC, "token1"]
+
+    def test_expired_token(self) -> None:
+        client = AsanaApiClient(api_key="key")
+        response = make_response(412, {"errors": [{"message": "Sync token invalid"}], "sync": NEW_SYNC})
+        with (
+            patch.object(client.session, "request", return_value=response),
+            pytest.raises(AsanaSyncTokenExpiredError) as error_info,
+        ):
+            client.get_events(resource_id="1", sync_token=OLD_SYNC)
+        assert error_info.value.sync_token == NEW_SYNC
+
+
+@pytest.mark.django_db
+class TestAsanaEventsSyncService:
+    def test_first_sync_requires_full_rescan(self) -> None:
+        api_client = Mock(spec=AsanaApiClient)
+        api_client.get_events.side_effect = AsanaSyncTokenExpiredError("expired", sync_token=NEW_SYNC)
+        service = AsanaEventsSyncService(asana_api_client=api_client)
+        delta = service.fetch(resource_id="1", resource_type=AsanaResourceType.PROJECT)
+        assert delta.is_full_rescan_required
+        api_client.get_events.assert_called_once_with(resource_id="1", sync_token=None)
+        assert not AsanaEventSyncToken.objects.exists()
+        service.commit(delta=delta)
+        assert AsanaEventSyncToken.objects.get(resource_id="1").sync_token == NEW_SYNC
+
+    def test_incremental_sync(self) -> None:
+        AsanaEventSyncToken.objects.create(
+            resource_id="1",
+            resource_type=AsanaResourceType.SECTION,
+            sync_token=OLD_SYNC,
+        )
+        api_client = Mock(spec=AsanaApiClient)
+        api_client.get_events.return_value = ([{"action": "added"}], NEW_SYNC)
+        service = AsanaEventsSyncService(asana_api_client=api_client)
+        delta = service.fetch(resource_id="1", resource_type=AsanaResourceType.SECTION)
+        assert not delta.is_full_rescan_required
+        assert delta.events == [{"action": "added"}]
+        api_client.get_events.assert_called_once_with(resource_id="1", sync_token=OLD_SYNC)
+        service.commit(delta=delta)
+        assert AsanaEventSyncToken.objects.get(resource_id="1").sync_token == NEW_SYNC
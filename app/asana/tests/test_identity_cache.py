@@ -0,0 +1,103 @@
+from unittest.mock import Mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from asana.client import AsanaApiClient, BatchAction, BatchActionResult
+from asana.client.exception import AsanaNotFoundError
+from asana.identity_cache import AsanaUserIdentityCache, MissingUser, get_shared_user_identity_cache
+from asana.models import AtlasAsanaUser
+from asana.repository import AsanaUserRepository
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user(membership_id: str = "m1", user_id: str = "1") -> AtlasAsanaUser:
+    return AtlasAsanaUser(membership_id=membership_id, user_id=user_id, name="User")
+
+
+class TestAsanaUserIdentityCache:
+    def test_user_cached_by_both_keys(self) -> None:
+        cache = AsanaUserIdentityCache(redis_cache_alias=None)
+        user = make_user()
+        cache.set(user=user)
+        assert cache.get(field="membership_id", value="m1") is user
+        assert cache.get(field="user_id", value="1") is user
+        cache.invalidate(user=user)
+        assert cache.get(field="membership_id", value="m1") is None
+        assert cache.get(field="user_id", value="1") is None
+
+    def test_missing_expires_before_user(self) -> None:
+        timer = FakeTimer()
+        cache = AsanaUserIdentityCache(redis_cache_alias=None, timer=timer)
+        cache.set(user=make_user())
+        cache.set_missing(field="membership_id", values=["m2"])
+        assert cache.get(field="membership_id", value="m2") == MissingUser()
+        timer.now = AsanaUserIdentityCache.MISSING_TTL + 1
+        assert cache.get(field="membership_id", value="m2") is None
+        assert cache.get(field="membership_id", value="m1") is not None
+
+
+@pytest.mark.django_db
+class TestRepositoryWithIdentityCache:
+    def test_get_from_cache(self) -> None:
+        AtlasAsanaUser.objects.create(membership_id="m1", user_id="1", name="User")
+        repository = AsanaUserRepository(
+            api_client=Mock(spec=AsanaApiClient),
+            identity_cache=AsanaUserIdentityCache(redis_cache_alias=None),
+        )
+        user = repository.get(membership_id="m1")
+        with CaptureQueriesContext(connection) as context:
+            assert repository.get(membership_id="m1") is user
+            assert repository.get(user_id="1") is user
+        assert len(context.captured_queries) == 0
+
+    def test_get_not_found_cached(self) -> None:
+        api_client = Mock(spec=AsanaApiClient)
+        api_client.get_workspace_membership.side_effect = AsanaNotFoundError("not found")
+        repository = AsanaUserRepository(
+            api_client=api_client,
+            identity_cache=AsanaUserIdentityCache(redis_cache_alias=None),
+        )
+        for _ in range(2):
+            with pytest.raises(AsanaNotFoundError):
+                repository.get(membership_id="m1")
+        api_client.get_workspace_membership.assert_called_once()
+
+    def test_get_many_not_found_cached(self) -> None:
+        AtlasAsanaUser.objects.create(membership_id="m1", user_id="1", name="User")
+        api_client = Mock(spec=AsanaApiClient)
+        action = BatchAction.get("/workspace_memberships/m2")
+        api_client.batch.side_effect = [[BatchActionResult(action=action, status_code=404, body=None)], []]
+        repository = AsanaUserRepository(
+            api_client=api_client,
+            identity_cache=AsanaUserIdentityCache(redis_cache_alias=None),
+        )
+        first = repository.get_many(membership_ids=["m1", "m2"])
+
+        with CaptureQueriesContext(connection) as context:
+            second = repository.get_many(membership_ids=["m1", "m2"])
+
+        assert first == second
+        assert second.not_found_membership_ids == ["m2"]
+        assert len(context.captured_queries) == 0
+        assert api_client.batch.call_count == 2
+
+    def test_invalidated_on_save_and_delete(self) -> None:
+        cache = get_shared_user_identity_cache()
+        user = AtlasAsanaUser.objects.create(membership_id="m1", user_id="1", name="User")
+        cache.set(user=user)
+        user.name = "Renamed"
+        user.save()
+        assert cache.get(field="membership_id", value="m1") is None
+
+        cache.set(user=user)
+        user.delete()
+        assert cache.get(field="user_id", value="1") is None
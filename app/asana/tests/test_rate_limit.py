@@ -0,0 +1,75 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from asana.client import AsanaApiClient
+from asana.client.exception import AsanaRateLimitError
+from asana.client.rate_limit import TokenBucket, get_retry_after
+
+
+class TestTokenBucket:
+    def test_burst_then_wait(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        # every next caller waits own slot
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_pause(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.pause(seconds=5)
+        assert bucket.reserve() == pytest.approx(5.1, abs=0.01)
+
+    def test_cost(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=10)
+        assert bucket.reserve(cost=10) == 0
+        assert bucket.reserve(cost=5) == pytest.approx(0.5, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    ("headers", "attempt", "expected"),
+    [
+        ({"Retry-After": "30"}, 0, 30),
+        ({"Retry-After": "bad"}, 2, 4),
+        ({}, 0, 1),
+        ({}, 3, 8),
+    ],
+)
+def test_get_retry_after(headers: dict[str, str], attempt: int, expected: float) -> None:
+    assert get_retry_after(headers=headers, attempt=attempt) == expected
+
+
+class TestClientRateLimit:
+    @staticmethod
+    def _response(status_code: int, headers: dict[str, str] | None = None) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = b'{"data": {"gid": "1"}}'
+        return response
+
+    def test_retry_after_429(self) -> None:
+        rate_limiter = Mock()
+        rate_limiter.reserve.return_value = 0
+        client = AsanaApiClient(api_key="key", rate_limiter=rate_limiter)
+        responses = [self._response(429, {"Retry-After": "3"}), self._response(200)]
+        with patch.object(requests.Session, "request", side_effect=responses) as mock_request:
+            assert client.get_task(task_id="1") == {"gid": "1"}
+        assert mock_request.call_count == 2
+        rate_limiter.pause.assert_called_once_with(seconds=3.0)
+        assert rate_limiter.reserve.call_count == 2
+
+    def test_rate_limit_error_after_retries(self) -> None:
+        rate_limiter = Mock()
+        rate_limiter.reserve.return_value = 0
+        client = AsanaApiClient(api_key="key", rate_limiter=rate_limiter)
+        attempts = AsanaApiClient.MAX_RATE_LIMIT_RETRIES + 1
+        responses = [self._response(429, {"Retry-After": "3"}) for _ in range(attempts)]
+        with (
+            patch.object(requests.Session, "request", side_effect=responses),
+            pytest.raises(AsanaRateLimitError) as error,
+        ):
+            client.get_task(task_id="1")
+        assert error.value.retry_after == 3
@@ -0,0 +1,209 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+import requests
+from constance.test import override_config
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from message_sender.models import AtlasUser
+from PIL import Image
+from pytest_django.fixtures import SettingsWrapper
+
+from asana.client import AsanaApiClient
+from asana.models import AtlasAsanaUser
+from asana.repository import AsanaUserRepository, AvatarService
+
+
+def make_api_client(users: list[dict[str, Any]]) -> Mock:
+    api_client = Mock(spec=AsanaApiClient)
+    api_client.get_workspace_memberships_for_workspace.return_value = [
+        {"gid": f"m{user['gid']}", "user": {"gid": user["gid"], "name": user["name"]}} for user in users
+    ]
+    users_by_id = {user["gid"]: user for user in users}
+    api_client.get_user.side_effect = lambda user_id: users_by_id[user_id]
+    return api_client
+
+
+def make_user_data(gid: str, name: str, email: str = "") -> dict[str, Any]:
+    return {"gid": gid, "name": name, "email": email, "photo": None}
+
+
+def make_repository(users: list[dict[str, Any]]) -> AsanaUserRepository:
+    repository = AsanaUserRepository(api_client=make_api_client(users=users))
+    repository.avatar_service = Mock()
+    return repository
+
+
+@pytest.mark.django_db
+class TestUpdateAll:
+    def test_create_update_delete(self) -> None:
+        owner = AtlasUser.objects.create(name="Owner", email="a@example.com", role="buyer", telegram="t", username="u")
+        AtlasAsanaUser.objects.create(membership_id="m1", user_id="1", name="Old name", email="a@example.com")
+        AtlasAsanaUser.objects.create(membership_id="m2", user_id="2", name="Same")
+        AtlasAsanaUser.objects.create(membership_id="m9", user_id="9", name="Removed")
+        repository = make_repository(
+            users=[
+                make_user_data(gid="1", name="New name", email="a@example.com"),
+                make_user_data(gid="2", name="Same"),
+                make_user_data(gid="3", name="Created"),
+            ],
+        )
+
+        result = repository.update_all()
+
+        assert result.created_count == 1
+        assert result.deleted_count == 1
+        assert result.updated_count == 1
+        assert result.changed_fields == {"name": 1, "owner_id": 1, "position": 1}
+        updated = AtlasAsanaUser.objects.get(membership_id="m1")
+        assert updated.name == "New name"
+        assert updated.owner == owner
+        assert updated.position == "buyer"
+        created = AtlasAsanaUser.objects.get(membership_id="m3")
+        assert result.created_user_ids == [created.pk]
+        assert not AtlasAsanaUser.objects.filter(membership_id="m9").exists()
+
+    def test_queries_count_not_depends_on_users_count(self) -> None:
+        users_count = 30
+        AtlasAsanaUser.objects.bulk_create(
+            AtlasAsanaUser(membership_id=f"m{i}", user_id=str(i), name="Old") for i in range(0, users_count, 2)
+        )
+        repository = make_repository(users=[make_user_data(gid=str(i), name="New") for i in range(users_count)])
+
+        with CaptureQueriesContext(connection) as context:
+            result = repository.update_all()
+
+        # savepoint, delete, select users, select owners, insert, update, release savepoint
+        assert len(context.captured_queries) <= 8
+        assert result.created_count == users_count // 2
+        assert result.updated_count == users_count // 2
+        assert result.changed_fields == {"name": users_count // 2}
+        assert AtlasAsanaUser.objects.filter(name="New").count() == users_count
+
+    def test_nothing_changed(self) -> None:
+        AtlasAsanaUser.objects.create(membership_id="m1", user_id="1", name="Same")
+        repository = make_repository(users=[make_user_data(gid="1", name="Same")])
+
+        result = repository.update_all()
+
+        assert result.updated_count == 0
+        assert result.changed_fields == {}
+
+
+def make_png(size: int = 4) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", (size, size), color="red").save(output, format="PNG")
+    return output.getvalue()
+
+
+def make_avatar_response(status_code: int = 200, content: bytes = b"", etag: str = "") -> Mock:
+    return Mock(spec=requests.Response, status_code=status_code, content=content, headers={"ETag": etag})
+
+
+AVATAR_URL = "https://s3.example.com/profile_photos/1/128.png"
+
+
+@pytest.mark.django_db
+class TestAvatarService:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings: SettingsWrapper, tmp_path: Path) -> None:
+        settings.MEDIA_ROOT = tmp_path
+
+    def make_user(self, user_id: str = "1", avatar_url: str = AVATAR_URL) -> AtlasAsanaUser:
+        return AtlasAsanaUser.objects.create(membership_id=f"m{user_id}", user_id=user_id, avatar_url=avatar_url)
+
+    def test_load_and_skip_same_content(self) -> None:
+        session = Mock(spec=requests.Session)
+        session.get.return_value = make_avatar_response(content=make_png(), etag='"v1"')
+        service = AvatarService(session=session)
+        user = self.make_user()
+
+        result = service.sync(users=[user])
+
+        assert result.loaded_count == 1
+        user.refresh_from_db()
+        assert user.avatar.name == "asana/avatars/1.png"
+        assert user.loaded_avatar_url == AVATAR_URL
+        assert user.avatar_etag == '"v1"'
+        avatar_name = user.avatar.name
+
+        # same bytes by new url: url and validators updated, file not rewritten
+        user.avatar_url = AVATAR_URL.replace("/1/", "/2/")
+        result = service.sync(users=[user])
+
+        assert result.not_modified_count == 1
+        user.refresh_from_db()
+        assert user.avatar.name == avatar_name
+        assert user.loaded_avatar_url == AVATAR_URL.replace("/1/", "/2/")
+
+    def test_revalidate_sends_conditional_get(self) -> None:
+        session = Mock(spec=requests.Session)
+        session.get.return_value = make_avatar_response(content=make_png(), etag='"v1"')
+        service = AvatarService(session=session)
+        user = self.make_user()
+        service.sync(users=[user])
+        session.get.return_value = make_avatar_response(status_code=304)
+
+        not_revalidated = service.sync(users=[user])
+        result = service.sync(users=[user], revalidate=True)
+
+        assert not_revalidated.not_modified_count == 0
+        assert result.not_modified_count == 1
+        assert session.get.call_count == 2
+        assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        user.refresh_from_db()
+        assert user.avatar_etag == '"v1"'
+
+    def test_download_once_for_same_url(self) -> None:
+        session = Mock(spec=requests.Session)
+        session.get.return_value = make_avatar_response(content=make_png())
+        service = AvatarService(session=session)
+
+        result = service.sync(users=[self.make_user(user_id="1"), self.make_user(user_id="2")])
+
+        assert result.loaded_count == 2
+        session.get.assert_called_once()
+
+    def test_failed_download(self) -> None:
+        session = Mock(spec=requests.Session)
+        session.get.side_effect = requests.ConnectionError
+        service = AvatarService(session=session)
+        user = self.make_user()
+
+        result = service.sync(users=[user])
+
+        assert result.failed_count == 1
+        user.refresh_from_db()
+        assert not user.avatar
+        assert user.loaded_avatar_url == ""
+
+    def test_delete(self) -> None:
+        service = AvatarService(session=Mock(spec=requests.Session))
+        user = self.make_user(avatar_url="")
+        user.loaded_avatar_url = AVATAR_URL
+        user.avatar_sha256 = "sha"
+
+        result = service.sync(users=[user])
+
+        assert result.deleted_count == 1
+        user.refresh_from_db()
+        assert user.loaded_avatar_url == ""
+        assert user.avatar_sha256 == ""
+
+    def test_resize_to_webp(self) -> None:
+        session = Mock(spec=requests.Session)
+        session.get.return_value = make_avatar_response(content=make_png(size=64))
+        service = AvatarService(session=session)
+        user = self.make_user()
+
+        with override_config(ASANA_AVATAR_MAX_SIZE=32, ASANA_AVATAR_WEBP=True):
+            service.sync(users=[user])
+
+        user.refresh_from_db()
+        assert user.avatar.name == "asana/avatars/1.webp"
+        with Image.open(user.avatar.path) as image:
+            assert image.format == "WEBP"
+            assert image.size == (32, 32)
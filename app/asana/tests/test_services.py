@@ -0,0 +1,50 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from asana.constants import ATLAS_WORKSPACE_ID
+from asana.models import AtlasAsanaUser
+from asana.services import COMMENT_PRETTIFIER_LOCAL_TTL, AsanaCommentPrettifier, get_comment_prettifier
+from asana.utils import get_asana_profile_url_by_id
+
+
+def profile_url(membership_id: str) -> str:
+    return get_asana_profile_url_by_id(profile_id=membership_id, workspace_id=ATLAS_WORKSPACE_ID)
+
+
+class TestAsanaCommentPrettifier:
+    def test_prettify(self) -> None:
+        prettifier = AsanaCommentPrettifier(profile_urls_mention_map={profile_url("12"): "@Anna"})
+        text = f"{profile_url('12')} check {profile_url('123')} and https://example.com/a?b=1, {profile_url('12')}"
+        assert prettifier.prettify(comment_text=text) == "@Anna check [link] and [link] @Anna"
+
+
+@pytest.mark.django_db
+def test_get_comment_prettifier_rebuilt_after_users_change() -> None:
+    user = AtlasAsanaUser.objects.create(membership_id="12", user_id="1", name="Anna")
+    prettifier = get_comment_prettifier()
+    with CaptureQueriesContext(connection) as context:
+        assert get_comment_prettifier() is prettifier
+    assert len(context.captured_queries) == 0
+    assert prettifier.prettify(comment_text=profile_url("12")) == "@Anna"
+
+    user.name = "Maria"
+    user.save()
+
+    assert get_comment_prettifier().prettify(comment_text=profile_url("12")) == "@Maria"
+
+
+@pytest.mark.django_db
+def test_get_comment_prettifier_local_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    AtlasAsanaUser.objects.create(membership_id="12", user_id="1", name="Anna")
+    prettifier = get_comment_prettifier()
+    # users changed by other process, local generation not changed
+    AtlasAsanaUser.objects.filter(membership_id="12").update(name="Maria")
+    assert get_comment_prettifier() is prettifier
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + COMMENT_PRETTIFIER_LOCAL_TTL + 1)
+
+    assert get_comment_prettifier().prettify(comment_text=profile_url("12")) == "@Maria"
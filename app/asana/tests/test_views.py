@@ -1,4 +1,7 @@
-# ruff: noqa: S106, S105
+# ruff: noqa: S106, S105, S107
+import hashlib
+import hmac
+import json
 from http import HTTPStatus
 from unittest.mock import MagicMock, Mock
 
@@ -10,6 +13,10 @@ from asana.constants import AsanaResourceType
 from asana.models import AsanaWebhook, AsanaWebhookRequestData
 
 
+def sign(body: bytes, secret: str = "xxx") -> dict[str, str]:
+    return {"X-Hook-Signature": hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()}
+
+
 @pytest.fixture
 def mock_task_delay(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     mock = Mock()
@@ -63,7 +70,7 @@ class TestWebhookView:
             secret="xxx",
         )
         url = reverse("asana:webhook", kwargs={"webhook_name": "name"})
-        response = client.post(url)
+        response = client.post(url, content_type="application/json", headers=sign(body=b"{}"))
         assert response.status_code == HTTPStatus.OK
         assert response.headers["X-Hook-Secret"] == "xxx"
 
@@ -81,6 +88,7 @@ class TestWebhookView:
             url,
             data=data,
             content_type="application/json",
+            headers=sign(body=json.dumps(data).encode()),
         )
         assert response.status_code == HTTPStatus.OK
         assert AsanaWebhookRequestData.objects.count() == 1
@@ -102,9 +110,33 @@ class TestWebhookView:
             url,
             data=data,
             content_type="application/json",
+            headers=sign(body=json.dumps(data).encode()),
         )
         assert response.status_code == HTTPStatus.OK
         assert AsanaWebhookRequestData.objects.count() == 1
         webhook_data = AsanaWebhookRequestData.objects.last()
         assert webhook_data is not None
         mock_task_delay.assert_called_once_with(asana_webhook_data_id=webhook_data.pk)
+
+    def test_invalid_signature(self, mock_task_delay: MagicMock, client: Client) -> None:
+        AsanaWebhook.objects.create(
+            name="name",
+            resource_id="123",
+            resource_type=AsanaResourceType.PROJECT,
+            secret="xxx",
+        )
+        url = reverse("asana:webhook", kwargs={"webhook_name": "name"})
+        data = {"y": "y"}
+        for headers in ({}, sign(body=json.dumps(data).encode(), secret="other")):
+            response = client.post(url, data=data, content_type="application/json", headers=headers)
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert not AsanaWebhookRequestData.objects.exists()
+        mock_task_delay.assert_not_called()
+
+    def test_secret_saved_by_handshake_used_for_signature(self, mock_task_delay: MagicMock, client: Client) -> None:
+        _ = mock_task_delay
+        AsanaWebhook.objects.create(name="name", resource_id="123", resource_type=AsanaResourceType.PROJECT)
+        url = reverse("asana:webhook", kwargs={"webhook_name": "name"})
+        client.post(url, headers={"X-Hook-Secret": "new"})
+        response = client.post(url, content_type="application/json", headers=sign(body=b"{}", secret="new"))
+        assert response.status_code == HTTPStatus.OK
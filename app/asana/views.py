@@ -1,48 +1,23 @@
-from django.shortcuts import get_object_or_404
-from rest_framework import status
-from rest_framework.request import Request
-from rest_framework.response import Response
-from rest_framework.views import APIView
+from typing import Any
+
+from common.webhook_queue import QueuedWebhook
+from common.webhook_receiver import AsanaWebhookReceiverView, WebhookOwner
 
 from .models import AsanaWebhook, AsanaWebhookRequestData
-from .tasks import process_asana_webhook_task
+from .tasks import process_asana_webhook_task, webhook_queue
 
 
-class AsanaWebhookView(APIView):
-    def post(self, request: Request, webhook_name: str, format: str | None = None) -> Response:
-        _ = format
-        webhook = get_object_or_404(AsanaWebhook, name=webhook_name)
-        header_secret = request.headers.get("X-Hook-Secret")
-        if header_secret and webhook.secret == "":
-            return self.create_webhook_response(webhook=webhook, secret=header_secret)
-        if webhook.secret == "":
-            data = {
-                "success": False,
-                "message": f"Webhook {webhook.name} has no secret key!",
-            }
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
-        asana_webhook_data = AsanaWebhookRequestData.objects.create(
-            headers=dict(request.headers),
-            payload=dict(request.data),
-            webhook=webhook,
-        )
-        process_asana_webhook_task.delay(asana_webhook_data_id=asana_webhook_data.pk)  # type: ignore[attr-defined]
-        data = {
-            "success": True,
-            "method": request.method,
-            "headers": request.headers,
-        }
-        response = Response(data=data)
-        response["X-Hook-Secret"] = webhook.secret
-        return response
+class AsanaWebhookView(AsanaWebhookReceiverView):
+    owner_model = AsanaWebhook
+    owner_url_kwarg = "webhook_name"
 
-    def create_webhook_response(self, webhook: AsanaWebhook, secret: str) -> Response:
-        webhook.secret = secret
-        webhook.save()
-        data = {
-            "status": True,
-            "message": f"webhook created for project {webhook.name}",
-        }
-        response = Response(data=data, status=status.HTTP_201_CREATED)
-        response["X-Hook-Secret"] = webhook.secret
-        return response
+    def handle_webhook(self, owner: WebhookOwner, headers: dict[str, str], payload: dict[str, Any]) -> None:
+        queued_webhook = QueuedWebhook(owner_id=owner.pk, headers=headers, payload=payload)
+        if not webhook_queue.push(webhook=queued_webhook):
+            # redis not available, request saved synchronously
+            asana_webhook_data = AsanaWebhookRequestData.objects.create(
+                headers=headers,
+                payload=payload,
+                webhook_id=owner.pk,
+            )
+            process_asana_webhook_task.delay(asana_webhook_data_id=asana_webhook_data.pk)  # type: ignore[attr-defined]
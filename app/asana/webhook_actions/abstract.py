@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Any, ClassVar
 
 from asana.models import AsanaWebhookRequestData
 
@@ -11,7 +12,39 @@ class WebhookActionResult:
     error: str | None = None
 
 
+@dataclass(frozen=True)
+class EventFilter:
+    """Asana event handler is interested in, None field matches any value."""
+
+    resource_type: str | None = None
+    action: str | None = None
+    parent_type: str | None = None
+    parent_gids: frozenset[str] | None = None
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        resource = event.get("resource") or {}
+        parent = event.get("parent") or {}
+        return (
+            (self.resource_type is None or resource.get("resource_type") == self.resource_type)
+            and (self.action is None or event.get("action") == self.action)
+            and (self.parent_type is None or parent.get("resource_type") == self.parent_type)
+            and (self.parent_gids is None or parent.get("gid") in self.parent_gids)
+        )
+
+
 class BaseWebhookAction(ABC):
+    # seconds, None - ASANA_WEBHOOK_HANDLER_TIMEOUT setting
+    timeout: ClassVar[float | None] = None
+
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...] | None:
+        """Return filters of events handler receives in payload, None - all events.
+
+        Called when dispatcher routing index compiled, result cached for routing TTL.
+        If filters declared and no event matches, handler not called.
+        """
+        return None
+
     @abstractmethod
     def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
         pass
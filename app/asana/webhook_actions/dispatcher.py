@@ -1,44 +1,187 @@
+import copy
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from dataclasses import asdict, dataclass, field
-from typing import TypeAlias
+from typing import Any
 
+from common.event_dedup import WebhookEventDeduplicator
 from common.exception import AppExceptionError
+from constance import config
+from django.db import connections
 
+from asana.client import get_shared_response_cache
 from asana.models import AsanaWebhookRequestData, ProcessingStatus
-from asana.webhook_actions.abstract import WebhookActionResult
-from asana.webhook_actions.registry import WEBHOOK_ACTION_REGISTRY, WebhookActionInfo
+from asana.webhook_actions.abstract import BaseWebhookAction, WebhookActionResult
+from asana.webhook_actions.registry import WEBHOOK_ACTION_REGISTRY
+from asana.webhook_actions.routing import HandlerName, WebhookRoutingCache, get_shared_routing_cache
 
-HandlerName: TypeAlias = str
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class WebhookDispatcherResult:
     handler_results: dict[HandlerName, WebhookActionResult] = field(default_factory=dict)
     errors: dict[HandlerName, str] = field(default_factory=dict)
+    duplicate_events_count: int = 0
+    # seconds, handler run time or its timeout
+    durations: dict[HandlerName, float] = field(default_factory=dict)
+
+
+@dataclass
+class HandlerRun:
+    result: WebhookActionResult | None = None
+    error: str | None = None
+    duration: float = 0.0
 
 
 class WebhookDispatcher:
+    """Run handlers of webhook, several handlers run in parallel threads.
+
+    Handler waited for its timeout (handler class timeout or ASANA_WEBHOOK_HANDLER_TIMEOUT) from
+    dispatch start, then marked as failed by timeout. Thread cant be stopped, timed out handler
+    finishes in background, but not blocks results of other handlers.
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(self, routing_cache: WebhookRoutingCache | None = None):
+        self.routing_cache = routing_cache if routing_cache is not None else get_shared_routing_cache()
+
+    def _handle(
+        self,
+        handler_class: type[BaseWebhookAction],
+        webhook_data: AsanaWebhookRequestData,
+        events: list[dict[str, Any]] | None,
+    ) -> WebhookActionResult:
+        if events is None:
+            return handler_class().handle(webhook_data=webhook_data)
+        if not events:
+            return WebhookActionResult(is_target_event=False, is_success=True)
+        # handler sees only its events, shared webhook data not changed
+        handler_webhook_data = copy.copy(webhook_data)
+        handler_webhook_data.payload = {**webhook_data.payload, "events": events}
+        return handler_class().handle(webhook_data=handler_webhook_data)
+
+    def _run_handler(
+        self,
+        name: HandlerName,
+        handler_class: type[BaseWebhookAction] | None,
+        webhook_data: AsanaWebhookRequestData,
+        events: list[dict[str, Any]] | None,
+        *,
+        is_thread: bool = False,
+    ) -> HandlerRun:
+        started = time.monotonic()
+        try:
+            if handler_class is None:
+                msg = f"Cant find webhook handler with name '{name}'"
+                raise AppExceptionError(msg)  # noqa: TRY301
+            handler_result = self._handle(handler_class=handler_class, webhook_data=webhook_data, events=events)
+            return HandlerRun(result=handler_result, duration=time.monotonic() - started)
+        # need for isolate handlers if it raises error
+        except Exception as exc:  # noqa: BLE001
+            return HandlerRun(error=str(exc), duration=time.monotonic() - started)
+        finally:
+            if is_thread:
+                # db connections of thread not closed by django request or celery signals
+                connections.close_all()
+
+    def _get_timeout(self, handler_class: type[BaseWebhookAction] | None) -> float:
+        if handler_class is not None and handler_class.timeout is not None:
+            return handler_class.timeout
+        return float(config.ASANA_WEBHOOK_HANDLER_TIMEOUT)
+
+    def _run_handlers(
+        self,
+        handler_names: tuple[HandlerName, ...],
+        handler_classes: dict[HandlerName, type[BaseWebhookAction]],
+        webhook_data: AsanaWebhookRequestData,
+        routed_events: dict[HandlerName, list[dict[str, Any]]],
+    ) -> dict[HandlerName, HandlerRun]:
+        if len(handler_names) == 1:
+            name = handler_names[0]
+            return {
+                name: self._run_handler(
+                    name=name,
+                    handler_class=handler_classes.get(name),
+                    webhook_data=webhook_data,
+                    events=routed_events.get(name),
+                ),
+            }
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(handler_names), self.MAX_WORKERS),
+            thread_name_prefix="webhook_handler",
+        )
+        futures: dict[HandlerName, Future[HandlerRun]] = {
+            name: executor.submit(
+                self._run_handler,
+                name=name,
+                handler_class=handler_classes.get(name),
+                webhook_data=webhook_data,
+                events=routed_events.get(name),
+                is_thread=True,
+            )
+            for name in handler_names
+        }
+        runs: dict[HandlerName, HandlerRun] = {}
+        try:
+            for name, future in futures.items():
+                timeout = self._get_timeout(handler_class=handler_classes.get(name))
+                try:
+                    runs[name] = future.result(timeout=max(started + timeout - time.monotonic(), 0))
+                except FuturesTimeoutError:
+                    logger.warning("Webhook handler %s timeout: %ss", name, timeout)
+                    future.cancel()
+                    runs[name] = HandlerRun(error=f"Timeout {timeout}s", duration=timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return runs
+
     def dispatch(self, webhook_data: AsanaWebhookRequestData) -> WebhookDispatcherResult:
         result = WebhookDispatcherResult()
-        webhook = webhook_data.webhook
-        handlers = webhook.handlers.all()
-        if len(handlers) == 0:
+        events = webhook_data.payload.get("events", [])
+        get_shared_response_cache().invalidate_by_events(events=events)
+        handler_names = self.routing_cache.get_handler_names(webhook_id=webhook_data.webhook_id)
+        if len(handler_names) == 0:
             webhook_data.status = ProcessingStatus.NO_HANDLERS
             webhook_data.save(update_fields=["status"])
             return result
-        for handler in handlers:
-            handler_info: WebhookActionInfo | None = WEBHOOK_ACTION_REGISTRY.get(handler.name)
-            try:
-                if not handler_info:
-                    msg = f"Cant find webhook handler with name '{handler.name}'"
-                    raise AppExceptionError(msg)
-                handler_class = handler_info.webhook_handler_class
-                handler_result: WebhookActionResult = handler_class().handle(webhook_data=webhook_data)
-                result.handler_results[handler.name] = handler_result
-            # need for isolate handlers if it raises error
-            except Exception as exc:  # noqa: BLE001
-                result.errors[handler.name] = str(exc)
+        deduplicator = WebhookEventDeduplicator(scope=f"asana:{webhook_data.webhook_id}")
+        claimed = deduplicator.claim(events=events)
+        result.duplicate_events_count = claimed.duplicates_count
+        if events and not claimed.events:
+            webhook_data.additional_data = asdict(result)
+            webhook_data.status = ProcessingStatus.DUPLICATE
+            webhook_data.save(update_fields=["additional_data", "status"])
+            return result
+        if claimed.duplicates_count:
+            # handlers see only new events, saved payload not changed
+            webhook_data.payload = {**webhook_data.payload, "events": claimed.events}
+        handler_classes = {
+            name: WEBHOOK_ACTION_REGISTRY[name].webhook_handler_class
+            for name in handler_names
+            if name in WEBHOOK_ACTION_REGISTRY
+        }
+        routed_events = self.routing_cache.get_index(handler_classes=handler_classes).route(events=claimed.events)
+        runs = self._run_handlers(
+            handler_names=handler_names,
+            handler_classes=handler_classes,
+            webhook_data=webhook_data,
+            routed_events=routed_events,
+        )
+        for name, run in runs.items():
+            result.durations[name] = round(run.duration, 3)
+            if run.result is not None:
+                result.handler_results[name] = run.result
+            else:
+                result.errors[name] = run.error or ""
         if not result.handler_results:
             status = ProcessingStatus.FAILED
+            # events processed again by redelivery
+            deduplicator.release(claimed=claimed)
         elif result.errors:
             status = ProcessingStatus.PARTIAL
         else:
@@ -1,10 +1,8 @@
-from typing import Any
-
 from creative_quality.models import CreativeProjectSection, Task
 
 from asana.models import AsanaWebhookRequestData
 
-from .abstract import BaseWebhookAction, WebhookActionResult
+from .abstract import BaseWebhookAction, EventFilter, WebhookActionResult
 from .registry import register_webhook_action
 
 
@@ -13,30 +11,30 @@ from .registry import register_webhook_action
     description="Карточка с креативом добавлен в колонку для оценки креатива",
 )
 class CreativeTaskForEstimation(BaseWebhookAction):
-    def get_target_sections_ids(self) -> set[str]:
-        return set(CreativeProjectSection.objects.values_list("section_id", flat=True))
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...]:
+        # task moved to section for estimation
+        return (
+            EventFilter(
+                resource_type="task",
+                action="added",
+                parent_type="section",
+                parent_gids=frozenset(CreativeProjectSection.objects.values_list("section_id", flat=True)),
+            ),
+        )
 
     def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
-        target_sections_ids = self.get_target_sections_ids()
-        event_data = webhook_data.payload
         is_created = False
-        for event in event_data["events"]:
-            if self._is_target_event(event_data=event):
-                section_id = event["parent"]["gid"]
-                if section_id in target_sections_ids:
-                    task_id = event["resource"]["gid"]
-                    _, created = Task.objects.get_or_create(
-                        task_id=task_id,
-                        defaults={"task_id": task_id},
-                    )
-                    if created:
-                        is_created = True
+        # filters of other processes cached up to routing cache TTL, section can be already removed
+        sections_ids = set(CreativeProjectSection.objects.values_list("section_id", flat=True))
+        for event in webhook_data.payload["events"]:
+            if event["parent"]["gid"] not in sections_ids:
+                continue
+            task_id = event["resource"]["gid"]
+            _, created = Task.objects.get_or_create(
+                task_id=task_id,
+                defaults={"task_id": task_id},
+            )
+            if created:
+                is_created = True
         return WebhookActionResult(is_success=True, is_target_event=is_created)
-
-    def _is_target_event(self, event_data: dict[str, Any]) -> bool:
-        # is task moved to section
-        return (
-            event_data.get("action") == "added"
-            and event_data.get("resource", {}).get("resource_type") == "task"
-            and event_data.get("parent", {}).get("resource_type") == "section"
-        )
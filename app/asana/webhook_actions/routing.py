@@ -0,0 +1,113 @@
+import threading
+from collections.abc import Iterable
+from itertools import product
+from typing import Any, TypeAlias
+
+from cachetools import TTLCache
+
+from asana.models import WebhookHandler
+
+from .abstract import BaseWebhookAction, EventFilter
+
+HandlerName: TypeAlias = str
+# resource type, action, parent type, None matches any value
+RouteKey: TypeAlias = tuple[str | None, str | None, str | None]
+IndexKey: TypeAlias = tuple[tuple[HandlerName, type[BaseWebhookAction]], ...]
+
+
+class EventRoutingIndex:
+    """Event filters of handlers compiled into dict by resource type, action and parent type.
+
+    Events bucketed by handlers in one pass: every event checked only against filters of its route keys.
+    """
+
+    def __init__(self, handler_classes: dict[HandlerName, type[BaseWebhookAction]]):
+        self._routes: dict[RouteKey, list[tuple[HandlerName, frozenset[str] | None]]] = {}
+        self.filtered_handlers: list[HandlerName] = []
+        for name, handler_class in handler_classes.items():
+            event_filters = handler_class.get_event_filters()
+            if event_filters is None:
+                continue
+            self.filtered_handlers.append(name)
+            for event_filter in event_filters:
+                self._add_route(name=name, event_filter=event_filter)
+
+    def _add_route(self, name: HandlerName, event_filter: EventFilter) -> None:
+        key = (event_filter.resource_type, event_filter.action, event_filter.parent_type)
+        self._routes.setdefault(key, []).append((name, event_filter.parent_gids))
+
+    def route(self, events: Iterable[dict[str, Any]]) -> dict[HandlerName, list[dict[str, Any]]]:
+        """Return matching events of handlers with filters, handlers without filters not in result."""
+        result: dict[HandlerName, list[dict[str, Any]]] = {name: [] for name in self.filtered_handlers}
+        if not self._routes:
+            return result
+        for event in events:
+            resource = event.get("resource") or {}
+            parent = event.get("parent") or {}
+            parent_gid = parent.get("gid")
+            matched: set[HandlerName] = set()
+            for key in product(
+                (resource.get("resource_type"), None),
+                (event.get("action"), None),
+                (parent.get("resource_type"), None),
+            ):
+                for name, parent_gids in self._routes.get(key, ()):
+                    if name not in matched and (parent_gids is None or parent_gid in parent_gids):
+                        matched.add(name)
+                        result[name].append(event)
+        return result
+
+
+class WebhookRoutingCache:
+    """Handler names of webhooks and compiled routing indexes for TTL seconds.
+
+    Cache of process cleared by signals on handlers and filters values change, other processes see changes after TTL.
+    TTL also limits age of filters values loaded from db or settings (target sections).
+    """
+
+    TTL = 60
+
+    def __init__(self, maxsize: int = 1024):
+        self._handler_names: TTLCache[int, tuple[HandlerName, ...]] = TTLCache(maxsize=maxsize, ttl=self.TTL)
+        self._indexes: TTLCache[IndexKey, EventRoutingIndex] = TTLCache(maxsize=maxsize, ttl=self.TTL)
+        self._lock = threading.Lock()
+
+    def get_handler_names(self, webhook_id: int) -> tuple[HandlerName, ...]:
+        with self._lock:
+            if webhook_id in self._handler_names:
+                return self._handler_names[webhook_id]
+        handler_names = tuple(
+            WebhookHandler.objects.filter(webhooks=webhook_id).order_by("pk").values_list("name", flat=True),
+        )
+        with self._lock:
+            self._handler_names[webhook_id] = handler_names
+        return handler_names
+
+    def get_index(self, handler_classes: dict[HandlerName, type[BaseWebhookAction]]) -> EventRoutingIndex:
+        # classes in key: registry can be changed (tests)
+        key = tuple(handler_classes.items())
+        with self._lock:
+            if key in self._indexes:
+                return self._indexes[key]
+        index = EventRoutingIndex(handler_classes=handler_classes)
+        with self._lock:
+            self._indexes[key] = index
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._handler_names.clear()
+            self._indexes.clear()
+
+
+_shared_routing_cache: WebhookRoutingCache | None = None
+_shared_routing_cache_lock = threading.Lock()
+
+
+def get_shared_routing_cache() -> WebhookRoutingCache:
+    global _shared_routing_cache  # noqa: PLW0603
+    if _shared_routing_cache is None:
+        with _shared_routing_cache_lock:
+            if _shared_routing_cache is None:
+                _shared_routing_cache = WebhookRoutingCache()
+    return _shared_routing_cache
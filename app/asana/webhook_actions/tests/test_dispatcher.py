@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from asana.constants import AsanaResourceType
@@ -155,3 +157,58 @@ class TestWebhookDispatcher:
         assert "xxx" in result.errors
         webhook_data.refresh_from_db()
         assert webhook_data.additional_data != {}
+
+
+class SlowHandler(FakeBaseWebhookHandler):
+    name = "slow_handler"
+    delay = 0.2
+
+    def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
+        time.sleep(self.delay)
+        return super().handle(webhook_data=webhook_data)
+
+
+class OtherSlowHandler(SlowHandler):
+    name = "other_slow_handler"
+
+
+class HangingHandler(SlowHandler):
+    name = "hanging_handler"
+    delay = 1
+    timeout = 0.1
+
+
+@pytest.mark.django_db
+class TestParallelHandlers:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for handler_class in (SlowHandler, OtherSlowHandler, HangingHandler):
+            info = WebhookActionInfo(name=handler_class.name, description="", webhook_handler_class=handler_class)
+            monkeypatch.setitem(WEBHOOK_ACTION_REGISTRY, handler_class.name, info)
+        self.webhook = AsanaWebhook.objects.create(
+            name="xxx",
+            resource_id="123",
+            resource_type=AsanaResourceType.PROJECT,
+        )
+
+    def dispatch(self, *handler_classes: type[SlowHandler]) -> WebhookDispatcherResult:
+        for handler_class in handler_classes:
+            self.webhook.handlers.add(WebhookHandler.objects.create(name=handler_class.name))
+        webhook_data = AsanaWebhookRequestData.objects.create(payload={}, headers={}, webhook=self.webhook)
+        return WebhookDispatcher().dispatch(webhook_data=webhook_data)
+
+    def test_handlers_run_in_parallel(self) -> None:
+        started = time.monotonic()
+        result = self.dispatch(SlowHandler, OtherSlowHandler)
+        assert time.monotonic() - started < SlowHandler.delay * 2
+        assert result.errors == {}
+        assert result.handler_results.keys() == {SlowHandler.name, OtherSlowHandler.name}
+        assert result.durations[SlowHandler.name] >= SlowHandler.delay
+
+    def test_timeout_not_blocks_other_handlers(self) -> None:
+        started = time.monotonic()
+        result = self.dispatch(SlowHandler, HangingHandler)
+        assert time.monotonic() - started < HangingHandler.delay
+        assert SlowHandler.name in result.handler_results
+        assert "Timeout" in result.errors[HangingHandler.name]
+        assert result.durations[HangingHandler.name] == HangingHandler.timeout
@@ -0,0 +1,143 @@
+from typing import Any, ClassVar
+
+import pytest
+from creative_quality.models import CreativeProjectSection
+
+from asana.constants import AsanaResourceType
+from asana.models import AsanaWebhook, AsanaWebhookRequestData, WebhookHandler
+from asana.webhook_actions.abstract import BaseWebhookAction, EventFilter, WebhookActionResult
+from asana.webhook_actions.dispatcher import WebhookDispatcher
+from asana.webhook_actions.main import CreativeTaskForEstimation
+from asana.webhook_actions.registry import WEBHOOK_ACTION_REGISTRY, WebhookActionInfo
+from asana.webhook_actions.routing import EventRoutingIndex, get_shared_routing_cache
+
+
+def make_event(gid: str, parent_type: str, parent_gid: str, action: str = "added") -> dict[str, Any]:
+    return {
+        "action": action,
+        "resource": {"gid": gid, "resource_type": "task"},
+        "parent": {"gid": parent_gid, "resource_type": parent_type},
+        "created_at": "2026-01-01T00:00:00.000Z",
+    }
+
+
+class SectionHandler(BaseWebhookAction):
+    received: ClassVar[list[list[str]]] = []
+
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...] | None:
+        return (
+            EventFilter(
+                resource_type=AsanaResourceType.TASK,
+                action="added",
+                parent_type=AsanaResourceType.SECTION,
+                parent_gids=frozenset({"s1"}),
+            ),
+        )
+
+    def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
+        self.received.append([event["resource"]["gid"] for event in webhook_data.payload["events"]])
+        return WebhookActionResult(is_target_event=True, is_success=True)
+
+
+class AnyProjectHandler(SectionHandler):
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...]:
+        return (EventFilter(parent_type=AsanaResourceType.PROJECT), EventFilter(resource_type="task"))
+
+
+class AllEventsHandler(SectionHandler):
+    @classmethod
+    def get_event_filters(cls) -> None:
+        return None
+
+
+def test_route() -> None:
+    index = EventRoutingIndex(
+        handler_classes={"section": SectionHandler, "project": AnyProjectHandler, "all": AllEventsHandler},
+    )
+    events = [
+        make_event(gid="1", parent_type="section", parent_gid="s1"),
+        make_event(gid="2", parent_type="section", parent_gid="s2"),
+        make_event(gid="3", parent_type="section", parent_gid="s1", action="removed"),
+        make_event(gid="4", parent_type="project", parent_gid="p1"),
+    ]
+
+    routed = index.route(events=events)
+
+    assert routed.keys() == {"section", "project"}
+    assert [event["resource"]["gid"] for event in routed["section"]] == ["1"]
+    # event matched by two filters of handler routed once
+    assert [event["resource"]["gid"] for event in routed["project"]] == ["1", "2", "3", "4"]
+    for event in events:
+        assert (event in routed["section"]) == SectionHandler.get_event_filters()[0].matches(event=event)  # type: ignore[index]
+
+
+@pytest.mark.django_db
+class TestDispatcherRouting:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for name, handler_class in (("section", SectionHandler), ("all", AllEventsHandler)):
+            info = WebhookActionInfo(name=name, description="", webhook_handler_class=handler_class)
+            monkeypatch.setitem(WEBHOOK_ACTION_REGISTRY, name, info)
+        monkeypatch.setattr(SectionHandler, "received", [])
+        self.webhook = AsanaWebhook.objects.create(
+            name="x",
+            resource_id="1",
+            resource_type=AsanaResourceType.PROJECT,
+        )
+        self.webhook.handlers.add(WebhookHandler.objects.create(name="section"))
+
+    def dispatch(self, *events: dict[str, Any]) -> AsanaWebhookRequestData:
+        webhook_data = AsanaWebhookRequestData.objects.create(
+            payload={"events": list(events)},
+            headers={},
+            webhook=self.webhook,
+        )
+        WebhookDispatcher().dispatch(webhook_data=webhook_data)
+        return webhook_data
+
+    def test_handler_receives_only_matching_events(self) -> None:
+        webhook_data = self.dispatch(
+            make_event(gid="1", parent_type="section", parent_gid="s1"),
+            make_event(gid="2", parent_type="section", parent_gid="s2"),
+        )
+
+        assert SectionHandler.received == [["1"]]
+        webhook_data.refresh_from_db()
+        assert len(webhook_data.payload["events"]) == 2
+
+    def test_handler_not_called_without_matching_events(self) -> None:
+        webhook_data = self.dispatch(make_event(gid="1", parent_type="section", parent_gid="s2"))
+
+        assert SectionHandler.received == []
+        webhook_data.refresh_from_db()
+        assert webhook_data.additional_data["handler_results"]["section"]["is_target_event"] is False
+
+    def test_handlers_cache_cleared_on_handlers_change(self) -> None:
+        routing_cache = get_shared_routing_cache()
+        assert routing_cache.get_handler_names(webhook_id=self.webhook.pk) == ("section",)
+
+        self.webhook.handlers.add(WebhookHandler.objects.create(name="all"))
+
+        assert routing_cache.get_handler_names(webhook_id=self.webhook.pk) == ("section", "all")
+        self.dispatch(make_event(gid="1", parent_type="project", parent_gid="p1"))
+        # received by all events handler (shares list with section handler), section handler not called
+        assert SectionHandler.received == [["1"]]
+
+
+@pytest.mark.django_db
+def test_routing_cache_cleared_on_target_sections_change() -> None:
+    routing_cache = get_shared_routing_cache()
+    handler_classes: dict[str, type[BaseWebhookAction]] = {"estimation": CreativeTaskForEstimation}
+    index = routing_cache.get_index(handler_classes=handler_classes)
+    assert routing_cache.get_index(handler_classes=handler_classes) is index
+
+    section = CreativeProjectSection.objects.create(section_id="s1")
+    routed_index = routing_cache.get_index(handler_classes=handler_classes)
+    assert routed_index is not index
+    event = make_event(gid="1", parent_type="section", parent_gid="s1")
+    assert routed_index.route(events=[event]) == {"estimation": [event]}
+
+    section.delete()
+    assert routing_cache.get_index(handler_classes=handler_classes) is not routed_index
@@ -27,6 +27,10 @@ ASANA_HOOK_SECRET = os.environ["ASANA_HOOK_SECRET"]
 DOMAIN_MESSAGE_API_KEY = os.environ["DOMAIN_MESSAGE_API_KEY"]
 MESSAGE_SENDER_HOST = os.environ["MESSAGE_SENDER_HOST"]
 ASANA_API_KEY = os.environ["ASANA_API_KEY"]
+# requests per minute of asana token, 1500 for paid workspaces
+ASANA_RATE_LIMIT_PER_MINUTE = int(os.environ.get("ASANA_RATE_LIMIT_PER_MINUTE", "1500"))
+# bearer token required by /metrics, endpoint closed if empty
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
 GOOGLE_CREDENTIALS_PATH = os.environ["GOOGLE_APPLICATION_CREDENTIALS"]
 VALENTINE_BOT_API_KEY = os.environ["VALENTINE_BOT_API_KEY"]
 
@@ -135,6 +139,26 @@ DATABASES = {
 
 
 REDIS_HOST = os.environ["REDIS_HOST"]
+# redis for state shared between workers: rate limits, caches
+REDIS_URL = f"redis://{REDIS_HOST}:6379/1"
+REDIS_ENABLED = os.environ.get("REDIS_ENABLED", "true").lower() == "true"
+REDIS_SOCKET_TIMEOUT = 1
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "redis": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "SOCKET_TIMEOUT": REDIS_SOCKET_TIMEOUT,
+            "SOCKET_CONNECT_TIMEOUT": REDIS_SOCKET_TIMEOUT,
+            # cache failure must not break request, works as cache miss
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+}
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 CELERY_BROKER_URL = f"redis://{REDIS_HOST}:6379/0"
 CELERY_RESULT_BACKEND = "django-db"
 CELERY_TASK_TRACK_STARTED = True
@@ -13,5 +13,6 @@ urlpatterns = [
     path("valentine-day/", include("valentine_day.urls")),
     path("fake-messages/", include("fake_message.urls")),
     path("message-sender/", include("message_sender.urls")),
+    path("", include("common.urls")),
     * static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]
@@ -3,6 +3,7 @@ import logging
 from asana.client import AsanaApiClient
 from asana.client.exception import AsanaApiClientError
 from asana.repository import AsanaUserRepository
+from common.admin import WebhookRequestAdminMixin
 from django import forms
 from django.conf import settings
 from django.contrib import admin, messages
@@ -18,14 +19,17 @@ from comment_notifier.use_cases import AsanaCommentNotifierUseCase
 from .forms import ProjectIgnoredSectionForm
 from .models import (
     AsanaComment,
+    AsanaCommentQuerySet,
     AsanaWebhookProject,
     AsanaWebhookRequestData,
+    CommentState,
     ProjectIgnoredSection,
     ProjectNotifySender,
 )
 from .services import LoadAdditionalInfoForProjectIgnoredSection, LoadAdditionalInfoForWebhookProject
 from .tasks import fetch_comment_tasks_urls_task, fetch_missing_project_comments_task
 
+# admin actions refresh data manually, so responses are not cached
 asana_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
 logging.basicConfig(level=logging.INFO)
 
@@ -125,9 +129,11 @@ class ProjectIgnoredSectionAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
 
 
 @admin.register(AsanaWebhookRequestData)
-class AsanaWebhookRequestDataAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+class AsanaWebhookRequestDataAdmin(WebhookRequestAdminMixin, admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = ("id", "__str__", "is_target_event", "project__name", "created")
     list_display_links = ("id", "__str__")
+    list_select_related = ("project",)
+    readonly_fields = ("archived_request_data",)
     list_filter = (
         "is_target_event",
         "project__name",
@@ -145,10 +151,11 @@ class AsanaCommentAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         "is_notified",
         "task_url_short",
         "is_deleted",
+        "state",
         "short_text",
         "created",
     )
-    list_filter = ("has_mention", "is_notified", "is_deleted", "project")
+    list_filter = ("state", "has_mention", "is_notified", "is_deleted", "project")
     ordering = ("-created",)
     search_fields = ("user_id", "task_id", "comment_id")
     actions = (
@@ -178,8 +185,8 @@ class AsanaCommentAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         self.message_user(request, message=f"Задача запущена: {result.id}")
 
     @admin.action(description="Пометить комментарии как отправленные")
-    def mark_comments_as_sent(self, request: HttpRequest, queryset: QuerySet[AsanaComment]) -> None:
-        queryset.update(is_notified=False)
+    def mark_comments_as_sent(self, request: HttpRequest, queryset: AsanaCommentQuerySet) -> None:
+        queryset.update_with_state(is_notified=False)
         self.message_user(request, message=f"{queryset.count()} помечены как отправленные")
 
     @admin.action(description="Найти пропущенные комментарии без отправки смс (глобальный)")
@@ -189,13 +196,21 @@ class AsanaCommentAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
         self.message_user(request, message=f"Задача запущена: {result.id}")
 
     @admin.action(description="Пометить как не отправленные")
-    def mark_as_not_notified(self, request: HttpRequest, queryset: QuerySet[AsanaComment]) -> None:
-        queryset.update(has_mention=None, is_notified=None)
+    def mark_as_not_notified(self, request: HttpRequest, queryset: AsanaCommentQuerySet) -> None:
+        queryset.update_with_state(has_mention=None, is_notified=None)
         self.message_user(request, message=f"{queryset.count()} комментариев помечены как не отправление")
 
     @admin.action(description="Пометить как необработанный")
     def mark_as_not_processed(self, request: HttpRequest, queryset: QuerySet[AsanaComment]) -> None:
-        queryset.update(has_mention=None, is_notified=None, is_deleted=False, task_url="", text="", send_result={})
+        queryset.update(
+            has_mention=None,
+            is_notified=None,
+            is_deleted=False,
+            task_url="",
+            text="",
+            send_result={},
+            state=CommentState.PENDING,
+        )
         self.message_user(request, message=f"{queryset.count()} комментариев помечены как необработанные")
 
     @admin.action(description="Обработать комментарий и оповестить")
@@ -235,7 +250,7 @@ class AsanaCommentAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
 
 @admin.register(ProjectNotifySender)
 class ProjectNotifySenderAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
-    list_display = ("name", "description")
+    list_display = ("name", "description", "coalesce_window")
     list_display_links = ("name",)
     readonly_fields = ("name", "description")
 
@@ -1,11 +1,14 @@
 import logging
+from collections.abc import Iterable, Sequence
+from typing import Any
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, BatchAction, StoryProjection, TaskProjection
 from asana.client.exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError
 from asana.constants import ATLAS_WORKSPACE_ID
+from asana.identity_cache import AsanaUserIdentityCache
 from asana.models import AtlasAsanaUser
 from asana.repository import AsanaUserRepository
-from asana.services import AsanaCommentPrettifier, get_user_profile_url_mention_map
+from asana.services import get_comment_prettifier
 from asana.utils import get_asana_profile_url_by_id
 
 from comment_notifier.models import AsanaComment
@@ -14,34 +17,61 @@ from comment_notifier.utils import extract_user_profile_id_from_text
 from .dto import CommentDto
 from .exceptions import CommentDeletedError
 
+logger = logging.getLogger(__name__)
+
 
 class CommentDataCollector:
-    def __init__(self, asana_api_client: AsanaApiClient):
+    def __init__(self, asana_api_client: AsanaApiClient, identity_cache: AsanaUserIdentityCache | None = None):
         self.asana_api_client = asana_api_client
-        self.asana_users_repository = AsanaUserRepository(api_client=self.asana_api_client)
+        self.asana_users_repository = AsanaUserRepository(
+            api_client=self.asana_api_client,
+            identity_cache=identity_cache,
+        )
 
-    def collect(self, comment_model: AsanaComment) -> CommentDto:
+    def _fetch_task_and_comment(self, comment_model: AsanaComment) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Fetch task and comment in one batch request.
+
+        Raises:
+             CommentDeletedError: if task or comment not available
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        task_result, comment_result = self.asana_api_client.batch(
+            [
+                BatchAction.get(f"/tasks/{comment_model.task_id}", projection=TaskProjection.COMMENT),
+                BatchAction.get(f"/stories/{comment_model.comment_id}", projection=StoryProjection.COMMENT),
+            ],
+        )
         try:
-            task_data = self.asana_api_client.get_task(task_id=comment_model.task_id)
-            comment_data = self.asana_api_client.get_comment(comment_id=comment_model.comment_id)
+            return task_result.get_data(), comment_result.get_data()
         except (AsanaForbiddenError, AsanaNotFoundError) as error:
             msg = f"Cant get access to comment {comment_model.comment_id}"
             raise CommentDeletedError(msg) from error
-        logging.info("Raw comment text: %s", comment_data["text"])
-        comment_mentions_profile_ids = extract_user_profile_id_from_text(text=comment_data["text"])
+
+    def _get_mention_users(self, profile_ids: Iterable[str]) -> dict[str, AtlasAsanaUser]:
+        try:
+            return self.asana_users_repository.get_many(membership_ids=list(profile_ids)).users
+        except AsanaApiClientError:
+            logger.exception("AsanaApiClientError")
+            return {}
+
+    def _build_comment_dto(
+        self,
+        comment_model: AsanaComment,
+        task_data: dict[str, Any],
+        comment_data: dict[str, Any],
+        comment_mentions_profile_ids: list[str],
+        users: dict[str, AtlasAsanaUser],
+    ) -> CommentDto:
         mention_users: list[AtlasAsanaUser] = []
         profile_url_not_found_in_db: list[str] = []
         for profile_id in comment_mentions_profile_ids:
-            try:
-                asana_user = self.asana_users_repository.get(membership_id=profile_id)
-                mention_users.append(asana_user)
-            except AsanaApiClientError:
-                logging.exception("AsanaApiClientError")
+            if profile_id in users:
+                mention_users.append(users[profile_id])
+            else:
                 profile_url = get_asana_profile_url_by_id(profile_id=profile_id, workspace_id=ATLAS_WORKSPACE_ID)
                 profile_url_not_found_in_db.append(profile_url)
-        profile_urls_mention_map = get_user_profile_url_mention_map(asana_users=AtlasAsanaUser.objects.all())
-        asana_comment_prettifier = AsanaCommentPrettifier(profile_urls_mention_map=profile_urls_mention_map)
-        pretty_comment_text = asana_comment_prettifier.prettify(comment_text=comment_data["text"])
+        pretty_comment_text = get_comment_prettifier().prettify(comment_text=comment_data["text"])
         return CommentDto(
             comment_model=comment_model,
             comment_data=comment_data,
@@ -51,3 +81,78 @@ class CommentDataCollector:
             mentions_profile_ids=comment_mentions_profile_ids,
             profile_url_not_found_in_db=profile_url_not_found_in_db,
         )
+
+    def collect(self, comment_model: AsanaComment) -> CommentDto:
+        task_data, comment_data = self._fetch_task_and_comment(comment_model=comment_model)
+        logger.info("Raw comment text: %s", comment_data["text"])
+        comment_mentions_profile_ids = extract_user_profile_id_from_text(text=comment_data["text"])
+        return self._build_comment_dto(
+            comment_model=comment_model,
+            task_data=task_data,
+            comment_data=comment_data,
+            comment_mentions_profile_ids=comment_mentions_profile_ids,
+            users=self._get_mention_users(profile_ids=comment_mentions_profile_ids),
+        )
+
+    def _fetch_many(
+        self,
+        comment_models: Sequence[AsanaComment],
+    ) -> tuple[dict[str, dict[str, Any] | None], dict[str, dict[str, Any] | None]]:
+        """Fetch every task once and all comments by batch requests, not available marked by None.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        task_ids = list(dict.fromkeys(comment_model.task_id for comment_model in comment_models))
+        comment_ids = [comment_model.comment_id for comment_model in comment_models]
+        results = self.asana_api_client.batch(
+            [BatchAction.get(f"/tasks/{task_id}", projection=TaskProjection.COMMENT) for task_id in task_ids]
+            + [
+                BatchAction.get(f"/stories/{comment_id}", projection=StoryProjection.COMMENT)
+                for comment_id in comment_ids
+            ],
+        )
+        data: list[dict[str, Any] | None] = []
+        for result in results:
+            try:
+                data.append(result.get_data())
+            except (AsanaForbiddenError, AsanaNotFoundError):
+                data.append(None)
+        return dict(zip(task_ids, data[: len(task_ids)], strict=True)), dict(
+            zip(comment_ids, data[len(task_ids) :], strict=True),
+        )
+
+    def collect_many(self, comment_models: Sequence[AsanaComment]) -> dict[str, CommentDto | None]:
+        """Collect comments of batch by comment id, deleted or not available comments are None.
+
+        Every task fetched once, mentions of all comments resolved by one users query.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        tasks_data, comments_data = self._fetch_many(comment_models=comment_models)
+        mentions_profile_ids = {
+            comment_id: extract_user_profile_id_from_text(text=comment_data["text"])
+            for comment_id, comment_data in comments_data.items()
+            if comment_data is not None
+        }
+        users = self._get_mention_users(
+            profile_ids=(profile_id for profile_ids in mentions_profile_ids.values() for profile_id in profile_ids),
+        )
+        result: dict[str, CommentDto | None] = {}
+        for comment_model in comment_models:
+            task_data = tasks_data[comment_model.task_id]
+            comment_data = comments_data[comment_model.comment_id]
+            if task_data is None or comment_data is None:
+                result[comment_model.comment_id] = None
+                continue
+            result[comment_model.comment_id] = self._build_comment_dto(
+                comment_model=comment_model,
+                task_data=task_data,
+                comment_data=comment_data,
+                comment_mentions_profile_ids=mentions_profile_ids[comment_model.comment_id],
+                users=users,
+            )
+        return result
@@ -1,11 +1,11 @@
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, get_shared_response_cache
 from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from .models import ProjectIgnoredSection
 
-asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
+asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY, cache=get_shared_response_cache())
 
 
 class ProjectIgnoredSectionForm(forms.ModelForm):  # type: ignore[type-arg]
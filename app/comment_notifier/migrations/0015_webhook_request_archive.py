@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:57
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes of big tables created without write lock
+    atomic = False
+
+    dependencies = [
+        ("comment_notifier", "0014_alter_asanacomment_comment_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asanawebhookrequestdata",
+            name="archived_data",
+            field=models.BinaryField(default=None, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="asanawebhookrequestdata",
+            index=models.Index(fields=["project", "is_target_event", "created"], name="cn_whreq_proj_target_created"),
+        ),
+        AddIndexConcurrently(
+            model_name="asanawebhookrequestdata",
+            index=models.Index(fields=["created"], name="cn_whreq_created"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comment_notifier", "0015_webhook_request_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectnotifysender",
+            name="coalesce_window",
+            field=models.PositiveIntegerField(default=0, verbose_name="Окно объединения сообщений, сек"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comment_notifier", "0016_projectnotifysender_coalesce_window"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskScanWatermark",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("task_id", models.CharField(max_length=50, unique=True)),
+                ("modified_at", models.DateTimeField()),
+                ("last_story_id", models.CharField(blank=True, max_length=50)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
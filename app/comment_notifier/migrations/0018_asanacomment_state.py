@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_state(apps, schema_editor):
+    """Set state by status fields, rows updated by pk ranges so table not locked by one long update."""
+    AsanaComment = apps.get_model("comment_notifier", "AsanaComment")
+    state = models.Case(
+        models.When(is_deleted=True, then=models.Value("deleted")),
+        models.When(is_notified__isnull=True, then=models.Value("pending")),
+        models.When(models.Q(text="") | models.Q(task_url=""), then=models.Value("needs_info")),
+        default=models.Value("done"),
+    )
+    max_pk = AsanaComment.objects.aggregate(max_pk=models.Max("pk"))["max_pk"] or 0
+    for start in range(0, max_pk + 1, BACKFILL_BATCH_SIZE):
+        AsanaComment.objects.filter(pk__gte=start, pk__lt=start + BACKFILL_BATCH_SIZE).update(state=state)
+
+
+class Migration(migrations.Migration):
+    # indexes of big table created without write lock, backfill batches committed separately
+    atomic = False
+
+    dependencies = [
+        ("comment_notifier", "0017_task_scan_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asanacomment",
+            name="state",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Ожидает оповещения"),
+                    ("needs_info", "Нет текста или ссылки"),
+                    ("done", "Обработан"),
+                    ("deleted", "Удален"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(backfill_state, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="asanacomment",
+            index=models.Index(
+                condition=models.Q(("state", "pending")), fields=["created"], name="cn_comment_pending"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="asanacomment",
+            index=models.Index(
+                condition=models.Q(("state__in", ("pending", "needs_info"))),
+                fields=["created"],
+                name="cn_comment_incomplete",
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.db import models
+from django.db.models import Q
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -9,6 +10,8 @@ if TYPE_CHECKING:
 class ProjectNotifySender(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.CharField(max_length=254)
+    # seconds, messages to one recipient during window merged to digest, 0 - send at once
+    coalesce_window = models.PositiveIntegerField(default=0, verbose_name="Окно объединения сообщений, сек")
 
     def __str__(self) -> str:
         return self.name
@@ -57,11 +60,73 @@ class AsanaWebhookRequestData(models.Model):
     headers = models.JSONField()
     payload = models.JSONField()
     is_target_event = models.BooleanField(null=True, default=None)
+    # False while saved by webhook queue and process task not sent
+    is_dispatched = models.BooleanField(default=True)
+    # gzip json of headers and payload of old request, fields itself cleared
+    archived_data = models.BinaryField(null=True, default=None, editable=False)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=("project", "is_target_event", "created"), name="cn_whreq_proj_target_created"),
+            models.Index(fields=("created",), name="cn_whreq_created"),
+            models.Index(
+                fields=("is_dispatched",),
+                condition=models.Q(is_dispatched=False),
+                name="cn_whreq_not_dispatched",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"<{self.__class__.__name__}:{self.pk}>"
 
 
+class CommentState(models.TextChoices):
+    PENDING = "pending", "Ожидает оповещения"
+    NEEDS_INFO = "needs_info", "Нет текста или ссылки"
+    DONE = "done", "Обработан"
+    DELETED = "deleted", "Удален"
+
+
+# comments not fully processed, work queues of notifier and additional info loader
+INCOMPLETE_COMMENT_STATES = (CommentState.PENDING, CommentState.NEEDS_INFO)
+
+
+def get_comment_state_expression() -> models.Case:
+    """State of comment by is_deleted, is_notified, text and task_url, for update of many rows."""
+    return models.Case(
+        models.When(is_deleted=True, then=models.Value(CommentState.DELETED)),
+        models.When(is_notified__isnull=True, then=models.Value(CommentState.PENDING)),
+        models.When(Q(text="") | Q(task_url=""), then=models.Value(CommentState.NEEDS_INFO)),
+        default=models.Value(CommentState.DONE),
+    )
+
+
+class AsanaCommentQuerySet(models.QuerySet["AsanaComment"]):
+    def pending(self) -> "AsanaCommentQuerySet":
+        return self.filter(state=CommentState.PENDING)
+
+    def incomplete(self) -> "AsanaCommentQuerySet":
+        return self.filter(state__in=INCOMPLETE_COMMENT_STATES)
+
+    def update_state(self) -> int:
+        """Recalculate state after update() of status fields."""
+        return self.update(state=get_comment_state_expression())
+
+    def update_with_state(self, **kwargs: Any) -> int:  # noqa: ANN401
+        """update() of status fields and state of updated rows, rows selected before update.
+
+        Queryset can be filtered by updated fields (admin filters), so state updated by pk.
+        """
+        pks = list(self.values_list("pk", flat=True))
+        updated_count = self.model.objects.filter(pk__in=pks).update(**kwargs)
+        self.model.objects.filter(pk__in=pks).update_state()
+        return updated_count
+
+
+class AsanaCommentManager(models.Manager.from_queryset(AsanaCommentQuerySet)):  # type: ignore[misc]
+    pass
+
+
 class AsanaComment(models.Model):
     user_id = models.CharField()
     task_id = models.CharField()
@@ -79,11 +144,61 @@ class AsanaComment(models.Model):
     is_deleted = models.BooleanField(blank=True, default=False)
     text = models.TextField(blank=True)
     send_result = models.JSONField(blank=True, default=dict)
+    # derived from status fields by refresh_state, indexed for work queues
+    state = models.CharField(max_length=20, choices=CommentState, default=CommentState.PENDING)
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = AsanaCommentManager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=("created",),
+                name="cn_comment_pending",
+                condition=Q(state=CommentState.PENDING),
+            ),
+            models.Index(
+                fields=("created",),
+                name="cn_comment_incomplete",
+                condition=Q(state__in=INCOMPLETE_COMMENT_STATES),
+            ),
+        )
+
     def __str__(self) -> str:
         return f"<{self.__class__.__name__}:{self.pk}>"
 
+    def save(self, **kwargs: Any) -> None:  # noqa: ANN401
+        self.refresh_state()
+        update_fields = kwargs.get("update_fields")
+        # state depends on updated fields, saved with them
+        if update_fields and "state" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "state"]
+        super().save(**kwargs)
+
+    def get_state(self) -> CommentState:
+        if self.is_deleted:
+            return CommentState.DELETED
+        if self.is_notified is None:
+            return CommentState.PENDING
+        if not self.text or not self.task_url:
+            return CommentState.NEEDS_INFO
+        return CommentState.DONE
+
+    def refresh_state(self) -> None:
+        self.state = self.get_state()
+
     def mark_as_deleted(self) -> None:
         self.is_deleted = True
         self.save()
+
+
+class TaskScanWatermark(models.Model):
+    """Task state seen by last comments scan, not modified tasks skipped by next scan."""
+
+    task_id = models.CharField(max_length=50, unique=True)
+    modified_at = models.DateTimeField()
+    last_story_id = models.CharField(max_length=50, blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__}:{self.task_id}>"
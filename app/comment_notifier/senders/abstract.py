@@ -1,19 +1,55 @@
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from common.utils import normalize_multiline
-from message_sender.client import AtlasMessageSender
+from message_sender.client import AtlasMessageSender, Handlers
 
 from comment_notifier.collectors.dto import CommentDto
 
+from .coalescing import MessageCoalescer, Recipient, send_to_recipient
+
+logger = logging.getLogger(__name__)
+
 
 class BaseCommentSender(ABC):
-    def __init__(self, message_sender: AtlasMessageSender):
+    def __init__(self, message_sender: AtlasMessageSender, coalescer: MessageCoalescer | None = None):
         self.message_sender = message_sender
+        self.coalescer = coalescer
 
     @abstractmethod
     def notify(self, comment_dto: CommentDto) -> None:
         pass
 
+    def notify_many(self, comment_dtos: Sequence[CommentDto]) -> list[CommentDto]:
+        """Notify about comments of batch, return comments which notification failed.
+
+        Senders which can send messages in bulk override it.
+        """
+        failed: list[CommentDto] = []
+        for comment_dto in comment_dtos:
+            try:
+                self.notify(comment_dto=comment_dto)
+            # need for isolate comments of batch
+            except Exception:
+                logger.exception("Cant notify comment %s", comment_dto.comment_model.comment_id)
+                failed.append(comment_dto)
+        return failed
+
+    def _send_to_recipient(self, recipient: Recipient, message: str) -> None:
+        if self.coalescer is not None:
+            self.coalescer.send(recipient=recipient, message=message)
+        else:
+            send_to_recipient(message_sender=self.message_sender, recipient=recipient, message=message)
+
+    def _send_message_to_user(self, user_tag: str, message: str) -> None:
+        """Send message to user, messages of coalescing window merged to digest."""
+        self._send_to_recipient(recipient=Recipient(user_tag=user_tag), message=message)
+
+    def _send_message(self, handler: Handlers, message: str) -> None:
+        """Send message by handler, messages of coalescing window merged to digest."""
+        self._send_to_recipient(recipient=Recipient(handler=handler), message=message)
+
     def _send_log_cant_notify(self, comment_dto: CommentDto, reason: str) -> dict[str, str | list[str]]:
         task_url = comment_dto.task_data["permalink_url"]
         message = f"""
@@ -27,4 +63,3 @@ class BaseCommentSender(ABC):
 
     def _normalize_message(self, message: str) -> str:
         return normalize_multiline(message)
-
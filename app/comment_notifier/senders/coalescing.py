@@ -0,0 +1,73 @@
+import logging
+from dataclasses import dataclass
+
+from common.batch_queue import BatchQueue
+from message_sender.client import AtlasMessageSender, Handlers
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SEPARATOR = "\n\n— — —\n\n"
+
+
+@dataclass(frozen=True)
+class Recipient:
+    """User by message tag or chat by handler."""
+
+    user_tag: str = ""
+    handler: Handlers | None = None
+
+    @property
+    def key(self) -> str:
+        if self.handler is not None:
+            return f"handler:{self.handler.value}"
+        return f"user:{self.user_tag}"
+
+    @classmethod
+    def from_key(cls, key: str) -> "Recipient":
+        kind, value = key.split(":", 1)
+        if kind == "handler":
+            return cls(handler=Handlers(value))
+        return cls(user_tag=value)
+
+
+def send_to_recipient(message_sender: AtlasMessageSender, recipient: Recipient, message: str) -> None:
+    if recipient.handler is not None:
+        message_sender.send_message(handler=recipient.handler, message=message)
+    else:
+        message_sender.send_message_to_user(user_tag=recipient.user_tag, message=message)
+
+
+def build_digest(messages: list[str]) -> str:
+    if len(messages) == 1:
+        return messages[0]
+    return f"🔔 New comments: {len(messages)}{DIGEST_SEPARATOR}" + DIGEST_SEPARATOR.join(messages)
+
+
+def get_recipient_queue(recipient_key: str) -> BatchQueue:
+    return BatchQueue(name=f"comment_notifier:coalesce:{recipient_key}")
+
+
+class MessageCoalescer:
+    """Buffer messages per recipient for window seconds and send them as one digest.
+
+    First message of window schedules send_coalesced_messages_task, messages to recipient
+    added during window sent by it. Window 0 or redis not available: message sent at once.
+    """
+
+    def __init__(self, message_sender: AtlasMessageSender, window: int):
+        self.message_sender = message_sender
+        self.window = window
+
+    def send(self, recipient: Recipient, message: str) -> None:
+        if self.window > 0:
+            from comment_notifier.tasks import send_coalesced_messages_task  # noqa: PLC0415
+
+            if get_recipient_queue(recipient_key=recipient.key).push(
+                items=[message],
+                consumer=send_coalesced_messages_task,
+                countdown=self.window,
+                kwargs={"recipient_key": recipient.key},
+            ):
+                return
+            logger.info("Coalescing not available, message to %s sent at once", recipient.key)
+        send_to_recipient(message_sender=self.message_sender, recipient=recipient, message=message)
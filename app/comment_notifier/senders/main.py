@@ -64,7 +64,7 @@ class PersonalSender(BaseCommentSender):
                     {comment_dto.pretty_comment_text}
                     """
                 message = self._normalize_message(message)
-                self.message_sender.send_message_to_user(
+                self._send_message_to_user(
                     user_tag=asana_user.owner.tag,
                     message=message,
                 )
@@ -104,7 +104,7 @@ class SourceProjectSender(BaseCommentSender):
             {comment_dto.pretty_comment_text}
             """
         message = self._normalize_message(message)
-        self.message_sender.send_message(
+        self._send_message(
             handler=Handlers.FARM_GROUP,
             message=message,
         )
@@ -121,7 +121,7 @@ class SourceProjectSender(BaseCommentSender):
         message = self._normalize_message(message)
         owner = cast(AtlasUser, asana_user.owner)
         user_tag = cast(str, owner.tag)
-        self.message_sender.send_message_to_user(
+        self._send_message_to_user(
             user_tag=user_tag,
             message=message,
         )
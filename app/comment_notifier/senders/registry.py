@@ -1,7 +1,10 @@
 from dataclasses import dataclass
 from typing import Callable
 
+from message_sender.client import AtlasMessageSender
+
 from .abstract import BaseCommentSender
+from .coalescing import MessageCoalescer
 
 
 @dataclass
@@ -28,3 +31,9 @@ def register_sender(name: str, description: str) -> Callable[[type[BaseCommentSe
         return cls
 
     return wrap
+
+
+def create_sender(name: str, message_sender: AtlasMessageSender, coalesce_window: int = 0) -> BaseCommentSender:
+    """Create registered sender, messages to one recipient during coalesce_window seconds merged to digest."""
+    coalescer = MessageCoalescer(message_sender=message_sender, window=coalesce_window) if coalesce_window else None
+    return SENDERS_REGISTRY[name].sender(message_sender=message_sender, coalescer=coalescer)
@@ -1,30 +1,47 @@
+import asyncio
 import logging
-from collections.abc import Generator
-from dataclasses import dataclass
-from time import sleep
+from collections.abc import Generator, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http import HTTPStatus
+from itertools import islice
 from typing import Any
 
-from asana.client import AsanaApiClient
+from asana.client import (
+    AsanaApiClient,
+    AsyncAsanaApiClient,
+    BatchAction,
+    StoryProjection,
+    TaskProjection,
+    get_shared_response_cache,
+)
 from asana.client.exception import AsanaApiClientError
-from asana.models import AtlasAsanaUser
-from asana.services import AsanaCommentPrettifier, get_user_profile_url_mention_map
+from asana.identity_cache import get_shared_user_identity_cache
+from asana.services import AsanaCommentPrettifier, get_comment_prettifier
+from common.event_dedup import WebhookEventDeduplicator
 from common.utils import normalize_multiline
 from django.db import transaction
 from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from message_sender.client import AtlasMessageSender
 
 from .collectors.comment_data import CommentDataCollector
 from .collectors.dto import CommentDto
 from .collectors.exceptions import CommentDeletedError
 from .models import (
+    INCOMPLETE_COMMENT_STATES,
     AsanaComment,
     AsanaWebhookProject,
     AsanaWebhookRequestData,
     ProjectIgnoredSection,
     ProjectNotifySender,
+    TaskScanWatermark,
 )
 from .senders import BaseCommentSender
-from .senders.registry import SENDERS_REGISTRY
+from .senders.registry import SENDERS_REGISTRY, create_sender
+
+logger = logging.getLogger(__name__)
 
 
 class ProcessAsanaNewCommentEvent:
@@ -51,24 +68,66 @@ class ProcessAsanaNewCommentEvent:
                 result.append(event_dto)
         return result
 
+    def _create_comments(
+        self,
+        asana_comments_dto: list[AsanaNewCommentEvent],
+        project: AsanaWebhookProject,
+    ) -> list[AsanaNewCommentEvent]:
+        """Create not existing comments, return events of created comments."""
+        comments_dto = {str(comment_dto.comment_id): comment_dto for comment_dto in asana_comments_dto}
+        existing_ids = set(
+            AsanaComment.objects.filter(comment_id__in=comments_dto).values_list("comment_id", flat=True),
+        )
+        new_comments_dto = [dto for comment_id, dto in comments_dto.items() if comment_id not in existing_ids]
+        AsanaComment.objects.bulk_create(
+            (
+                AsanaComment(
+                    comment_id=comment_dto.comment_id,
+                    user_id=comment_dto.user_id,
+                    task_id=comment_dto.task_id,
+                    project=project,
+                )
+                for comment_dto in new_comments_dto
+            ),
+            ignore_conflicts=True,
+        )
+        return new_comments_dto
+
     def process(self, asana_webhook: AsanaWebhookRequestData) -> Result:
-        events_data = asana_webhook.payload
-        asana_comments_dto = self._event_to_comment_dto(events_data=events_data)
-        for comment_dto in asana_comments_dto:
-            AsanaComment.objects.create(
-                comment_id=comment_dto.comment_id,
-                user_id=comment_dto.user_id,
-                task_id=comment_dto.task_id,
+        events = asana_webhook.payload.get("events", [])
+        get_shared_response_cache().invalidate_by_events(events=events)
+        deduplicator = WebhookEventDeduplicator(scope=f"comment_notifier:{asana_webhook.project_id}")
+        claimed = deduplicator.claim(events=events)
+        try:
+            asana_comments_dto = self._event_to_comment_dto(events_data={"events": claimed.events})
+            created_comments_dto = self._create_comments(
+                asana_comments_dto=asana_comments_dto,
                 project=asana_webhook.project,
             )
+        except Exception:
+            # task retry processes events again
+            deduplicator.release(claimed=claimed)
+            raise
         asana_webhook.is_target_event = bool(asana_comments_dto)
         asana_webhook.save()
         return ProcessAsanaNewCommentEvent.Result(
-            created_comments_count=len(asana_comments_dto),
-            comments=asana_comments_dto,
+            created_comments_count=len(created_comments_dto),
+            comments=created_comments_dto,
         )
 
 
+def notify_profiles_not_found(message_sender: AtlasMessageSender, comment_dto: CommentDto) -> None:
+    task_url = comment_dto.task_data["permalink_url"]
+    message = f"""
+        ⚠️ Not found asana user for profiles:
+
+        Task url: {task_url}
+        Profiles: {comment_dto.profile_url_not_found_in_db}
+    """
+    message = normalize_multiline(message)
+    message_sender.send_log_message(message=message)
+
+
 class AsanaCommentNotifier:
     def __init__(
         self,
@@ -81,15 +140,7 @@ class AsanaCommentNotifier:
         self.comment_notifier: BaseCommentSender = comment_notifier
 
     def _notify_profiles_not_found(self, comment_dto: CommentDto) -> None:
-        task_url = comment_dto.task_data["permalink_url"]
-        message = f"""
-            ⚠️ Not found asana user for profiles:
-
-            Task url: {task_url}
-            Profiles: {comment_dto.profile_url_not_found_in_db}
-        """
-        message = normalize_multiline(message)
-        self.message_sender.send_log_message(message=message)
+        notify_profiles_not_found(message_sender=self.message_sender, comment_dto=comment_dto)
 
     def process(self, comment_model: AsanaComment) -> None:
         """Process asana comment.
@@ -100,6 +151,7 @@ class AsanaCommentNotifier:
         """
         comment_data_collector = CommentDataCollector(
             asana_api_client=self.asana_api_client,
+            identity_cache=get_shared_user_identity_cache(),
         )
         try:
             comment_dto = comment_data_collector.collect(comment_model=comment_model)
@@ -116,53 +168,308 @@ class AsanaCommentNotifier:
         comment_model.save()
 
 
+@dataclass
+class CommentsBatchResult:
+    notified_ids: list[str] = field(default_factory=list)
+    deleted_ids: list[str] = field(default_factory=list)
+    failed_ids: list[str] = field(default_factory=list)
+
+
+class AsanaCommentBatchNotifier:
+    """Notify about batch of comments, overhead paid per batch.
+
+    Every task fetched once, mentions of all comments resolved by one pass, sender created
+    once per project and gets comments of project in bulk. Status saved per comment.
+    """
+
+    NOTIFIED_FIELDS = ("has_mention", "is_notified", "task_url", "text", "state")
+
+    def __init__(self, asana_api_client: AsanaApiClient, message_sender: AtlasMessageSender):
+        self.message_sender = message_sender
+        self.comment_data_collector = CommentDataCollector(
+            asana_api_client=asana_api_client,
+            identity_cache=get_shared_user_identity_cache(),
+        )
+
+    def _get_project_sender(self, project: AsanaWebhookProject | None) -> BaseCommentSender | None:
+        if project is not None and project.message_sender is not None:
+            return create_sender(
+                name=project.message_sender.name,
+                message_sender=self.message_sender,
+                coalesce_window=project.message_sender.coalesce_window,
+            )
+        from message_sender.tasks import send_log_message_task  # noqa: PLC0415
+
+        message = f"🛑 {self.__class__.__name__}\nSet {ProjectNotifySender.__name__} for project: {project}"
+        send_log_message_task.delay(message=message)  # type: ignore[attr-defined]
+        return None
+
+    def _notify_project(self, comment_dtos: list[CommentDto]) -> tuple[list[CommentDto], list[CommentDto]]:
+        """Notify about comments of one project, return notified and failed comments."""
+        sender = self._get_project_sender(project=comment_dtos[0].comment_model.project)
+        if sender is None:
+            return [], comment_dtos
+        for comment_dto in comment_dtos:
+            if comment_dto.profile_url_not_found_in_db:
+                try:
+                    notify_profiles_not_found(message_sender=self.message_sender, comment_dto=comment_dto)
+                except Exception:
+                    logger.exception("Cant send profiles not found message")
+        failed_dtos = sender.notify_many(comment_dtos=comment_dtos)
+        failed_ids = {id(comment_dto) for comment_dto in failed_dtos}
+        return [comment_dto for comment_dto in comment_dtos if id(comment_dto) not in failed_ids], failed_dtos
+
+    def process(self, comment_models: Sequence[AsanaComment]) -> CommentsBatchResult:
+        """Process comments of one project or several projects.
+
+        Raises:
+             AsanaApiClientError: if cant get tasks or comments from asana
+
+        """
+        result = CommentsBatchResult()
+        comment_dtos = self.comment_data_collector.collect_many(comment_models=comment_models)
+        deleted_comments: list[AsanaComment] = []
+        project_comment_dtos: dict[int | None, list[CommentDto]] = {}
+        for comment_model in comment_models:
+            comment_dto = comment_dtos[comment_model.comment_id]
+            if comment_dto is None:
+                comment_model.is_deleted = True
+                comment_model.refresh_state()
+                deleted_comments.append(comment_model)
+            else:
+                project_comment_dtos.setdefault(comment_model.project_id, []).append(comment_dto)
+        AsanaComment.objects.bulk_update(deleted_comments, fields=["is_deleted", "state"])
+        result.deleted_ids = [comment_model.comment_id for comment_model in deleted_comments]
+        notified_comments: list[AsanaComment] = []
+        for project_dtos in project_comment_dtos.values():
+            notified_dtos, failed_dtos = self._notify_project(comment_dtos=project_dtos)
+            for comment_dto in notified_dtos:
+                comment_model = comment_dto.comment_model
+                comment_model.has_mention = comment_dto.has_mention
+                comment_model.is_notified = True
+                comment_model.task_url = comment_dto.task_data["permalink_url"]
+                comment_model.text = comment_dto.pretty_comment_text
+                comment_model.refresh_state()
+                notified_comments.append(comment_model)
+            result.failed_ids.extend(comment_dto.comment_model.comment_id for comment_dto in failed_dtos)
+        AsanaComment.objects.bulk_update(notified_comments, fields=list(self.NOTIFIED_FIELDS))
+        result.notified_ids = [comment_model.comment_id for comment_model in notified_comments]
+        return result
+
+
+class TaskScanWatermarks:
+    """Watermarks of tasks of one project scan.
+
+    Tasks with modified_at equal to watermark skipped, comments of changed task returned after
+    last seen story. Watermarks saved by commit after comments of scan saved, so failed scan
+    checks tasks again.
+
+    Asana does not change task modified_at when comment added (stories are separate objects),
+    so task with watermark older than RESCAN_AFTER checked anyway and its watermark renewed.
+    Comment of such task found by scan not later than RESCAN_AFTER.
+    """
+
+    BATCH_SIZE = 500
+    RESCAN_AFTER = timedelta(days=3)
+
+    def __init__(self) -> None:
+        self._watermarks: dict[str, TaskScanWatermark] = {}
+        self._changed: dict[str, TaskScanWatermark] = {}
+
+    def filter_changed(self, tasks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return tasks modified since last scan or not checked during RESCAN_AFTER, tasks without modified_at too."""
+        task_ids = [task_data["gid"] for task_data in tasks]
+        self._watermarks.update(
+            (watermark.task_id, watermark) for watermark in TaskScanWatermark.objects.filter(task_id__in=task_ids)
+        )
+        rescan_border = timezone.now() - self.RESCAN_AFTER
+        changed_tasks = []
+        for task_data in tasks:
+            modified_at = parse_datetime(task_data.get("modified_at") or "")
+            watermark = self._watermarks.get(task_data["gid"])
+            if (
+                modified_at is not None
+                and watermark is not None
+                and watermark.modified_at == modified_at
+                and watermark.updated > rescan_border
+            ):
+                continue
+            changed_tasks.append(task_data)
+            if modified_at is not None:
+                self._changed[task_data["gid"]] = TaskScanWatermark(
+                    task_id=task_data["gid"],
+                    modified_at=modified_at,
+                    last_story_id=watermark.last_story_id if watermark is not None else "",
+                )
+        logger.info("Tasks: %s, changed: %s", len(tasks), len(changed_tasks))
+        return changed_tasks
+
+    def get_new_comments(self, task_id: str, task_comments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return comments after last seen story, all comments if last seen story deleted."""
+        watermark = self._watermarks.get(task_id)
+        if task_id in self._changed and task_comments:
+            self._changed[task_id].last_story_id = task_comments[-1]["gid"]
+        if watermark is None or not watermark.last_story_id:
+            return task_comments
+        comment_ids = [comment_data["gid"] for comment_data in task_comments]
+        if watermark.last_story_id not in comment_ids:
+            return task_comments
+        return task_comments[comment_ids.index(watermark.last_story_id) + 1 :]
+
+    def commit(self) -> None:
+        TaskScanWatermark.objects.bulk_create(
+            self._changed.values(),
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["task_id"],
+            update_fields=["modified_at", "last_story_id", "updated"],
+        )
+        self._changed.clear()
+
+
 class ProjectCommentsGenerator:
     """Search comments in tasks and return it.
 
     In projects cant be ignored sections.
     """
 
-    SLEEP_AFTER_FETCH_TASK = 0.2
+    # tasks which stories loaded concurrently by async client at once
+    TASKS_CHUNK_SIZE = 50
+    # sections which tasks loaded concurrently and held in memory at once
+    SECTIONS_CHUNK_SIZE = 4
+    COMMENT_OPT_FIELDS = ("gid", "created_by", "resource_subtype")
+    TASK_OPT_FIELDS = ("gid", "name", "modified_at")
+    TASK_MEMBERSHIPS_OPT_FIELDS = ("memberships.project", "memberships.section")
 
-    def __init__(self, asana_api_client: AsanaApiClient):
+    def __init__(self, asana_api_client: AsanaApiClient, async_api_client: AsyncAsanaApiClient | None = None):
         self.asana_api_client = asana_api_client
+        self.async_api_client = async_api_client
 
-    def _get_project_active_sections(self, project: AsanaWebhookProject) -> list[dict[str, Any]]:
+    def _get_ignored_sections_ids(self, project: AsanaWebhookProject) -> set[str]:
+        return {ignored_section.section_id for ignored_section in project.ignored_sections.all()}
+
+    def _get_project_active_sections(self, project: AsanaWebhookProject) -> Iterator[dict[str, Any]]:
         """Get project active sections.
 
         Raises:
              AsanaApiClientError: if cant get some data from asana
 
         """
-        ignored_sections_ids = [ignored_section.section_id for ignored_section in project.ignored_sections.all()]
+        ignored_sections_ids = self._get_ignored_sections_ids(project=project)
         sections = self.asana_api_client.get_project_sections(project_id=project.project_id)
-        return [section_data for section_data in sections if section_data["gid"] not in ignored_sections_ids]
+        return (section_data for section_data in sections if section_data["gid"] not in ignored_sections_ids)
+
+    async def _fetch_tasks_comments_concurrently(self, task_ids: list[str]) -> list[list[dict[str, Any]]]:
+        assert self.async_api_client is not None  # noqa: S101
+        async with self.async_api_client as client:
+            return await asyncio.gather(
+                *(
+                    client.get_comments_from_task(task_id=task_id, opt_fields=list(self.COMMENT_OPT_FIELDS))
+                    for task_id in task_ids
+                ),
+            )
 
-    def generate(self, project: AsanaWebhookProject) -> Generator[dict[str, Any], None, None]:
-        """Return comments from project sections.
+    def _iter_tasks_comments(self, tasks: Iterator[dict[str, Any]]) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """Return task id and task comments.
 
         Raises:
              AsanaApiClientError: if cant get some data from asana
 
         """
-        logging.info("%s: project: %s", self.__class__.__name__, project)
-        sections_to_check = self._get_project_active_sections(project=project)
-        logging.info("Sections to collect comments: %s", sections_to_check)
-        for section_data in sections_to_check:
-            section_tasks = self.asana_api_client.get_section_tasks(
-                section_id=section_data["gid"],
-            )
-            logging.info("section: %s, tasks: %s", section_data["name"], len(section_tasks))
-            for task_data in section_tasks:
+        if self.async_api_client is None:
+            for task_data in tasks:
                 task_id = task_data["gid"]
-                logging.info("Task: %s %s", task_id, task_data["name"])
-                sleep(self.SLEEP_AFTER_FETCH_TASK)
+                logger.info("Task: %s %s", task_id, task_data["name"])
                 task_comments = self.asana_api_client.get_comments_from_task(
                     task_id=task_id,
-                    opt_fields=["gid", "created_by", "resource_subtype"],
+                    opt_fields=list(self.COMMENT_OPT_FIELDS),
+                )
+                yield task_id, task_comments
+            return
+        while tasks_chunk := list(islice(tasks, self.TASKS_CHUNK_SIZE)):
+            task_ids = [task_data["gid"] for task_data in tasks_chunk]
+            logger.info("Tasks: %s", task_ids)
+            tasks_comments = asyncio.run(self._fetch_tasks_comments_concurrently(task_ids=task_ids))
+            yield from zip(task_ids, tasks_comments, strict=True)
+
+    async def _fetch_sections_tasks_concurrently(self, section_ids: list[str]) -> list[list[dict[str, Any]]]:
+        assert self.async_api_client is not None  # noqa: S101
+        async with self.async_api_client as client:
+            return await asyncio.gather(
+                *(
+                    client.get_section_tasks(section_id=section_id, opt_fields=list(self.TASK_OPT_FIELDS))
+                    for section_id in section_ids
+                ),
+            )
+
+    def _iter_sections_tasks(
+        self,
+        sections: list[dict[str, Any]],
+    ) -> Iterator[tuple[dict[str, Any], Iterator[dict[str, Any]]]]:
+        """Return section and section tasks, with async client tasks of sections chunk loaded concurrently.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        if self.async_api_client is None:
+            for section_data in sections:
+                yield (
+                    section_data,
+                    self.asana_api_client.iter_section_tasks(
+                        section_id=section_data["gid"],
+                        opt_fields=list(self.TASK_OPT_FIELDS),
+                    ),
                 )
-                logging.info("Comments count: %s", len(task_comments))
-                for comment_data in task_comments:
+            return
+        sections_iter = iter(sections)
+        # next chunk loaded after tasks of previous chunk consumed
+        while sections_chunk := list(islice(sections_iter, self.SECTIONS_CHUNK_SIZE)):
+            sections_tasks = asyncio.run(
+                self._fetch_sections_tasks_concurrently(
+                    section_ids=[section_data["gid"] for section_data in sections_chunk],
+                ),
+            )
+            for section_data, section_tasks in zip(sections_chunk, sections_tasks, strict=True):
+                yield section_data, iter(section_tasks)
+
+    def _iter_changed_tasks(
+        self,
+        tasks: Iterator[dict[str, Any]],
+        watermarks: TaskScanWatermarks,
+    ) -> Iterator[dict[str, Any]]:
+        while tasks_chunk := list(islice(tasks, self.TASKS_CHUNK_SIZE)):
+            yield from watermarks.filter_changed(tasks=tasks_chunk)
+
+    def generate(
+        self,
+        project: AsanaWebhookProject,
+        watermarks: TaskScanWatermarks | None = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """Return comments from project sections.
+
+        With watermarks stories loaded only for tasks modified since last scan.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        logger.info("%s: project: %s", self.__class__.__name__, project)
+        sections_to_check = list(self._get_project_active_sections(project=project))
+        for section_data, section_tasks in self._iter_sections_tasks(sections=sections_to_check):
+            logger.info("Section to collect comments: %s", section_data["name"])
+            tasks_to_check = (
+                section_tasks
+                if watermarks is None
+                else self._iter_changed_tasks(tasks=section_tasks, watermarks=watermarks)
+            )
+            for task_id, task_comments in self._iter_tasks_comments(tasks=tasks_to_check):
+                new_comments = (
+                    task_comments
+                    if watermarks is None
+                    else watermarks.get_new_comments(task_id=task_id, task_comments=task_comments)
+                )
+                for comment_data in new_comments:
                     comment_id = int(comment_data["gid"])
                     if comment_data["created_by"] is not None:
                         user_id = comment_data["created_by"]["gid"]
@@ -172,6 +479,66 @@ class ProjectCommentsGenerator:
                             "task_id": task_id,
                         }
 
+    def _get_tasks_in_active_sections(self, project: AsanaWebhookProject, task_ids: set[str]) -> set[str]:
+        """Return ids of tasks which are in not ignored sections of project, deleted and not accessible tasks skipped.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        ignored_sections_ids = self._get_ignored_sections_ids(project=project)
+        if not ignored_sections_ids:
+            return task_ids
+        actions = [
+            BatchAction.get(f"/tasks/{task_id}", opt_fields=list(self.TASK_MEMBERSHIPS_OPT_FIELDS))
+            for task_id in task_ids
+        ]
+        active_task_ids = set()
+        for result in self.asana_api_client.batch(actions=actions):
+            if result.status_code in (HTTPStatus.NOT_FOUND, HTTPStatus.FORBIDDEN):
+                continue
+            task_data = result.get_data()
+            for membership in task_data["memberships"]:
+                if (
+                    membership["project"]["gid"] == project.project_id
+                    and membership["section"]["gid"] not in ignored_sections_ids
+                ):
+                    active_task_ids.add(task_data["gid"])
+        return active_task_ids
+
+    def generate_from_events(
+        self,
+        project: AsanaWebhookProject,
+        events: list[dict[str, Any]],
+    ) -> Generator[dict[str, Any], None, None]:
+        """Return comments added by project events, comments in ignored sections skipped.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        comment_events = [
+            event
+            for event in events
+            if event.get("action") == "added"
+            and event["resource"].get("resource_subtype") == "comment_added"
+            and event.get("user") is not None
+            and event.get("parent") is not None
+        ]
+        logger.info("%s: project: %s, comment events: %s", self.__class__.__name__, project, len(comment_events))
+        if not comment_events:
+            return
+        task_ids = {event["parent"]["gid"] for event in comment_events}
+        active_task_ids = self._get_tasks_in_active_sections(project=project, task_ids=task_ids)
+        for event in comment_events:
+            task_id = event["parent"]["gid"]
+            if task_id in active_task_ids:
+                yield {
+                    "user_id": event["user"]["gid"],
+                    "comment_id": int(event["resource"]["gid"]),
+                    "task_id": task_id,
+                }
+
 
 class LoadAdditionalInfoForComment:
     def __init__(self, asana_api_client: AsanaApiClient, asana_comment_prettifier: AsanaCommentPrettifier):
@@ -185,8 +552,11 @@ class LoadAdditionalInfoForComment:
              AsanaApiClientError: if cant get some data from asana
 
         """
-        task_data = self.asana_api_client.get_task(task_id=comment.task_id)
-        comment_data = self.asana_api_client.get_comment(comment_id=comment.comment_id)
+        task_data = self.asana_api_client.get_task(task_id=comment.task_id, projection=TaskProjection.COMMENT)
+        comment_data = self.asana_api_client.get_comment(
+            comment_id=comment.comment_id,
+            projection=StoryProjection.COMMENT,
+        )
         pretty_comment_text = self.asana_comment_prettifier.prettify(comment_text=comment_data["text"])
         comment.task_url = task_data["permalink_url"]
         comment.text = pretty_comment_text
@@ -236,14 +606,11 @@ class LoadCommentsAdditionalInfo:
         """
         comments_to_update = queryset.filter(
             Q(text="") | Q(task_url=""),
-            is_deleted=False,
+            state__in=INCOMPLETE_COMMENT_STATES,
         )
-        asana_users = AtlasAsanaUser.objects.all()
-        profile_url_mention_map = get_user_profile_url_mention_map(asana_users=asana_users)
-        asana_comment_prettifier = AsanaCommentPrettifier(profile_urls_mention_map=profile_url_mention_map)
         additional_info_comment_loader = LoadAdditionalInfoForComment(
             asana_api_client=self.asana_api_client,
-            asana_comment_prettifier=asana_comment_prettifier,
+            asana_comment_prettifier=get_comment_prettifier(),
         )
         success_updated = 0
         errors: list[str] = []
@@ -266,7 +633,7 @@ class SenderRegistrySynchronizer:
         sender_names_register = list(SENDERS_REGISTRY)
         to_delete = set(sender_names_db) - set(sender_names_register)
         ProjectNotifySender.objects.filter(name__in=to_delete).delete()
-        logging.info("Senders to delete: %s", to_delete)
+        logger.info("Senders to delete: %s", to_delete)
         deleted = len(to_delete)
         new_created = 0
         updated = 0
@@ -287,5 +654,5 @@ class SenderRegistrySynchronizer:
             "new_created": new_created,
             "updated": updated,
         }
-        logging.info("Result: %s", result)
+        logger.info("Result: %s", result)
         return result
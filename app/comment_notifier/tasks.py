@@ -1,18 +1,24 @@
 from dataclasses import asdict
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, AsyncAsanaApiClient, get_shared_response_cache
+from asana.services import AsanaEventsSyncService
 from celery import Task, shared_task
+from common.batch_queue import BatchQueue
+from common.webhook_queue import WebhookQueue
 from django.conf import settings
 from message_sender.client import AtlasMessageSender
 
 from .models import AsanaComment, AsanaWebhookRequestData
+from .senders.coalescing import Recipient, build_digest, get_recipient_queue, send_to_recipient
 from .services import LoadCommentsAdditionalInfo, ProcessAsanaNewCommentEvent
 from .use_cases import (
     AsanaCommentNotifierUseCase,
+    AsanaCommentsBatchNotifierUseCase,
     FetchMissingProjectCommentsUseCase,
 )
 
-asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
+asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY, cache=get_shared_response_cache())
+async_asana_api_client = AsyncAsanaApiClient(api_key=settings.ASANA_API_KEY)
 message_sender = AtlasMessageSender(
     host=settings.MESSAGE_SENDER_HOST,
     api_key=settings.DOMAIN_MESSAGE_API_KEY,
@@ -28,26 +34,87 @@ def notify_new_asana_comments_tasks(self: Task, comment_id: str) -> None:  # typ
         self.retry(exc=error)
 
 
+comments_notify_queue = BatchQueue(name="comment_notifier:notify")
+# seconds, comments of burst notified by one batch
+COMMENTS_NOTIFY_COUNTDOWN = 60
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60 * 5)
+def notify_new_asana_comments_batch_task(self: Task, comment_ids: list[str] | None = None) -> dict | None:  # type: ignore[type-arg]
+    """Notify about comments queued by schedule_comments_notification or passed by ids, failed retried."""
+    if comment_ids is None:
+        comment_ids = comments_notify_queue.pop_all()
+    use_case = AsanaCommentsBatchNotifierUseCase(asana_api_client=asana_api_client, message_sender=message_sender)
+    try:
+        result = use_case.execute(comment_ids=comment_ids)
+    except Exception as error:  # noqa: BLE001
+        self.retry(exc=error, kwargs={"comment_ids": comment_ids})
+        return None
+    if result.failed_ids:
+        self.retry(kwargs={"comment_ids": result.failed_ids})
+    return asdict(result)
+
+
+def schedule_comments_notification(comment_ids: list[str]) -> None:
+    if not comment_ids:
+        return
+    if not comments_notify_queue.push(
+        items=comment_ids,
+        consumer=notify_new_asana_comments_batch_task,
+        countdown=COMMENTS_NOTIFY_COUNTDOWN,
+    ):
+        notify_new_asana_comments_batch_task.apply_async(  # type: ignore[attr-defined]
+            kwargs={"comment_ids": comment_ids},
+            countdown=COMMENTS_NOTIFY_COUNTDOWN,
+        )
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60)
+def send_coalesced_messages_task(self: Task, recipient_key: str, messages: list[str] | None = None) -> int:  # type: ignore[type-arg]
+    """Send messages buffered for recipient during coalescing window as one digest."""
+    if messages is None:
+        messages = get_recipient_queue(recipient_key=recipient_key).pop_all()
+    if not messages:
+        return 0
+    try:
+        send_to_recipient(
+            message_sender=message_sender,
+            recipient=Recipient.from_key(key=recipient_key),
+            message=build_digest(messages=messages),
+        )
+    except Exception as error:  # noqa: BLE001
+        self.retry(exc=error, kwargs={"recipient_key": recipient_key, "messages": messages})
+    return len(messages)
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=15)
 def process_asana_new_comments_task(self: Task, asana_webhook_id: int) -> dict | None:  # type: ignore[type-arg]
     try:
         asana_webhook = AsanaWebhookRequestData.objects.get(pk=asana_webhook_id)
         result = ProcessAsanaNewCommentEvent().process(asana_webhook)
-        for asana_new_comment_event in result.comments:
-            notify_new_asana_comments_tasks.apply_async(  # type: ignore[attr-defined]
-                args=[asana_new_comment_event.comment_id],
-                countdown=60,
-            )
+        schedule_comments_notification(comment_ids=[str(comment.comment_id) for comment in result.comments])
         return asdict(result)
     except Exception as error:  # noqa: BLE001
         self.retry(exc=error)
         return None
 
 
+webhook_queue = WebhookQueue(
+    name="comment_notifier",
+    model=AsanaWebhookRequestData,
+    owner_field="project",
+    process_task_name=process_asana_new_comments_task.name,  # type: ignore[attr-defined]
+)
+
+
 @shared_task(bind=True, max_retries=1, default_retry_delay=60 * 3)
 def fetch_missing_project_comments_task(self: Task, *, send_messages: bool = True) -> dict | None:  # type: ignore[type-arg]
     try:
-        use_case = FetchMissingProjectCommentsUseCase(asana_api_client=asana_api_client)
+        use_case = FetchMissingProjectCommentsUseCase(
+            asana_api_client=asana_api_client,
+            async_api_client=async_asana_api_client,
+            events_sync_service=AsanaEventsSyncService(asana_api_client=asana_api_client),
+        )
         return use_case.execute(send_messages=send_messages)
     except Exception as error:  # noqa: BLE001
         self.retry(exc=error)
@@ -0,0 +1,62 @@
+import importlib
+
+import pytest
+from django.apps import apps
+
+from comment_notifier.models import AsanaComment, CommentState
+
+
+def create_comment(comment_id: str, **kwargs: str | bool | None) -> AsanaComment:
+    return AsanaComment.objects.create(user_id="1", task_id="1", comment_id=comment_id, **kwargs)
+
+
+@pytest.mark.django_db
+class TestAsanaCommentState:
+    def test_state_on_save(self) -> None:
+        comment = create_comment(comment_id="1")
+        assert comment.state == CommentState.PENDING
+
+        comment.is_notified = True
+        comment.save()
+        assert comment.state == CommentState.NEEDS_INFO
+
+        comment.text = "text"
+        comment.task_url = "https://app.asana.com/1"
+        comment.save()
+        assert comment.state == CommentState.DONE
+
+        comment.mark_as_deleted()
+        assert AsanaComment.objects.get(pk=comment.pk).state == CommentState.DELETED
+
+    def test_state_saved_with_update_fields(self) -> None:
+        comment = create_comment(comment_id="1")
+
+        comment.is_notified = True
+        comment.save(update_fields=["is_notified"])
+
+        assert AsanaComment.objects.get(pk=comment.pk).state == CommentState.NEEDS_INFO
+
+    def test_update_with_state_of_filtered_queryset(self) -> None:
+        create_comment(comment_id="1")
+        create_comment(comment_id="2", is_deleted=True)
+
+        AsanaComment.objects.filter(is_notified=None).update_with_state(is_notified=False)
+
+        assert dict(AsanaComment.objects.values_list("comment_id", "state")) == {
+            "1": CommentState.NEEDS_INFO,
+            "2": CommentState.DELETED,
+        }
+        assert list(AsanaComment.objects.incomplete().values_list("comment_id", flat=True)) == ["1"]
+
+    def test_backfill(self) -> None:
+        migration = importlib.import_module("comment_notifier.migrations.0018_asanacomment_state")
+        create_comment(comment_id="1", is_notified=True, text="text", task_url="https://app.asana.com/1")
+        create_comment(comment_id="2", is_notified=True)
+        AsanaComment.objects.update(state=CommentState.PENDING)
+
+        migration.backfill_state(apps, None)
+
+        assert dict(AsanaComment.objects.values_list("comment_id", "state")) == {
+            "1": CommentState.DONE,
+            "2": CommentState.NEEDS_INFO,
+        }
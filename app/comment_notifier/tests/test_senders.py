@@ -0,0 +1,50 @@
+from unittest.mock import Mock
+
+import pytest
+from common.tests.fake_redis import FakeRedis
+from message_sender.client import Handlers
+
+from comment_notifier import tasks
+from comment_notifier.senders.coalescing import DIGEST_SEPARATOR, MessageCoalescer, Recipient
+
+
+def test_recipient_key() -> None:
+    for recipient in (Recipient(user_tag="buyer"), Recipient(handler=Handlers.FARM_GROUP)):
+        assert Recipient.from_key(key=recipient.key) == recipient
+
+
+class TestMessageCoalescer:
+    def test_messages_merged_per_recipient(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        redis = FakeRedis()
+        monkeypatch.setattr("common.batch_queue.get_redis", lambda: redis)
+        apply_async = Mock()
+        monkeypatch.setattr(tasks.send_coalesced_messages_task, "apply_async", apply_async)
+        message_sender = Mock()
+        monkeypatch.setattr(tasks, "message_sender", message_sender)
+        coalescer = MessageCoalescer(message_sender=message_sender, window=120)
+
+        coalescer.send(recipient=Recipient(user_tag="buyer"), message="first")
+        coalescer.send(recipient=Recipient(user_tag="buyer"), message="second")
+        coalescer.send(recipient=Recipient(handler=Handlers.FARM_GROUP), message="farm")
+
+        message_sender.send_message_to_user.assert_not_called()
+        # consumer scheduled once per recipient
+        assert [call.kwargs for call in apply_async.call_args_list] == [
+            {"kwargs": {"recipient_key": "user:buyer"}, "countdown": 120},
+            {"kwargs": {"recipient_key": f"handler:{Handlers.FARM_GROUP.value}"}, "countdown": 120},
+        ]
+        assert tasks.send_coalesced_messages_task(recipient_key="user:buyer") == 2  # type: ignore[call-arg]
+        message_sender.send_message_to_user.assert_called_once()
+        digest = message_sender.send_message_to_user.call_args.kwargs["message"]
+        assert digest.endswith(f"first{DIGEST_SEPARATOR}second")
+        assert message_sender.send_message_to_user.call_args.kwargs["user_tag"] == "buyer"
+        assert tasks.send_coalesced_messages_task(recipient_key=f"handler:{Handlers.FARM_GROUP.value}") == 1  # type: ignore[call-arg]
+        message_sender.send_message.assert_called_once_with(handler=Handlers.FARM_GROUP, message="farm")
+
+    def test_send_at_once_without_redis(self) -> None:
+        message_sender = Mock()
+        coalescer = MessageCoalescer(message_sender=message_sender, window=120)
+
+        coalescer.send(recipient=Recipient(user_tag="buyer"), message="first")
+
+        message_sender.send_message_to_user.assert_called_once_with(user_tag="buyer", message="first")
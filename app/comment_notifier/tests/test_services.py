@@ -0,0 +1,147 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from asana.client.batch import BatchAction, BatchActionResult
+from django.utils import timezone
+
+from comment_notifier.collectors.dto import CommentDto
+from comment_notifier.models import (
+    AsanaComment,
+    AsanaWebhookProject,
+    CommentState,
+    ProjectNotifySender,
+    TaskScanWatermark,
+)
+from comment_notifier.senders.abstract import BaseCommentSender
+from comment_notifier.senders.registry import SENDERS_REGISTRY, SenderInfo
+from comment_notifier.services import AsanaCommentBatchNotifier, ProjectCommentsGenerator, TaskScanWatermarks
+
+
+class RecordSender(BaseCommentSender):
+    notified: list[str] = []  # noqa: RUF012
+
+    def notify(self, comment_dto: CommentDto) -> None:
+        if comment_dto.comment_model.comment_id == "fail":
+            msg = "send error"
+            raise RuntimeError(msg)
+        self.notified.append(comment_dto.comment_model.comment_id)
+
+
+def make_batch(actions: Sequence[BatchAction]) -> list[BatchActionResult]:
+    results = []
+    for action in actions:
+        gid = action.relative_path.rsplit("/", 1)[-1]
+        if gid == "deleted":
+            results.append(BatchActionResult(action=action, status_code=HTTPStatus.NOT_FOUND, body=None))
+            continue
+        data: dict[str, Any] = {"gid": gid, "text": f"text {gid}", "permalink_url": f"https://app.asana.com/{gid}"}
+        results.append(BatchActionResult(action=action, status_code=HTTPStatus.OK, body={"data": data}))
+    return results
+
+
+@pytest.mark.django_db
+def test_batch_notifier(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(SENDERS_REGISTRY, "record", SenderInfo(name="record", description="", sender=RecordSender))
+    monkeypatch.setattr(RecordSender, "notified", [])
+    project = AsanaWebhookProject.objects.create(
+        name="project",
+        project_id="1",
+        message_sender=ProjectNotifySender.objects.create(name="record", description=""),
+    )
+    comments = [
+        AsanaComment.objects.create(user_id="1", task_id=task_id, comment_id=comment_id, project=project)
+        for task_id, comment_id in (("t1", "c1"), ("t1", "c2"), ("t2", "deleted"), ("t2", "fail"))
+    ]
+    asana_api_client = Mock()
+    asana_api_client.batch.side_effect = make_batch
+    notifier = AsanaCommentBatchNotifier(asana_api_client=asana_api_client, message_sender=Mock())
+
+    result = notifier.process(comment_models=comments)
+
+    assert result.notified_ids == ["c1", "c2"]
+    assert result.deleted_ids == ["deleted"]
+    assert result.failed_ids == ["fail"]
+    assert RecordSender.notified == ["c1", "c2"]
+    # every task fetched once by one batch
+    actions = asana_api_client.batch.call_args.args[0]
+    assert [action.relative_path for action in actions if action.relative_path.startswith("/tasks/")] == [
+        "/tasks/t1",
+        "/tasks/t2",
+    ]
+    comment = AsanaComment.objects.get(comment_id="c1")
+    assert comment.is_notified
+    assert comment.task_url == "https://app.asana.com/t1"
+    assert comment.state == CommentState.DONE
+    assert AsanaComment.objects.get(comment_id="deleted").state == CommentState.DELETED
+    assert AsanaComment.objects.get(comment_id="fail").state == CommentState.PENDING
+
+
+def make_comment(gid: str) -> dict[str, Any]:
+    return {"gid": gid, "created_by": {"gid": "user"}, "resource_subtype": "comment_added"}
+
+
+@pytest.mark.django_db
+def test_generate_skips_not_modified_tasks() -> None:
+    project = AsanaWebhookProject.objects.create(name="project", project_id="1")
+    tasks = {"t1": "2026-01-01T00:00:00.000Z", "t2": "2026-01-01T00:00:00.000Z"}
+    tasks_comments = {"t1": [make_comment(gid="1")], "t2": [make_comment(gid="2")]}
+    asana_api_client = Mock()
+    asana_api_client.get_project_sections.return_value = [{"gid": "section", "name": "section"}]
+    asana_api_client.iter_section_tasks.side_effect = lambda **_: iter(
+        [{"gid": task_id, "name": task_id, "modified_at": modified_at} for task_id, modified_at in tasks.items()],
+    )
+    asana_api_client.get_comments_from_task.side_effect = lambda task_id, **_: tasks_comments[task_id]
+    generator = ProjectCommentsGenerator(asana_api_client=asana_api_client)
+
+    def scan() -> list[int]:
+        watermarks = TaskScanWatermarks()
+        comment_ids = [comment_data["comment_id"] for comment_data in generator.generate(project, watermarks)]
+        watermarks.commit()
+        return comment_ids
+
+    assert scan() == [1, 2]
+    assert TaskScanWatermark.objects.get(task_id="t2").last_story_id == "2"
+    asana_api_client.get_comments_from_task.reset_mock()
+    tasks["t2"] = "2026-01-02T00:00:00.000Z"
+    tasks_comments["t2"].append(make_comment(gid="3"))
+
+    assert scan() == [3]
+    asana_api_client.get_comments_from_task.assert_called_once()
+    assert asana_api_client.get_comments_from_task.call_args.kwargs["task_id"] == "t2"
+    assert TaskScanWatermark.objects.get(task_id="t2").last_story_id == "3"
+
+    # comment added without modified_at change found after watermark outdated
+    tasks_comments["t1"].append(make_comment(gid="4"))
+    assert scan() == []
+    TaskScanWatermark.objects.filter(task_id="t1").update(
+        updated=timezone.now() - TaskScanWatermarks.RESCAN_AFTER - timedelta(minutes=1),
+    )
+    assert scan() == [4]
+    assert TaskScanWatermark.objects.get(task_id="t1").updated > timezone.now() - timedelta(minutes=1)
+
+
+# asyncio event loop needs local socketpair
+@pytest.mark.usefixtures("socket_enabled")
+def test_async_sections_tasks_loaded_by_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ProjectCommentsGenerator, "SECTIONS_CHUNK_SIZE", 2)
+    async_api_client = MagicMock()
+    async_api_client.__aenter__.return_value = async_api_client
+    async_api_client.get_section_tasks = AsyncMock(side_effect=lambda section_id, **_: [{"gid": f"{section_id}-task"}])
+    generator = ProjectCommentsGenerator(asana_api_client=Mock(), async_api_client=async_api_client)
+    sections = [{"gid": gid} for gid in ("1", "2", "3")]
+
+    sections_tasks = generator._iter_sections_tasks(sections=sections)
+    section_data, section_tasks = next(sections_tasks)
+
+    assert section_data == {"gid": "1"}
+    assert list(section_tasks) == [{"gid": "1-task"}]
+    assert async_api_client.get_section_tasks.await_count == 2
+    assert [(section["gid"], list(tasks)) for section, tasks in sections_tasks] == [
+        ("2", [{"gid": "2-task"}]),
+        ("3", [{"gid": "3-task"}]),
+    ]
+    assert async_api_client.get_section_tasks.await_count == 3
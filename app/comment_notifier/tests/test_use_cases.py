@@ -0,0 +1,100 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from asana.client.exception import AsanaApiClientError
+from asana.constants import AsanaResourceType
+from asana.services import AsanaEventsSyncService, EventsDelta
+from django.db import IntegrityError
+
+from comment_notifier import tasks
+from comment_notifier.models import AsanaComment, AsanaWebhookProject
+from comment_notifier.services import ProjectCommentsGenerator, TaskScanWatermarks
+from comment_notifier.use_cases import FetchMissingProjectCommentsUseCase
+
+NEW_SYNC = "new"
+
+
+def generate(
+    self: ProjectCommentsGenerator,
+    project: AsanaWebhookProject,
+    watermarks: TaskScanWatermarks | None = None,
+) -> Iterator[dict[str, Any]]:
+    _, _ = self, watermarks
+    if project.name == "broken":
+        msg = "asana error"
+        raise AsanaApiClientError(msg)
+    for comment_id in (f"{project.project_id}1", f"{project.project_id}2", "exists"):
+        yield {"user_id": "1", "comment_id": comment_id, "task_id": "task"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fetch_missing_comments(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ProjectCommentsGenerator, "generate", generate)
+    monkeypatch.setattr(FetchMissingProjectCommentsUseCase, "CHUNK_SIZE", 2)
+    schedule_comments_notification = Mock()
+    monkeypatch.setattr(tasks, "schedule_comments_notification", schedule_comments_notification)
+    monkeypatch.setattr("comment_notifier.use_cases.send_log_message_task", Mock())
+    for project_id in ("1", "2"):
+        AsanaWebhookProject.objects.create(name=f"project {project_id}", project_id=project_id)
+    AsanaWebhookProject.objects.create(name="broken", project_id="3")
+    AsanaComment.objects.create(user_id="1", task_id="task", comment_id="exists")
+
+    result = FetchMissingProjectCommentsUseCase(asana_api_client=Mock()).execute()
+
+    assert set(AsanaComment.objects.values_list("comment_id", flat=True)) == {"exists", "11", "12", "21", "22"}
+    # one grouped notification of all projects
+    schedule_comments_notification.assert_called_once()
+    assert sorted(schedule_comments_notification.call_args.kwargs["comment_ids"]) == ["11", "12", "21", "22"]
+    assert result["project 1"]["created"] == 2
+    assert result["project 1"]["duration"] >= 0
+    assert result["broken"]["errors_count"] == 1
+    assert result["errors_count"] == 1
+
+
+@pytest.mark.django_db
+def test_save_missing_comments_skips_concurrently_saved(monkeypatch: pytest.MonkeyPatch) -> None:
+    project = AsanaWebhookProject.objects.create(name="project", project_id="1")
+    bulk_create = AsanaComment.objects.bulk_create
+
+    def bulk_create_after_webhook(objs: Iterable[AsanaComment], **kwargs: Any) -> list[AsanaComment]:  # noqa: ANN401
+        # comment saved by webhook after existence check
+        AsanaComment.objects.create(user_id="1", task_id="task", comment_id="2", project=project)
+        return bulk_create(objs, **kwargs)
+
+    monkeypatch.setattr(AsanaComment.objects, "bulk_create", bulk_create_after_webhook)
+    comments_data = [{"user_id": "1", "comment_id": comment_id, "task_id": "task"} for comment_id in (1, 2)]
+    use_case = FetchMissingProjectCommentsUseCase(asana_api_client=Mock())
+
+    assert use_case._save_missing_comments(project=project, comments_data=comments_data) == ["1"]
+    assert set(AsanaComment.objects.values_list("comment_id", flat=True)) == {"1", "2"}
+
+
+@pytest.mark.django_db
+def test_events_not_committed_on_save_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("comment_notifier.use_cases.send_log_message_task", Mock())
+    monkeypatch.setattr(
+        FetchMissingProjectCommentsUseCase,
+        "_save_missing_comments",
+        Mock(side_effect=IntegrityError("error")),
+    )
+    project = AsanaWebhookProject.objects.create(name="project", project_id="1")
+    events_sync_service = Mock(spec=AsanaEventsSyncService)
+    events_sync_service.fetch.return_value = EventsDelta(
+        resource_id="1",
+        resource_type=AsanaResourceType.PROJECT,
+        events=[],
+        sync_token=NEW_SYNC,
+        is_full_rescan_required=True,
+    )
+    monkeypatch.setattr(ProjectCommentsGenerator, "generate", generate)
+    use_case = FetchMissingProjectCommentsUseCase(asana_api_client=Mock(), events_sync_service=events_sync_service)
+
+    result = use_case._reconcile_project(
+        project=project,
+        project_comments_generator=ProjectCommentsGenerator(asana_api_client=Mock()),
+    )
+
+    assert result.errors_count == 1
+    events_sync_service.commit.assert_not_called()
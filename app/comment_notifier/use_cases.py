@@ -1,15 +1,31 @@
 import logging
-from dataclasses import dataclass
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, ClassVar
 
-from asana.client import AsanaApiClient
-from django.db import IntegrityError
+from asana.client import AsanaApiClient, AsyncAsanaApiClient
+from asana.client.exception import AsanaApiClientError
+from asana.constants import AsanaResourceType
+from asana.services import AsanaEventsSyncService, EventsDelta
+from django.db import IntegrityError, connections
 from message_sender.client import AtlasMessageSender
 from message_sender.tasks import send_log_message_task
 
 from .exceptions import NoSenderClassInProjectError
 from .models import AsanaComment, AsanaWebhookProject, ProjectNotifySender
-from .senders.registry import SENDERS_REGISTRY
-from .services import AsanaCommentNotifier, ProjectCommentsGenerator
+from .senders.registry import create_sender
+from .services import (
+    AsanaCommentBatchNotifier,
+    AsanaCommentNotifier,
+    CommentsBatchResult,
+    ProjectCommentsGenerator,
+    TaskScanWatermarks,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -18,7 +34,7 @@ class AsanaCommentNotifierUseCase:
     message_sender: AtlasMessageSender
 
     def execute(self, comment_id: str) -> None:
-        logging.info("AsanaCommentNotifier comment_id: %s", comment_id)
+        logger.info("AsanaCommentNotifier comment_id: %s", comment_id)
         comment_model = AsanaComment.objects.get(comment_id=comment_id)
         project: AsanaWebhookProject | None = comment_model.project
         if project is None:
@@ -30,61 +46,218 @@ class AsanaCommentNotifierUseCase:
             message = f"🛑 {self.__class__.__name__}\nSet {ProjectNotifySender.__name__} for project: {project}"
             send_log_message_task.delay(message=message)  # type: ignore[attr-defined]
             raise NoSenderClassInProjectError(message)
-        project_message_sender = SENDERS_REGISTRY[project.message_sender.name].sender
         comment_notifier = AsanaCommentNotifier(
             asana_api_client=self.asana_api_client,
             message_sender=self.message_sender,
-            comment_notifier=project_message_sender(message_sender=self.message_sender),
+            comment_notifier=create_sender(
+                name=project.message_sender.name,
+                message_sender=self.message_sender,
+                coalesce_window=project.message_sender.coalesce_window,
+            ),
         )
         comment_notifier.process(comment_model=comment_model)
 
 
+@dataclass
+class AsanaCommentsBatchNotifierUseCase:
+    asana_api_client: AsanaApiClient
+    message_sender: AtlasMessageSender
+    # comments processed by one batch notifier run, asana batch request has up to 10 actions
+    BATCH_SIZE: ClassVar[int] = 50
+
+    def execute(self, comment_ids: Sequence[str]) -> CommentsBatchResult:
+        """Notify about not processed comments, comments of batch failed by asana error returned as failed."""
+        result = CommentsBatchResult()
+        comment_models = list(
+            AsanaComment.objects.pending()
+            .filter(comment_id__in=comment_ids)
+            .select_related("project__message_sender")
+            .order_by("pk"),
+        )
+        logger.info("AsanaCommentsBatchNotifier comments: %s", len(comment_models))
+        notifier = AsanaCommentBatchNotifier(
+            asana_api_client=self.asana_api_client,
+            message_sender=self.message_sender,
+        )
+        for start in range(0, len(comment_models), self.BATCH_SIZE):
+            batch = comment_models[start : start + self.BATCH_SIZE]
+            try:
+                batch_result = notifier.process(comment_models=batch)
+            except AsanaApiClientError:
+                logger.exception("AsanaCommentsBatchNotifier batch failed")
+                result.failed_ids.extend(comment_model.comment_id for comment_model in batch)
+                continue
+            result.notified_ids.extend(batch_result.notified_ids)
+            result.deleted_ids.extend(batch_result.deleted_ids)
+            result.failed_ids.extend(batch_result.failed_ids)
+        return result
+
+
+@dataclass
+class ProjectReconcileResult:
+    project_name: str
+    created_comment_ids: list[str] = field(default_factory=list)
+    errors_count: int = 0
+    # seconds
+    duration: float = 0
+
+
 @dataclass
 class FetchMissingProjectCommentsUseCase:
     asana_api_client: AsanaApiClient
+    async_api_client: AsyncAsanaApiClient | None = None
+    # without events sync service every project fully rescanned
+    events_sync_service: AsanaEventsSyncService | None = None
+    # projects processed concurrently
+    MAX_WORKERS: ClassVar[int] = 4
+    # comments checked in db and saved by one query
+    CHUNK_SIZE: ClassVar[int] = 500
 
-    def execute(self, *, send_messages: bool = True) -> dict[str, int]:
-        from .tasks import notify_new_asana_comments_tasks
+    def _generate_project_comments(
+        self,
+        project: AsanaWebhookProject,
+        project_comments_generator: ProjectCommentsGenerator,
+        watermarks: TaskScanWatermarks,
+    ) -> tuple[Iterator[dict[str, Any]], EventsDelta | None]:
+        """Return comments from events since last sync or from rescan of tasks modified since last scan.
 
-        """
         Raises:
              AsanaApiClientError: if cant get some data from asana
+
         """
-        use_case_result = {}
-        exists_comment_ids = set(AsanaComment.objects.values_list("comment_id", flat=True))
-        projects = AsanaWebhookProject.objects.prefetch_related("ignored_sections")
+        if self.events_sync_service is None:
+            return project_comments_generator.generate(project=project, watermarks=watermarks), None
+        delta = self.events_sync_service.fetch(resource_id=project.project_id, resource_type=AsanaResourceType.PROJECT)
+        if delta.is_full_rescan_required:
+            return project_comments_generator.generate(project=project, watermarks=watermarks), delta
+        return project_comments_generator.generate_from_events(project=project, events=delta.events), delta
+
+    def _save_missing_comments(self, project: AsanaWebhookProject, comments_data: list[dict[str, Any]]) -> list[str]:
+        """Save comments not in db, return ids of saved comments.
+
+        Existence checked by unique comment_id index for chunk only, comments saved by one insert,
+        comments saved concurrently (webhook) skipped by insert and not returned.
+        """
+        comment_ids = [str(comment_data["comment_id"]) for comment_data in comments_data]
+        exists_comment_ids = set(
+            AsanaComment.objects.filter(comment_id__in=comment_ids).values_list("comment_id", flat=True),
+        )
+        missing_comments = {
+            str(comment_data["comment_id"]): AsanaComment(
+                user_id=comment_data["user_id"],
+                comment_id=str(comment_data["comment_id"]),
+                task_id=comment_data["task_id"],
+                project=project,
+            )
+            for comment_data in comments_data
+            if str(comment_data["comment_id"]) not in exists_comment_ids
+        }
+        if not missing_comments:
+            return []
+        logger.info("find new comments: %s", list(missing_comments))
+        AsanaComment.objects.bulk_create(missing_comments.values(), ignore_conflicts=True)
+        # insert with ignored conflicts not returns rows, own rows found by created time set on insert
+        saved_created = dict(
+            AsanaComment.objects.filter(comment_id__in=missing_comments).values_list("comment_id", "created"),
+        )
+        return [
+            comment_id
+            for comment_id, comment in missing_comments.items()
+            if saved_created.get(comment_id) == comment.created
+        ]
+
+    def _reconcile_project(
+        self,
+        project: AsanaWebhookProject,
+        project_comments_generator: ProjectCommentsGenerator,
+        *,
+        is_thread: bool = False,
+    ) -> ProjectReconcileResult:
+        """Save missing comments of project, errors of project isolated from other projects."""
+        started = time.monotonic()
+        result = ProjectReconcileResult(project_name=str(project))
+        watermarks = TaskScanWatermarks()
+        try:
+            project_comments, delta = self._generate_project_comments(
+                project=project,
+                project_comments_generator=project_comments_generator,
+                watermarks=watermarks,
+            )
+            while comments_chunk := list(islice(project_comments, self.CHUNK_SIZE)):
+                try:
+                    result.created_comment_ids.extend(
+                        self._save_missing_comments(project=project, comments_data=comments_chunk),
+                    )
+                except IntegrityError as error:
+                    logger.warning("IntegrityError save comments of project: %s", project)
+                    message = f"⚠️ {self.__class__.__name__}\nCant save asana comments of {project}\n{error}"
+                    send_log_message_task.delay(message=message)  # type: ignore[attr-defined]
+                    result.errors_count += 1
+            # not saved comments found again by next run
+            if result.errors_count == 0:
+                watermarks.commit()
+                if self.events_sync_service is not None and delta is not None:
+                    self.events_sync_service.commit(delta=delta)
+        # need for isolate projects, not committed project synced by next run
+        except Exception:
+            logger.exception("Cant fetch missing comments of project: %s", project)
+            result.errors_count += 1
+        finally:
+            result.duration = round(time.monotonic() - started, 3)
+            if is_thread:
+                # db connections of thread not closed by celery signals
+                connections.close_all()
+        return result
+
+    def _reconcile_projects(self, projects: list[AsanaWebhookProject]) -> list[ProjectReconcileResult]:
         project_comments_generator = ProjectCommentsGenerator(
             asana_api_client=self.asana_api_client,
+            async_api_client=self.async_api_client,
         )
-        errors_count = 0
-        missing_comments_found: list[str] = []
-        for project in projects:
-            project_comments_count = 0
-            for comment_data in project_comments_generator.generate(project=project):
-                if str(comment_data["comment_id"]) not in exists_comment_ids:
-                    logging.info("find new comment: %s", comment_data["comment_id"])
-                    try:
-                        AsanaComment.objects.create(
-                            user_id=comment_data["user_id"],
-                            comment_id=comment_data["comment_id"],
-                            task_id=comment_data["task_id"],
-                            project=project,
-                        )
-                        project_comments_count += 1
-                        if send_messages:
-                            notify_new_asana_comments_tasks.apply_async(  # type: ignore[attr-defined]
-                                args=[comment_data["comment_id"]],
-                                countdown=60,
-                            )
-                            missing_comments_found.append(comment_data["comment_id"])
-                    except IntegrityError as error:
-                        logging.warning("IntegrityError save comment: %s", comment_data)
-                        message = f"⚠️ {self.__class__.__name__}\nCant save asana comment: {comment_data}\n{error}"
-                        send_log_message_task.delay(message=message)  # type: ignore[attr-defined]
-                        errors_count += 1
-            use_case_result[str(project)] = project_comments_count
-        if missing_comments_found:
+        if len(projects) <= 1:
+            return [
+                self._reconcile_project(project=project, project_comments_generator=project_comments_generator)
+                for project in projects
+            ]
+        # asana requests of all threads limited by shared rate limiter of clients
+        with ThreadPoolExecutor(
+            max_workers=min(len(projects), self.MAX_WORKERS),
+            thread_name_prefix="fetch_missing_comments",
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda project: self._reconcile_project(
+                        project=project,
+                        project_comments_generator=project_comments_generator,
+                        is_thread=True,
+                    ),
+                    projects,
+                ),
+            )
+
+    def execute(self, *, send_messages: bool = True) -> dict[str, Any]:
+        """Save comments missed by webhooks, projects processed in parallel.
+
+        Return created comments count, duration and errors count of every project.
+        """
+        from .tasks import schedule_comments_notification
+
+        projects = list(AsanaWebhookProject.objects.prefetch_related("ignored_sections"))
+        projects_results = self._reconcile_projects(projects=projects)
+        missing_comments_found = [
+            comment_id for project_result in projects_results for comment_id in project_result.created_comment_ids
+        ]
+        if send_messages and missing_comments_found:
+            schedule_comments_notification(comment_ids=missing_comments_found)
             message = f"⚠️ Missing comments found: {missing_comments_found}"
             send_log_message_task.delay(message=message)  # type: ignore[attr-defined]
-        use_case_result["errors_count"] = errors_count
+        use_case_result: dict[str, Any] = {
+            project_result.project_name: {
+                "created": len(project_result.created_comment_ids),
+                "duration": project_result.duration,
+                "errors_count": project_result.errors_count,
+            }
+            for project_result in projects_results
+        }
+        use_case_result["errors_count"] = sum(project_result.errors_count for project_result in projects_results)
         return use_case_result
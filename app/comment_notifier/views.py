@@ -1,54 +1,31 @@
-from django.shortcuts import get_object_or_404
-from rest_framework import status
+from typing import Any
+
+from common.webhook_queue import QueuedWebhook
+from common.webhook_receiver import AsanaWebhookReceiverView, WebhookOwner
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from .models import AsanaWebhookProject, AsanaWebhookRequestData
 from .serializers import AsanaWebhookRequestDataSerializer
-from .tasks import process_asana_new_comments_task
-
-
-class AsanaWebhookView(APIView):
-    def post(self, request: Request, project_name: str, format: bool | None = None) -> Response:
-        _ = format
-        project = get_object_or_404(AsanaWebhookProject, name=project_name)
-        header_secret = request.headers.get("X-Hook-Secret")
-        if header_secret and project.secret == "":
-            return self.create_webhook_response(project=project, secret=header_secret)
-        if project.secret == "":
-            data = {
-                "success": False,
-                "message": f"Project {project.name} has no secret key!",
-            }
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
-        webhook = AsanaWebhookRequestData.objects.create(
-            headers=dict(request.headers),
-            payload=dict(request.data),
-            project=project,
-        )
-        process_asana_new_comments_task.delay(asana_webhook_id=webhook.pk)  # type: ignore[attr-defined]
-        data = {
-            "success": True,
-            "method": request.method,
-            "headers": request.headers,
-        }
-        response = Response(data=data)
-        response["X-Hook-Secret"] = project.secret
-        return response
-
-    def create_webhook_response(self, project: AsanaWebhookProject, secret: str) -> Response:
-        project.secret = secret
-        project.save()
-        data = {
-            "status": True,
-            "message": f"webhook created for project {project.name}",
-        }
-        response = Response(data=data, status=status.HTTP_201_CREATED)
-        response["X-Hook-Secret"] = project.secret
-        return response
+from .tasks import process_asana_new_comments_task, webhook_queue
+
+
+class AsanaWebhookView(AsanaWebhookReceiverView):
+    owner_model = AsanaWebhookProject
+    owner_url_kwarg = "project_name"
+
+    def handle_webhook(self, owner: WebhookOwner, headers: dict[str, str], payload: dict[str, Any]) -> None:
+        queued_webhook = QueuedWebhook(owner_id=owner.pk, headers=headers, payload=payload)
+        if not webhook_queue.push(webhook=queued_webhook):
+            # redis not available, request saved synchronously
+            webhook = AsanaWebhookRequestData.objects.create(
+                headers=headers,
+                payload=payload,
+                project_id=owner.pk,
+            )
+            process_asana_new_comments_task.delay(asana_webhook_id=webhook.pk)  # type: ignore[attr-defined]
 
 
 class AsanaWebhookRequestDataView(ModelViewSet):  # type: ignore[type-arg]
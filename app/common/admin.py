@@ -1,6 +1,11 @@
+import json
+from typing import Any
+
 from django.contrib import admin
+from django.http import HttpRequest
 
 from .models import Country
+from .webhook_archive import decompress_request_data
 
 
 @admin.register(Country)
@@ -8,3 +13,31 @@ class CountryAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = ("iso_code", "name")
     search_fields = ("name", "iso_code")
     ordering = ("name",)
+
+
+class WebhookRequestAdminMixin:
+    """Admin of webhook request log: big table, archived headers and payload.
+
+    Headers and payload of archived request cleared, so they are hidden and request can not be changed.
+    """
+
+    # without count(*) of whole table on every page
+    show_full_result_count = False
+
+    def get_fields(self, request: HttpRequest, obj: Any = None) -> list[Any] | tuple[Any, ...]:  # noqa: ANN401
+        fields = super().get_fields(request, obj)  # type: ignore[misc]
+        if obj is not None and obj.archived_data is not None:
+            return [field for field in fields if field not in ("headers", "payload")]
+        return fields
+
+    def has_change_permission(self, request: HttpRequest, obj: Any = None) -> bool:  # noqa: ANN401
+        if obj is not None and obj.archived_data is not None:
+            return False
+        return super().has_change_permission(request, obj)  # type: ignore[misc]
+
+    @admin.display(description="Archived request")
+    def archived_request_data(self, obj: Any) -> str:  # noqa: ANN401
+        if obj.archived_data is None:
+            return "-"
+        request_data = decompress_request_data(archived_data=bytes(obj.archived_data))
+        return json.dumps(request_data, ensure_ascii=False, indent=2)
@@ -0,0 +1,85 @@
+import logging
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from redis import Redis, RedisError
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class BatchQueue:
+    """Buffer of ids in redis list processed by consumer task in batches.
+
+    First push after consumer started schedules consumer with countdown, items pushed
+    during countdown processed by one consumer run.
+    """
+
+    KEY_PREFIX = "batch_queue"
+    # scheduled consumer lost (worker restart): flag expires and next push schedules new one
+    CONSUMER_SCHEDULED_TTL = 60 * 10
+    POP_SIZE = 500
+
+    def __init__(self, name: str, redis: Redis | None = None):
+        self.name = name
+        self._redis = redis
+
+    @property
+    def key(self) -> str:
+        return f"{self.KEY_PREFIX}:{self.name}"
+
+    @property
+    def consumer_scheduled_key(self) -> str:
+        return f"{self.key}:consumer_scheduled"
+
+    @property
+    def redis(self) -> Redis | None:
+        return self._redis if self._redis is not None else get_redis()
+
+    def push(
+        self,
+        items: Sequence[str],
+        consumer: Callable[..., Any],
+        countdown: int,
+        kwargs: dict[str, Any] | None = None,
+    ) -> bool:
+        """Push items and schedule consumer celery task with kwargs if not scheduled.
+
+        Return False if redis not available, caller must pass items to consumer itself.
+        """
+        redis = self.redis
+        if redis is None:
+            return False
+        if not items:
+            return True
+        try:
+            redis.rpush(self.key, *items)
+            is_consumer_needed = redis.set(
+                self.consumer_scheduled_key,
+                1,
+                nx=True,
+                ex=countdown + self.CONSUMER_SCHEDULED_TTL,
+            )
+        except RedisError:
+            logger.warning("Batch queue %s: redis error", self.name, exc_info=True)
+            return False
+        if is_consumer_needed:
+            consumer.apply_async(kwargs=kwargs or {}, countdown=countdown)  # type: ignore[attr-defined]
+        return True
+
+    def pop_all(self) -> list[str]:
+        """Return all queued items, pushes after call schedule next consumer.
+
+        Raises:
+             RedisError: if cant read queue
+
+        """
+        redis = self.redis
+        if redis is None:
+            return []
+        redis.delete(self.consumer_scheduled_key)
+        items: list[str] = []
+        while raw_items := redis.lpop(self.key, self.POP_SIZE):
+            items.extend(item.decode() if isinstance(item, bytes) else item for item in raw_items)  # type: ignore[union-attr]
+        return items
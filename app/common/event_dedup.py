@@ -0,0 +1,136 @@
+import hashlib
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection
+from django.utils import timezone
+from redis import Redis, RedisError
+
+from .models import ProcessedWebhookEvent
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def get_event_key(event: dict[str, Any]) -> str:
+    """Return idempotency key of asana webhook event.
+
+    Redelivered event has same resource, action, parent and created_at. Change field added:
+    changes of different fields of one resource can have same created_at.
+    """
+    change = event.get("change") or {}
+    parts = (
+        (event.get("resource") or {}).get("gid", ""),
+        event.get("action", ""),
+        (event.get("parent") or {}).get("gid", ""),
+        event.get("created_at", ""),
+        change.get("field", ""),
+        change.get("action", ""),
+    )
+    return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+@dataclass
+class ClaimedEvents:
+    events: list[dict[str, Any]] = field(default_factory=list)
+    keys: list[str] = field(default_factory=list)
+    duplicates_count: int = 0
+
+
+class WebhookEventDeduplicator:
+    """Drop asana webhook events already processed in scope (app and webhook owner).
+
+    Events claimed in redis (SET NX with TTL, protects from concurrent redeliveries) and in db
+    (unique scope and key, works without redis and after redis key expired). Caller releases
+    claimed events if cant process them, so redelivery or task retry processes them again.
+    """
+
+    KEY_PREFIX = "webhook_event"
+    # asana redelivers events during 24 hours
+    TTL = 60 * 60 * 24
+    DELETE_BATCH_SIZE = 1000
+
+    def __init__(self, scope: str, redis: Redis | None = None):
+        self.scope = scope
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis | None:
+        return self._redis if self._redis is not None else get_redis()
+
+    @classmethod
+    def delete_expired(cls) -> int:
+        """Delete db keys older than TTL of all scopes, redelivery of their events not expected."""
+        border = timezone.now() - timedelta(seconds=cls.TTL)
+        queryset = ProcessedWebhookEvent.objects.filter(created__lt=border).order_by("pk")
+        deleted_count = 0
+        while pks := list(queryset.values_list("pk", flat=True)[: cls.DELETE_BATCH_SIZE]):
+            ProcessedWebhookEvent.objects.filter(pk__in=pks).delete()
+            deleted_count += len(pks)
+        return deleted_count
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{self.scope}:{key}"
+
+    def _claim_in_redis(self, keys: list[str]) -> list[str]:
+        redis = self.redis
+        if redis is None or not keys:
+            return keys
+        pipeline = redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.set(self._redis_key(key=key), 1, nx=True, ex=self.TTL)
+        try:
+            is_set_results = pipeline.execute()
+        except RedisError:
+            logger.warning("Webhook events %s: redis error, deduplicated by db only", self.scope, exc_info=True)
+            return keys
+        return [key for key, is_set in zip(keys, is_set_results, strict=True) if is_set]
+
+    def _claim_in_db(self, keys: list[str]) -> list[str]:
+        """Insert keys, return only inserted by this call.
+
+        Single INSERT ON CONFLICT DO NOTHING, so of concurrent claims of same key only one gets it back.
+        """
+        if not keys:
+            return keys
+        table = connection.ops.quote_name(ProcessedWebhookEvent._meta.db_table)  # noqa: SLF001
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (scope, key, created) "
+                "SELECT %s, unnest(%s::varchar[]), now() "
+                "ON CONFLICT (scope, key) DO NOTHING RETURNING key",
+                [self.scope, keys],
+            )
+            inserted_keys = {row[0] for row in cursor.fetchall()}
+        return [key for key in keys if key in inserted_keys]
+
+    def claim(self, events: Iterable[dict[str, Any]]) -> ClaimedEvents:
+        """Return events not processed before, events marked as processed."""
+        events_by_key: dict[str, dict[str, Any]] = {}
+        events_count = 0
+        for event in events:
+            events_count += 1
+            events_by_key.setdefault(get_event_key(event=event), event)
+        new_keys = self._claim_in_db(keys=self._claim_in_redis(keys=list(events_by_key)))
+        if events_count != len(new_keys):
+            logger.info("Webhook events %s: dropped %s duplicates", self.scope, events_count - len(new_keys))
+        return ClaimedEvents(
+            events=[events_by_key[key] for key in new_keys],
+            keys=new_keys,
+            duplicates_count=events_count - len(new_keys),
+        )
+
+    def release(self, claimed: ClaimedEvents) -> None:
+        if not claimed.keys:
+            return
+        ProcessedWebhookEvent.objects.filter(scope=self.scope, key__in=claimed.keys).delete()
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            redis.delete(*(self._redis_key(key=key) for key in claimed.keys))
+        except RedisError:
+            logger.warning("Webhook events %s: redis delete error", self.scope, exc_info=True)
@@ -4,3 +4,7 @@ class AppExceptionError(Exception):
 
 class TableSenderError(AppExceptionError):
     """TableSenderError."""
+
+
+class WebhookQueueBusyError(AppExceptionError):
+    """Webhook queue consumed by other consumer."""
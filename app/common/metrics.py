@@ -0,0 +1,281 @@
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Collection, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Protocol, cast
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from celery import current_task
+from django.conf import settings
+from redis import Redis, RedisError
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_HELP = {
+    "outbound_request_duration_seconds": ("histogram", "Duration of outbound http calls."),
+    "outbound_requests_total": ("counter", "Outbound http calls."),
+    "outbound_request_errors_total": ("counter", "Outbound http calls failed with 4xx, 5xx or without response."),
+    "outbound_request_sent_bytes_total": ("counter", "Request body bytes sent by outbound http calls."),
+    "outbound_response_received_bytes_total": ("counter", "Response body bytes received by outbound http calls."),
+}
+
+_ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+ASANA_API_HOST = "app.asana.com"
+# endpoint of calls to hosts of not known apis, their paths not bounded (avatars per user)
+OTHER_HOST_ENDPOINT = "{other_host}"
+
+
+def get_api_hosts() -> frozenset[str]:
+    return frozenset({ASANA_API_HOST, settings.MESSAGE_SENDER_HOST})
+
+
+def get_endpoint_template(url: str, api_hosts: Collection[str] | None = None) -> str:
+    """Return url path with ids replaced by placeholder, so each endpoint is one series.
+
+    "https://app.asana.com/api/1.0/tasks/123/stories" -> "/api/1.0/tasks/{id}/stories"
+    "https://s3.amazonaws.com/profile_photos/1.png" -> "{other_host}"
+    """
+    parts = urlsplit(url)
+    if api_hosts is None:
+        api_hosts = get_api_hosts()
+    if parts.netloc and parts.netloc not in api_hosts:
+        return OTHER_HOST_ENDPOINT
+    path = parts.path or "/"
+    return _ID_SEGMENT_RE.sub("/{id}", path)
+
+
+def get_status_class(status_code: int | None) -> str:
+    if status_code is None:
+        return "error"
+    return f"{status_code // 100}xx"
+
+
+def get_caller() -> str:
+    """Name of running celery task, "web" outside of worker."""
+    if current_task and current_task.request.id is not None:
+        return current_task.name
+    return "web"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_series(name: str, labels: Mapping[str, str]) -> str:
+    labels_str = ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items())
+    return f"{name}{{{labels_str}}}"
+
+
+class MetricsBackend(Protocol):
+    def increment(self, values: Mapping[str, float]) -> None:
+        """Add values to series, series key formatted by format_series."""
+        ...
+
+    def collect(self) -> dict[str, float]:
+        """Return current values of all series."""
+        ...
+
+
+class LocalMetricsBackend:
+    """In-process series, seen only by process which records them."""
+
+    def __init__(self) -> None:
+        self._values: defaultdict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def increment(self, values: Mapping[str, float]) -> None:
+        with self._lock:
+            for series, value in values.items():
+                self._values[series] += value
+
+    def collect(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class RedisMetricsBackend:
+    """Series in one redis hash, aggregated across web and celery workers.
+
+    Metrics are best effort: on redis error values are dropped and redis not used for REDIS_RETRY_INTERVAL.
+    """
+
+    REDIS_RETRY_INTERVAL = 30
+
+    def __init__(self, redis: Redis, key: str = "metrics:outbound"):
+        self.redis = redis
+        self.key = key
+        self._redis_unavailable_until = 0.0
+
+    def _mark_redis_unavailable(self, error: RedisError) -> None:
+        logger.warning("Redis metrics backend unavailable: %s", error)
+        self._redis_unavailable_until = time.monotonic() + self.REDIS_RETRY_INTERVAL
+
+    def increment(self, values: Mapping[str, float]) -> None:
+        if time.monotonic() < self._redis_unavailable_until:
+            return
+        pipeline = self.redis.pipeline(transaction=False)
+        for series, value in values.items():
+            pipeline.hincrbyfloat(self.key, series, value)
+        try:
+            pipeline.execute()
+        except RedisError as error:
+            self._mark_redis_unavailable(error=error)
+
+    def collect(self) -> dict[str, float]:
+        values = cast("dict[bytes, bytes]", self.redis.hgetall(self.key))
+        return {series.decode(): float(value) for series, value in values.items()}
+
+
+@dataclass(frozen=True)
+class OutboundCall:
+    service: str
+    method: str
+    endpoint: str
+    status_code: int | None
+    duration: float
+    sent_bytes: int = 0
+    received_bytes: int = 0
+
+
+class OutboundCallsRecorder:
+    def __init__(self, backend: MetricsBackend, buckets: tuple[float, ...] = DURATION_BUCKETS):
+        self.backend = backend
+        self.buckets = buckets
+
+    def record(self, call: OutboundCall) -> None:
+        status_class = get_status_class(call.status_code)
+        labels = {
+            "service": call.service,
+            "endpoint": call.endpoint,
+            "method": call.method.upper(),
+            "status_class": status_class,
+            "caller": get_caller(),
+        }
+        values = {
+            format_series("outbound_requests_total", labels): 1,
+            format_series("outbound_request_duration_seconds_sum", labels): call.duration,
+            format_series("outbound_request_duration_seconds_count", labels): 1,
+            format_series("outbound_request_sent_bytes_total", labels): call.sent_bytes,
+            format_series("outbound_response_received_bytes_total", labels): call.received_bytes,
+        }
+        # buckets are cumulative
+        for bucket in (*self.buckets, float("inf")):
+            if call.duration <= bucket:
+                le = "+Inf" if bucket == float("inf") else str(bucket)
+                values[format_series("outbound_request_duration_seconds_bucket", {**labels, "le": le})] = 1
+        if status_class not in ("2xx", "3xx"):
+            values[format_series("outbound_request_errors_total", labels)] = 1
+        self.backend.increment(values)
+
+    def render(self) -> str:
+        """Return all series in prometheus text format."""
+        series_by_metric: defaultdict[str, list[str]] = defaultdict(list)
+        for series, value in sorted(self.backend.collect().items()):
+            name = series.split("{", 1)[0]
+            metric = name.removesuffix("_bucket").removesuffix("_sum").removesuffix("_count")
+            if metric not in METRICS_HELP:
+                metric = name
+            series_by_metric[metric].append(f"{series} {value:g}")
+        lines = []
+        for metric, metric_series in series_by_metric.items():
+            metric_type, metric_help = METRICS_HELP.get(metric, ("untyped", ""))
+            lines.append(f"# HELP {metric} {metric_help}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.extend(metric_series)
+        return "\n".join(lines) + "\n"
+
+
+class CallObservation:
+    def __init__(self) -> None:
+        self.response: requests.Response | httpx.Response | None = None
+
+    def set_response(self, response: requests.Response | httpx.Response) -> None:
+        self.response = response
+
+
+def _get_sent_bytes(response: requests.Response | httpx.Response) -> int:
+    if isinstance(response, httpx.Response):
+        return len(response.request.content)
+    request = getattr(response, "request", None)
+    body = request.body if request is not None else None
+    return len(body) if body else 0
+
+
+def _make_outbound_call(
+    service: str,
+    method: str,
+    url: str,
+    duration: float,
+    response: requests.Response | httpx.Response | None,
+) -> OutboundCall:
+    if response is None:
+        return OutboundCall(
+            service=service,
+            method=method,
+            endpoint=get_endpoint_template(url),
+            status_code=None,
+            duration=duration,
+        )
+    return OutboundCall(
+        service=service,
+        method=method,
+        endpoint=get_endpoint_template(url),
+        status_code=response.status_code,
+        duration=duration,
+        sent_bytes=_get_sent_bytes(response),
+        received_bytes=len(response.content),
+    )
+
+
+@contextmanager
+def observe_call(service: str, method: str, url: str) -> Iterator[CallObservation]:
+    """Record duration, status and size of outbound http call made inside block.
+
+    Call without response set (raised exception) recorded with status class "error".
+    """
+    observation = CallObservation()
+    started = time.perf_counter()
+    try:
+        yield observation
+    finally:
+        duration = time.perf_counter() - started
+        # metrics must never break the call itself
+        try:
+            call = _make_outbound_call(
+                service=service,
+                method=method,
+                url=url,
+                duration=duration,
+                response=observation.response,
+            )
+            get_outbound_calls_recorder().record(call)
+        except Exception:
+            logger.warning("Cant record outbound call metrics", exc_info=True)
+
+
+_outbound_calls_recorder: OutboundCallsRecorder | None = None
+_outbound_calls_recorder_lock = threading.Lock()
+
+
+def get_outbound_calls_recorder() -> OutboundCallsRecorder:
+    """Return process-wide recorder, shared through redis if enabled."""
+    global _outbound_calls_recorder  # noqa: PLW0603
+    if _outbound_calls_recorder is None:
+        with _outbound_calls_recorder_lock:
+            if _outbound_calls_recorder is None:
+                redis = get_redis()
+                backend: MetricsBackend = LocalMetricsBackend() if redis is None else RedisMetricsBackend(redis=redis)
+                _outbound_calls_recorder = OutboundCallsRecorder(backend=backend)
+    return _outbound_calls_recorder
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessedWebhookEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("scope", models.CharField(max_length=100)),
+                ("key", models.CharField(max_length=64)),
+                ("created", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("scope", "key"), name="unique_processed_webhook_event")
+                ],
+            },
+        ),
+    ]
@@ -13,3 +13,17 @@ class Country(models.Model):
     def save(self, **kwargs: Any) -> None:  # noqa: ANN401
         self.iso_code = self.iso_code.upper()
         super().save(**kwargs)
+
+
+class ProcessedWebhookEvent(models.Model):
+    """Idempotency key of processed asana webhook event."""
+
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=64)
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = (models.UniqueConstraint(fields=("scope", "key"), name="unique_processed_webhook_event"),)
+
+    def __str__(self) -> str:
+        return f"<ProcessedWebhookEvent:{self.scope}:{self.key}>"
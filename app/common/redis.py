@@ -0,0 +1,26 @@
+import threading
+
+from django.conf import settings
+from redis import Redis
+
+_redis_client: Redis | None = None
+_redis_lock = threading.Lock()
+
+
+def get_redis() -> Redis | None:
+    """Return process-wide redis client for shared state, None if redis disabled in settings.
+
+    Callers must treat redis as optional and fall back to local state on RedisError.
+    """
+    global _redis_client  # noqa: PLW0603
+    if not settings.REDIS_ENABLED:
+        return None
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                )
+    return _redis_client
@@ -4,6 +4,8 @@ from typing import Any
 import requests
 from requests.exceptions import HTTPError, RequestException
 
+from .metrics import observe_call
+
 requests_logger = logging.getLogger("requests_sender")
 requests_logger.setLevel(logging.INFO)
 file_handler = logging.FileHandler("requests.log")
@@ -23,7 +25,9 @@ class RequestsSender:
         method = kwargs.get("method", "GET")
         logging.debug("Req %s url:%s", method, url)
         try:
-            res = requests.request(**kwargs)
+            with observe_call(service="requests_sender", method=method, url=url or "") as call:
+                res = requests.request(**kwargs)
+                call.set_response(res)
             res.raise_for_status()
         except HTTPError as error:
             requests_logger.error(
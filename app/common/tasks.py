@@ -0,0 +1,25 @@
+import logging
+from dataclasses import asdict
+
+from celery import shared_task
+from constance import config
+
+from .event_dedup import WebhookEventDeduplicator
+from .webhook_archive import archive_webhook_requests
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def archive_webhook_requests_task() -> dict[str, dict[str, int]]:
+    """Archive old webhook requests and delete expired requests and event keys, scheduled by celery beat."""
+    results = archive_webhook_requests(
+        archive_after_days=config.ASANA_WEBHOOK_ARCHIVE_AFTER_DAYS,
+        retention_days=config.ASANA_WEBHOOK_RETENTION_DAYS,
+    )
+    deleted_events_count = WebhookEventDeduplicator.delete_expired()
+    logger.info("Processed webhook events: deleted %s expired", deleted_events_count)
+    return {
+        **{label: asdict(result) for label, result in results.items()},
+        "common.ProcessedWebhookEvent": {"archived_count": 0, "deleted_count": deleted_events_count},
+    }
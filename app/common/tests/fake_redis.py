@@ -0,0 +1,72 @@
+from typing import Any
+
+
+class FakeRedis:
+    """Lists and keys of redis used by webhook queue and events deduplicator."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[bytes]] = {}
+        self.keys: dict[str, Any] = {}
+
+    def rpush(self, key: str, *values: str) -> int:
+        self.lists.setdefault(key, []).extend(value.encode() for value in values)
+        return len(self.lists[key])
+
+    def lpush(self, key: str, *values: str | bytes) -> int:
+        for value in values:
+            self.lists.setdefault(key, []).insert(0, value if isinstance(value, bytes) else value.encode())
+        return len(self.lists[key])
+
+    def lpop(self, key: str, count: int) -> list[bytes] | None:
+        items = self.lists.get(key, [])
+        popped, self.lists[key] = items[:count], items[count:]
+        return popped or None
+
+    def llen(self, key: str) -> int:
+        return len(self.lists.get(key, []))
+
+    def lrange(self, key: str, start: int, end: int) -> list[bytes]:
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start : end + 1]
+
+    def lmove(self, source: str, destination: str, src: str = "LEFT", dest: str = "RIGHT") -> bytes | None:
+        items = self.lists.get(source)
+        if not items:
+            return None
+        item = items.pop(0 if src == "LEFT" else -1)
+        destination_items = self.lists.setdefault(destination, [])
+        destination_items.insert(0 if dest == "LEFT" else len(destination_items), item)
+        return item
+
+    def expire(self, key: str, seconds: int) -> bool:
+        _ = seconds
+        return key in self.keys
+
+    def set(self, key: str, value: Any, *, nx: bool = False, ex: int | None = None) -> bool | None:  # noqa: ANN401
+        _ = ex
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.keys.pop(key, None) is not None or self.lists.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, *, transaction: bool = True) -> "FakePipeline":
+        _ = transaction
+        return FakePipeline(redis=self)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def set(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self.commands.append(("set", args, kwargs))
+
+    def lmove(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self.commands.append(("lmove", args, kwargs))
+
+    def execute(self) -> list[Any]:
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
@@ -0,0 +1,29 @@
+from unittest.mock import Mock
+
+from common.batch_queue import BatchQueue
+
+from .fake_redis import FakeRedis
+
+
+class TestBatchQueue:
+    def test_consumer_scheduled_once_per_window(self) -> None:
+        queue = BatchQueue(name="test", redis=FakeRedis())  # type: ignore[arg-type]
+        consumer = Mock()
+
+        assert queue.push(items=["1", "2"], consumer=consumer, countdown=60)
+        assert queue.push(items=["3"], consumer=consumer, countdown=60)
+
+        consumer.apply_async.assert_called_once_with(kwargs={}, countdown=60)
+        assert queue.pop_all() == ["1", "2", "3"]
+        assert queue.pop_all() == []
+        # consumer started, next push schedules new one
+        assert queue.push(items=["4"], consumer=consumer, countdown=60)
+        assert consumer.apply_async.call_count == 2
+
+    def test_push_without_redis(self) -> None:
+        queue = BatchQueue(name="test")
+        consumer = Mock()
+
+        assert not queue.push(items=["1"], consumer=consumer, countdown=60)
+        consumer.apply_async.assert_not_called()
+        assert queue.pop_all() == []
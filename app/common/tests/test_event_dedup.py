@@ -0,0 +1,150 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, ClassVar
+
+import pytest
+from asana.constants import AsanaResourceType
+from asana.models import AsanaWebhook, AsanaWebhookRequestData, ProcessingStatus, WebhookHandler
+from asana.webhook_actions.abstract import BaseWebhookAction, WebhookActionResult
+from asana.webhook_actions.dispatcher import WebhookDispatcher
+from asana.webhook_actions.registry import WEBHOOK_ACTION_REGISTRY, WebhookActionInfo
+from django.db import connection
+from django.utils import timezone
+
+from common.event_dedup import WebhookEventDeduplicator, get_event_key
+from common.models import ProcessedWebhookEvent
+
+from .fake_redis import FakeRedis
+
+
+def make_event(gid: str, created_at: str = "2026-01-01T00:00:00.000Z") -> dict[str, Any]:
+    return {
+        "action": "added",
+        "resource": {"gid": gid, "resource_type": "story"},
+        "parent": {"gid": "task", "resource_type": "task"},
+        "created_at": created_at,
+    }
+
+
+def test_event_key() -> None:
+    assert get_event_key(event=make_event(gid="1")) == get_event_key(event=make_event(gid="1"))
+    assert get_event_key(event=make_event(gid="1")) != get_event_key(event=make_event(gid="2"))
+    assert get_event_key(event=make_event(gid="1")) != get_event_key(
+        event=make_event(gid="1", created_at="2026-01-01T00:00:01.000Z"),
+    )
+
+
+@pytest.mark.django_db
+class TestWebhookEventDeduplicator:
+    def test_claim_by_db(self) -> None:
+        deduplicator = WebhookEventDeduplicator(scope="test")
+
+        first = deduplicator.claim(events=[make_event(gid="1"), make_event(gid="1"), make_event(gid="2")])
+        second = deduplicator.claim(events=[make_event(gid="2"), make_event(gid="3")])
+
+        assert [event["resource"]["gid"] for event in first.events] == ["1", "2"]
+        assert first.duplicates_count == 1
+        assert [event["resource"]["gid"] for event in second.events] == ["3"]
+        assert second.duplicates_count == 1
+        # other scope not affected
+        assert len(WebhookEventDeduplicator(scope="other").claim(events=[make_event(gid="1")]).events) == 1
+
+    def test_claim_by_redis(self) -> None:
+        redis = FakeRedis()
+        deduplicator = WebhookEventDeduplicator(scope="test", redis=redis)  # type: ignore[arg-type]
+
+        deduplicator.claim(events=[make_event(gid="1")])
+        # claimed in redis, db not checked
+        ProcessedWebhookEvent.objects.all().delete()
+        claimed = deduplicator.claim(events=[make_event(gid="1")])
+
+        assert claimed.events == []
+        assert claimed.duplicates_count == 1
+
+    def test_release(self) -> None:
+        redis = FakeRedis()
+        deduplicator = WebhookEventDeduplicator(scope="test", redis=redis)  # type: ignore[arg-type]
+        claimed = deduplicator.claim(events=[make_event(gid="1")])
+
+        deduplicator.release(claimed=claimed)
+
+        assert redis.keys == {}
+        assert not ProcessedWebhookEvent.objects.exists()
+        assert len(deduplicator.claim(events=[make_event(gid="1")]).events) == 1
+
+    def test_delete_expired(self) -> None:
+        WebhookEventDeduplicator(scope="test").claim(events=[make_event(gid="1"), make_event(gid="2")])
+        ProcessedWebhookEvent.objects.filter(key=get_event_key(event=make_event(gid="1"))).update(
+            created=timezone.now() - timedelta(seconds=WebhookEventDeduplicator.TTL + 1),
+        )
+
+        assert WebhookEventDeduplicator.delete_expired() == 1
+        assert list(ProcessedWebhookEvent.objects.values_list("key", flat=True)) == [
+            get_event_key(event=make_event(gid="2")),
+        ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_claims_get_each_event_once() -> None:
+    events = [make_event(gid=str(gid)) for gid in range(50)]
+    workers_count = 4
+    barrier = threading.Barrier(workers_count)
+
+    def claim() -> list[str]:
+        try:
+            barrier.wait()
+            return WebhookEventDeduplicator(scope="test").claim(events=events).keys
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers_count) as executor:
+        claimed_keys = [key for keys in executor.map(lambda _: claim(), range(workers_count)) for key in keys]
+
+    assert sorted(claimed_keys) == sorted(get_event_key(event=event) for event in events)
+
+
+class CountEventsHandler(BaseWebhookAction):
+    events_counts: ClassVar[list[int]] = []
+
+    def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
+        self.events_counts.append(len(webhook_data.payload["events"]))
+        return WebhookActionResult(is_target_event=True, is_success=True)
+
+
+@pytest.mark.django_db
+def test_dispatcher_drops_duplicate_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(
+        WEBHOOK_ACTION_REGISTRY,
+        "count_events",
+        WebhookActionInfo(name="count_events", description="", webhook_handler_class=CountEventsHandler),
+    )
+    monkeypatch.setattr(CountEventsHandler, "events_counts", [])
+    webhook = AsanaWebhook.objects.create(name="x", resource_id="1", resource_type=AsanaResourceType.PROJECT)
+    webhook.handlers.add(WebhookHandler.objects.create(name="count_events"))
+    dispatcher = WebhookDispatcher()
+
+    first = AsanaWebhookRequestData.objects.create(
+        payload={"events": [make_event(gid="1")]},
+        headers={},
+        webhook=webhook,
+    )
+    redelivered = AsanaWebhookRequestData.objects.create(
+        payload={"events": [make_event(gid="1"), make_event(gid="2")]},
+        headers={},
+        webhook=webhook,
+    )
+    duplicate = AsanaWebhookRequestData.objects.create(
+        payload={"events": [make_event(gid="2")]},
+        headers={},
+        webhook=webhook,
+    )
+    for webhook_data in (first, redelivered, duplicate):
+        dispatcher.dispatch(webhook_data=webhook_data)
+
+    assert CountEventsHandler.events_counts == [1, 1]
+    duplicate.refresh_from_db()
+    assert duplicate.status == ProcessingStatus.DUPLICATE
+    redelivered.refresh_from_db()
+    assert len(redelivered.payload["events"]) == 2
+    assert redelivered.additional_data["duplicate_events_count"] == 1
@@ -0,0 +1,87 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+
+from common.metrics import (
+    LocalMetricsBackend,
+    OutboundCall,
+    OutboundCallsRecorder,
+    get_endpoint_template,
+    observe_call,
+)
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("tasks/123/stories", "tasks/{id}/stories"),
+        ("https://app.asana.com/api/1.0/sections/1/tasks", "/api/1.0/sections/{id}/tasks"),
+        ("https://host/api/alert/custom?x=1", "/api/alert/custom"),
+        ("https://s3.amazonaws.com/profile_photos/123.abc_128x128.png", "{other_host}"),
+    ],
+)
+def test_get_endpoint_template(url: str, expected: str) -> None:
+    assert get_endpoint_template(url, api_hosts={"app.asana.com", "host"}) == expected
+
+
+class TestOutboundCallsRecorder:
+    def test_render_histogram_and_counters(self) -> None:
+        recorder = OutboundCallsRecorder(backend=LocalMetricsBackend(), buckets=(0.1, 1.0))
+        for duration, status_code in ((0.05, 200), (0.5, 200), (2, 500)):
+            recorder.record(
+                OutboundCall(
+                    service="asana",
+                    method="get",
+                    endpoint="tasks/{id}",
+                    status_code=status_code,
+                    duration=duration,
+                    received_bytes=10,
+                ),
+            )
+        text = recorder.render()
+        labels = 'service="asana",endpoint="tasks/{id}",method="GET",status_class="2xx",caller="web"'
+        assert "# TYPE outbound_request_duration_seconds histogram" in text
+        assert f'outbound_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'outbound_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        assert f'outbound_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"outbound_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f"outbound_response_received_bytes_total{{{labels}}} 20" in text
+        assert f"outbound_request_errors_total{{{labels}}}" not in text
+        assert "outbound_request_errors_total{" in text
+        assert 'status_class="5xx"' in text
+
+    def test_observe_call_without_response(self) -> None:
+        recorder = Mock(spec=OutboundCallsRecorder)
+        with (
+            patch("common.metrics.get_outbound_calls_recorder", return_value=recorder),
+            pytest.raises(ConnectionError),
+            observe_call(service="asana", method="GET", url="tasks/1"),
+        ):
+            raise ConnectionError
+        call = recorder.record.call_args.args[0]
+        assert call.status_code is None
+        assert call.endpoint == "tasks/{id}"
+
+
+class TestMetricsView:
+    @pytest.fixture(autouse=True)
+    def metrics_token(self, settings: SettingsWrapper) -> None:
+        settings.METRICS_TOKEN = "secret"  # noqa: S105
+
+    def test_metrics(self, client: Client) -> None:
+        response = client.get(reverse("common:metrics"), headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+
+    def test_token_required(self, client: Client) -> None:
+        assert client.get(reverse("common:metrics")).status_code == 401
+        response = client.get(reverse("common:metrics"), headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == 401
+
+    def test_closed_without_token(self, client: Client, settings: SettingsWrapper) -> None:
+        settings.METRICS_TOKEN = ""
+        assert client.get(reverse("common:metrics")).status_code == 401
+        assert client.get(reverse("common:metrics"), headers={"Authorization": "Bearer "}).status_code == 401
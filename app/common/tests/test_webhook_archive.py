@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from asana.constants import AsanaResourceType
+from asana.models import AsanaWebhook, AsanaWebhookRequestData
+from django.db.models import Q
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from vga_lands.models import AsanaProject, CompletedTask
+from vga_lands.models import AsanaWebhookRequestData as VgaWebhookRequestData
+
+from common.tasks import archive_webhook_requests_task
+from common.webhook_archive import WEBHOOK_REQUEST_MODELS, WebhookRequestArchiver, decompress_request_data
+
+
+def make_request_data(webhook: AsanaWebhook, days_ago: int) -> AsanaWebhookRequestData:
+    request_data = AsanaWebhookRequestData.objects.create(
+        webhook=webhook,
+        headers={"X-Hook-Signature": "sign"},
+        payload={"events": [{"action": "added"}]},
+    )
+    # created is auto_now_add
+    AsanaWebhookRequestData.objects.filter(pk=request_data.pk).update(
+        created=timezone.now() - timedelta(days=days_ago),
+    )
+    return request_data
+
+
+@pytest.mark.django_db
+class TestWebhookRequestArchiver:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        self.webhook = AsanaWebhook.objects.create(name="x", resource_id="1", resource_type=AsanaResourceType.PROJECT)
+
+    def test_archive_and_delete(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(WebhookRequestArchiver, "BATCH_SIZE", 2)
+        new = make_request_data(webhook=self.webhook, days_ago=1)
+        old = [make_request_data(webhook=self.webhook, days_ago=40) for _ in range(3)]
+        expired = make_request_data(webhook=self.webhook, days_ago=400)
+        archiver = WebhookRequestArchiver(model=AsanaWebhookRequestData, archive_after_days=30, retention_days=365)
+
+        result = archiver.run()
+
+        assert result.archived_count == len(old)
+        assert result.deleted_count == 1
+        assert not AsanaWebhookRequestData.objects.filter(pk=expired.pk).exists()
+        new.refresh_from_db()
+        assert new.archived_data is None
+        assert new.payload == {"events": [{"action": "added"}]}
+        for request_data in old:
+            request_data.refresh_from_db()
+            assert request_data.payload == {}
+            assert request_data.headers == {}
+            assert request_data.archived_data is not None
+            assert decompress_request_data(archived_data=bytes(request_data.archived_data)) == {
+                "headers": {"X-Hook-Signature": "sign"},
+                "payload": {"events": [{"action": "added"}]},
+            }
+        # archived not archived again
+        assert archiver.run().archived_count == 0
+
+    def test_keep_forever(self) -> None:
+        make_request_data(webhook=self.webhook, days_ago=400)
+        archiver = WebhookRequestArchiver(model=AsanaWebhookRequestData, archive_after_days=30, retention_days=0)
+
+        result = archiver.run()
+
+        assert result.deleted_count == 0
+        assert result.archived_count == 1
+
+    def test_delete_filter(self) -> None:
+        project = AsanaProject.objects.create(name="p", complete_section_id="1", table_url="https://example.com")
+        referenced, not_referenced = (
+            VgaWebhookRequestData.objects.create(project=project, headers={}, payload={}) for _ in range(2)
+        )
+        CompletedTask.objects.create(project=project, webhook=referenced, event_data={}, task_id="1")
+        VgaWebhookRequestData.objects.update(created=timezone.now() - timedelta(days=400))
+        archiver = WebhookRequestArchiver(
+            model=VgaWebhookRequestData,
+            archive_after_days=30,
+            retention_days=365,
+            delete_filter=Q(completedtask__isnull=True),
+        )
+
+        result = archiver.run()
+
+        assert result.deleted_count == 1
+        assert list(VgaWebhookRequestData.objects.values_list("pk", flat=True)) == [referenced.pk]
+        assert not VgaWebhookRequestData.objects.filter(pk=not_referenced.pk).exists()
+
+
+@pytest.mark.django_db
+def test_archive_task_all_models() -> None:
+    webhook = AsanaWebhook.objects.create(name="x", resource_id="1", resource_type=AsanaResourceType.PROJECT)
+    make_request_data(webhook=webhook, days_ago=40)
+
+    result = archive_webhook_requests_task()
+
+    assert set(result) == {*WEBHOOK_REQUEST_MODELS, "common.ProcessedWebhookEvent"}
+    assert result["asana.AsanaWebhookRequestData"] == {"archived_count": 1, "deleted_count": 0}
+    assert result["vga_lands.AsanaWebhookRequestData"] == {"archived_count": 0, "deleted_count": 0}
+
+
+@pytest.mark.django_db
+def test_admin_archived_request_read_only(admin_client: Client) -> None:
+    webhook = AsanaWebhook.objects.create(name="x", resource_id="1", resource_type=AsanaResourceType.PROJECT)
+    request_data = make_request_data(webhook=webhook, days_ago=40)
+    url = reverse("admin:asana_asanawebhookrequestdata_change", args=(request_data.pk,))
+
+    def get_fields() -> list[str]:
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        return [field for _, options in response.context["adminform"].fieldsets for field in options["fields"]]
+
+    assert "payload" in get_fields()
+
+    WebhookRequestArchiver(model=AsanaWebhookRequestData, archive_after_days=30, retention_days=0).run()
+
+    assert "payload" not in get_fields()
+    assert "archived_request_data" in get_fields()
+    assert admin_client.post(url, data={}).status_code == 403
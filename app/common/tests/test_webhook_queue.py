@@ -0,0 +1,174 @@
+# ruff: noqa: S106
+import hashlib
+import hmac
+from collections.abc import Iterator
+from http import HTTPStatus
+from unittest.mock import Mock, patch
+
+import pytest
+from asana.constants import AsanaResourceType
+from asana.models import AsanaWebhook, AsanaWebhookRequestData
+from django.test import Client
+from django.urls import reverse
+from redis import RedisError
+
+from common.exception import WebhookQueueBusyError
+from common.webhook_queue import QueuedWebhook, WebhookQueue
+
+from .fake_redis import FakeRedis
+
+PROCESS_TASK_NAME = "asana.tasks.process_asana_webhook_task"
+
+
+def make_webhook(owner_id: int, gid: str) -> QueuedWebhook:
+    return QueuedWebhook(owner_id=owner_id, headers={"X-Hook-Signature": "sign"}, payload={"events": [{"gid": gid}]})
+
+
+def make_queue(redis: FakeRedis | None = None) -> WebhookQueue:
+    return WebhookQueue(
+        name="test",
+        model=AsanaWebhookRequestData,
+        owner_field="webhook",
+        process_task_name=PROCESS_TASK_NAME,
+        redis=redis,  # type: ignore[arg-type]
+    )
+
+
+def get_dispatched_pks(mock_group: Mock) -> list[int]:
+    return [task_signature.args[0] for call in mock_group.call_args_list for task_signature in call.args[0]]
+
+
+@pytest.fixture
+def mock_consumer() -> Iterator[Mock]:
+    with patch("common.webhook_queue.ingest_webhooks_task") as consumer:
+        yield consumer
+
+
+@pytest.fixture
+def mock_group() -> Iterator[Mock]:
+    with patch("common.webhook_queue.group") as mock:
+        yield mock
+
+
+@pytest.mark.django_db
+class TestWebhookQueue:
+    @pytest.fixture(autouse=True)
+    def setup(self, mock_consumer: Mock, mock_group: Mock) -> None:
+        self.consumer = mock_consumer
+        self.group = mock_group
+        self.redis = FakeRedis()
+        self.queue = make_queue(redis=self.redis)
+        self.webhook = AsanaWebhook.objects.create(
+            name="name",
+            resource_id="1",
+            resource_type=AsanaResourceType.PROJECT,
+        )
+
+    def push(self, *gids: str) -> None:
+        for gid in gids:
+            assert self.queue.push(webhook=make_webhook(owner_id=self.webhook.pk, gid=gid))
+
+    def test_consumer_scheduled_once_per_burst(self) -> None:
+        self.push("1", "2")
+        self.consumer.apply_async.assert_called_once_with(
+            kwargs={
+                "name": "test",
+                "model_label": "asana.AsanaWebhookRequestData",
+                "owner_field": "webhook",
+                "process_task_name": PROCESS_TASK_NAME,
+            },
+            countdown=WebhookQueue.CONSUMER_COUNTDOWN,
+        )
+
+    def test_push_queued_when_flag_not_set(self) -> None:
+        with patch.object(self.redis, "set", side_effect=RedisError("error")):
+            self.push("1")
+        assert len(self.redis.lists[self.queue.key]) == 1
+        self.consumer.apply_async.assert_called_once()
+
+    def test_push_without_redis(self) -> None:
+        assert not make_queue().push(webhook=make_webhook(owner_id=self.webhook.pk, gid="1"))
+        self.consumer.apply_async.assert_not_called()
+
+    def test_consume_bulk_insert(self) -> None:
+        self.queue.BATCH_SIZE = 2
+        self.push("1", "2", "3")
+
+        saved_count = self.queue.consume()
+
+        assert saved_count == 3
+        webhooks_data = AsanaWebhookRequestData.objects.order_by("pk")
+        assert [webhook_data.payload["events"][0]["gid"] for webhook_data in webhooks_data] == ["1", "2", "3"]
+        assert all(webhook_data.is_dispatched for webhook_data in webhooks_data)
+        assert self.group.call_count == 2
+        assert get_dispatched_pks(mock_group=self.group) == [webhook_data.pk for webhook_data in webhooks_data]
+        assert not self.redis.lists.get(self.queue.processing_key)
+        assert self.queue.consumer_lock_key not in self.redis.keys
+        # next push after consume schedules new consumer
+        self.push("4")
+        assert self.consumer.apply_async.call_count == 2
+
+    def test_batch_saved_by_next_consumer_on_error(self) -> None:
+        self.push("1")
+        with (
+            patch.object(WebhookQueue, "_build", side_effect=ValueError("broken")),
+            pytest.raises(ValueError, match="broken"),
+        ):
+            self.queue.consume()
+        assert len(self.redis.lists[self.queue.processing_key]) == 1
+        assert self.queue.consumer_lock_key not in self.redis.keys
+        self.push("2")
+
+        assert self.queue.consume() == 2
+
+        payloads = AsanaWebhookRequestData.objects.order_by("pk").values_list("payload", flat=True)
+        assert [payload["events"][0]["gid"] for payload in payloads] == ["1", "2"]
+
+    def test_saved_requests_dispatched_by_next_consumer(self) -> None:
+        self.push("1")
+        self.group.return_value.apply_async.side_effect = OSError("broker")
+        with pytest.raises(OSError, match="broker"):
+            self.queue.consume()
+        webhook_data = AsanaWebhookRequestData.objects.get()
+        assert not webhook_data.is_dispatched
+        assert not self.redis.lists.get(self.queue.processing_key)
+        self.group.reset_mock()
+        self.group.return_value.apply_async.side_effect = None
+
+        assert self.queue.consume() == 0
+
+        assert get_dispatched_pks(mock_group=self.group) == [webhook_data.pk]
+        webhook_data.refresh_from_db()
+        assert webhook_data.is_dispatched
+
+    def test_one_consumer_at_time(self) -> None:
+        self.push("1")
+        self.redis.set(self.queue.consumer_lock_key, 1)
+
+        with pytest.raises(WebhookQueueBusyError):
+            self.queue.consume()
+
+        assert not AsanaWebhookRequestData.objects.exists()
+        assert len(self.redis.lists[self.queue.key]) == 1
+
+
+@pytest.mark.django_db
+def test_asana_webhook_view_queues_request(client: Client, mock_consumer: Mock) -> None:
+    AsanaWebhook.objects.create(
+        name="name",
+        resource_id="1",
+        resource_type=AsanaResourceType.PROJECT,
+        secret="secret",
+    )
+    redis = FakeRedis()
+    with patch("asana.views.webhook_queue", make_queue(redis=redis)):
+        response = client.post(
+            reverse("asana:webhook", kwargs={"webhook_name": "name"}),
+            data={"events": []},
+            content_type="application/json",
+            headers={"X-Hook-Signature": hmac.new(b"secret", b'{"events": []}', hashlib.sha256).hexdigest()},
+        )
+    assert response.status_code == HTTPStatus.OK
+    assert not AsanaWebhookRequestData.objects.exists()
+    assert len(redis.lists["webhooks:test"]) == 1
+    mock_consumer.apply_async.assert_called_once()
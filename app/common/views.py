@@ -0,0 +1,23 @@
+import logging
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+from redis import RedisError
+
+from .metrics import get_outbound_calls_recorder
+
+logger = logging.getLogger(__name__)
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Outbound calls metrics in prometheus text format, closed while METRICS_TOKEN not set."""
+    if not settings.METRICS_TOKEN or request.headers.get("Authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return HttpResponse(status=401)
+    try:
+        content = get_outbound_calls_recorder().render()
+    except RedisError:
+        logger.warning("Cant collect metrics from redis", exc_info=True)
+        return HttpResponse(status=503)
+    return HttpResponse(content, content_type="text/plain; version=0.0.4; charset=utf-8")
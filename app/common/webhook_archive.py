@@ -0,0 +1,115 @@
+import gzip
+import json
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from django.apps import apps
+from django.db import models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def compress_request_data(headers: dict[str, Any], payload: dict[str, Any]) -> bytes:
+    data = json.dumps({"headers": headers, "payload": payload}, separators=(",", ":"))
+    return gzip.compress(data.encode(), compresslevel=6)
+
+
+def decompress_request_data(archived_data: bytes) -> dict[str, Any]:
+    """Return {"headers": ..., "payload": ...} of archived webhook request."""
+    return json.loads(gzip.decompress(archived_data))
+
+
+@dataclass
+class ArchiveResult:
+    archived_count: int = 0
+    deleted_count: int = 0
+
+
+class WebhookRequestArchiver:
+    """Keep webhook request logs compact: old requests archived, expired deleted.
+
+    Headers and payload of requests older than archive_after_days moved into gzip archived_data,
+    requests older than retention_days (0 - keep forever) deleted. Work done by pk batches,
+    so locks and memory not depend on table size.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        model: type[models.Model],
+        archive_after_days: int,
+        retention_days: int,
+        delete_filter: models.Q | None = None,
+    ):
+        self.model = model
+        self.archive_after_days = archive_after_days
+        self.retention_days = retention_days
+        # requests which can be deleted, others only archived (referenced by other models)
+        self.delete_filter = delete_filter if delete_filter is not None else models.Q()
+
+    @property
+    def objects(self) -> models.Manager[Any]:
+        return self.model.objects  # type: ignore[attr-defined]
+
+    def archive(self) -> int:
+        border = timezone.now() - timedelta(days=self.archive_after_days)
+        queryset = self.objects.filter(created__lt=border, archived_data__isnull=True).order_by("pk")
+        archived_count = 0
+        while requests_data := list(queryset.only("pk", "headers", "payload")[: self.BATCH_SIZE]):
+            for request_data in requests_data:
+                request_data.archived_data = compress_request_data(
+                    headers=request_data.headers,
+                    payload=request_data.payload,
+                )
+                request_data.headers = {}
+                request_data.payload = {}
+            self.objects.bulk_update(requests_data, fields=["archived_data", "headers", "payload"])
+            archived_count += len(requests_data)
+        return archived_count
+
+    def delete_expired(self) -> int:
+        if self.retention_days <= 0:
+            return 0
+        border = timezone.now() - timedelta(days=self.retention_days)
+        queryset = self.objects.filter(self.delete_filter, created__lt=border).order_by("pk")
+        deleted_count = 0
+        while pks := list(queryset.values_list("pk", flat=True)[: self.BATCH_SIZE]):
+            self.objects.filter(pk__in=pks).delete()
+            deleted_count += len(pks)
+        return deleted_count
+
+    def run(self) -> ArchiveResult:
+        result = ArchiveResult(deleted_count=self.delete_expired(), archived_count=self.archive())
+        logger.info(
+            "Webhook requests %s: archived %s, deleted %s",
+            self.model._meta.label,  # noqa: SLF001
+            result.archived_count,
+            result.deleted_count,
+        )
+        return result
+
+
+# webhook request logs by model label, with filter of requests which can be deleted
+WEBHOOK_REQUEST_MODELS: dict[str, models.Q | None] = {
+    "asana.AsanaWebhookRequestData": None,
+    "comment_notifier.AsanaWebhookRequestData": None,
+    # completed tasks history kept with its requests
+    "vga_lands.AsanaWebhookRequestData": models.Q(completedtask__isnull=True),
+}
+
+
+def archive_webhook_requests(archive_after_days: int, retention_days: int) -> dict[str, ArchiveResult]:
+    """Archive and delete expired requests of all webhook request logs, return results by model label."""
+    return {
+        label: WebhookRequestArchiver(
+            model=apps.get_model(label),
+            archive_after_days=archive_after_days,
+            retention_days=retention_days,
+            delete_filter=delete_filter,
+        ).run()
+        for label, delete_filter in WEBHOOK_REQUEST_MODELS.items()
+    }
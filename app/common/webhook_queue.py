@@ -0,0 +1,222 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from celery import Task, group, shared_task, signature
+from django.apps import apps
+from django.db import models, transaction
+from redis import Redis, RedisError
+
+from .exception import WebhookQueueBusyError
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueuedWebhook:
+    # pk of object webhook belongs to (webhook, project)
+    owner_id: int
+    headers: dict[str, str]
+    payload: dict[str, Any]
+
+
+class WebhookQueue:
+    """Buffer of received webhook requests in redis list, saved to model and sent to process task.
+
+    View pushes request and returns, consumer task saves requests of burst by one bulk insert.
+    Consumer scheduled by first push after previous consumer started, so one consumer per burst.
+
+    Model must have headers, payload, is_dispatched fields and owner foreign key. Requests delivered
+    at least once: batch moved (LMOVE) to processing list and removed from it only after insert, so
+    requests of died consumer saved by next one; requests saved twice if consumer died between insert
+    and removal, their events dropped by event deduplication. Saved requests marked dispatched after
+    process tasks sent, not dispatched ones sent by next consumer run.
+    """
+
+    KEY_PREFIX = "webhooks"
+    # seconds, requests received during delay saved by one consumer run
+    CONSUMER_COUNTDOWN = 1
+    # scheduled consumer lost (worker restart): flag expires and next push schedules new one
+    CONSUMER_SCHEDULED_TTL = 60
+    # one consumer at a time, lock of died consumer expires, prolonged by each batch
+    CONSUMER_LOCK_TTL = 60
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        name: str,
+        model: type[models.Model],
+        owner_field: str,
+        process_task_name: str,
+        redis: Redis | None = None,
+    ):
+        self.name = name
+        self.model = model
+        self.owner_field = owner_field
+        # celery task called with pk of saved request
+        self.process_task_name = process_task_name
+        self._redis = redis
+
+    @property
+    def key(self) -> str:
+        return f"{self.KEY_PREFIX}:{self.name}"
+
+    @property
+    def processing_key(self) -> str:
+        return f"{self.key}:processing"
+
+    @property
+    def consumer_scheduled_key(self) -> str:
+        return f"{self.key}:consumer_scheduled"
+
+    @property
+    def consumer_lock_key(self) -> str:
+        return f"{self.key}:consumer_lock"
+
+    @property
+    def consumer_kwargs(self) -> dict[str, str]:
+        return {
+            "name": self.name,
+            "model_label": self.model._meta.label,  # noqa: SLF001
+            "owner_field": self.owner_field,
+            "process_task_name": self.process_task_name,
+        }
+
+    @property
+    def redis(self) -> Redis | None:
+        return self._redis if self._redis is not None else get_redis()
+
+    @property
+    def objects(self) -> models.Manager[Any]:
+        return self.model.objects  # type: ignore[attr-defined]
+
+    def push(self, webhook: QueuedWebhook) -> bool:
+        """Push webhook request to queue and schedule consumer celery task if not scheduled.
+
+        Return False if redis not available, caller must save request itself.
+        Request pushed to queue is never saved by caller, so it is not saved twice.
+        """
+        redis = self.redis
+        if redis is None:
+            return False
+        try:
+            redis.rpush(self.key, json.dumps(asdict(webhook)))
+        except RedisError:
+            logger.warning("Webhook queue %s: redis error, request saved synchronously", self.name, exc_info=True)
+            return False
+        try:
+            is_consumer_needed = redis.set(self.consumer_scheduled_key, 1, nx=True, ex=self.CONSUMER_SCHEDULED_TTL)
+        except RedisError:
+            # extra consumer finds empty queue, missed consumer leaves request in queue
+            logger.warning("Webhook queue %s: redis error, consumer scheduled anyway", self.name, exc_info=True)
+            is_consumer_needed = True
+        if is_consumer_needed:
+            ingest_webhooks_task.apply_async(  # type: ignore[attr-defined]
+                kwargs=self.consumer_kwargs,
+                countdown=self.CONSUMER_COUNTDOWN,
+            )
+        return True
+
+    def _build(self, raw_item: bytes) -> models.Model:
+        webhook = QueuedWebhook(**json.loads(raw_item))
+        return self.model(
+            **{f"{self.owner_field}_id": webhook.owner_id},
+            headers=webhook.headers,
+            payload=webhook.payload,
+            is_dispatched=False,
+        )
+
+    def _move_batch(self, redis: Redis) -> list[bytes]:
+        # batch of died consumer saved first
+        processing_items: list[bytes] = redis.lrange(self.processing_key, 0, -1)  # type: ignore[assignment]
+        if processing_items:
+            logger.warning("Webhook queue %s: %s requests of previous consumer", self.name, len(processing_items))
+            return processing_items
+        queued_count: int = redis.llen(self.key)  # type: ignore[assignment]
+        if not queued_count:
+            return []
+        pipeline = redis.pipeline(transaction=False)
+        for _ in range(min(queued_count, self.BATCH_SIZE)):
+            pipeline.lmove(self.key, self.processing_key, "LEFT", "RIGHT")
+        return [item for item in pipeline.execute() if item is not None]
+
+    def consume(self) -> int:
+        """Save all queued requests by bulk inserts and send them to process task, return count of saved requests.
+
+        Batch left in processing list if it cant be saved, consumer task must be retried to save it.
+
+        Raises:
+             RedisError: if cant read queue
+             WebhookQueueBusyError: if queue consumed by other consumer
+
+        """
+        redis = self.redis
+        if redis is None:
+            self.dispatch_pending()
+            return 0
+        if not redis.set(self.consumer_lock_key, 1, nx=True, ex=self.CONSUMER_LOCK_TTL):
+            msg = f"Webhook queue {self.name} consumed by other consumer"
+            raise WebhookQueueBusyError(msg)
+        try:
+            # pushes after this point schedule next consumer
+            redis.delete(self.consumer_scheduled_key)
+            self.dispatch_pending()
+            saved_count = 0
+            while raw_items := self._move_batch(redis=redis):
+                objects = self.objects.bulk_create(self._build(raw_item=item) for item in raw_items)
+                redis.delete(self.processing_key)
+                redis.expire(self.consumer_lock_key, self.CONSUMER_LOCK_TTL)
+                logger.info("Webhook queue %s: saved %s requests", self.name, len(objects))
+                saved_count += len(objects)
+                self.dispatch_pending()
+        finally:
+            redis.delete(self.consumer_lock_key)
+        return saved_count
+
+    def dispatch_pending(self) -> int:
+        """Send saved not dispatched requests to process task, return count of sent requests.
+
+        Rows locked while sent, so concurrent calls dont send request twice.
+        """
+        dispatched_count = 0
+        while True:
+            with transaction.atomic():
+                pks = list(
+                    self.objects.filter(is_dispatched=False)
+                    .select_for_update(skip_locked=True)
+                    .order_by("pk")
+                    .values_list("pk", flat=True)[: self.BATCH_SIZE],
+                )
+                if not pks:
+                    return dispatched_count
+                group(signature(self.process_task_name, args=(pk,)) for pk in pks).apply_async()
+                self.objects.filter(pk__in=pks).update(is_dispatched=True)
+            dispatched_count += len(pks)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def ingest_webhooks_task(
+    self: Task,  # type: ignore[type-arg]
+    name: str,
+    model_label: str,
+    owner_field: str,
+    process_task_name: str,
+) -> int | None:
+    """Save webhook requests queued by view and start their processing, retried while queue cant be saved."""
+    webhook_queue = WebhookQueue(
+        name=name,
+        model=apps.get_model(model_label),
+        owner_field=owner_field,
+        process_task_name=process_task_name,
+    )
+    try:
+        return webhook_queue.consume()
+    except WebhookQueueBusyError as error:
+        # other consumer saves queued requests, check queue after its lock expired
+        self.retry(exc=error, countdown=WebhookQueue.CONSUMER_LOCK_TTL)
+        return None
+    except Exception as error:  # noqa: BLE001
+        self.retry(exc=error)
+        return None
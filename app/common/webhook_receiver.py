@@ -0,0 +1,139 @@
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+from cachetools import TTLCache
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Hook-Signature"
+SECRET_HEADER = "X-Hook-Secret"  # noqa: S105
+
+
+def is_valid_signature(secret: str, body: bytes, signature: str) -> bool:
+    """Check asana X-Hook-Signature: hex HMAC-SHA256 of raw body by webhook secret, in constant time."""
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+@dataclass(frozen=True)
+class WebhookOwner:
+    """Snapshot of model webhook belongs to (webhook, project)."""
+
+    pk: int
+    name: str
+    secret: str
+
+
+class WebhookOwnerCache:
+    """Owners by name for TTL seconds, not existing names cached too.
+
+    Requests with wrong signature rejected without db queries. Cache of process cleared
+    by save or delete of any owner, other processes see changes after TTL.
+    """
+
+    TTL = 60
+
+    def __init__(self, model: type[models.Model], maxsize: int = 1024):
+        self.model = model
+        self._owners: TTLCache[str, WebhookOwner | None] = TTLCache(maxsize=maxsize, ttl=self.TTL)
+        self._lock = threading.Lock()
+        post_save.connect(self._clear, sender=model, weak=False)
+        post_delete.connect(self._clear, sender=model, weak=False)
+
+    def _clear(self, **kwargs: Any) -> None:  # noqa: ANN401
+        _ = kwargs
+        with self._lock:
+            self._owners.clear()
+
+    def get(self, name: str) -> WebhookOwner | None:
+        with self._lock:
+            if name in self._owners:
+                return self._owners[name]
+        values = self.model.objects.filter(name=name).values("pk", "name", "secret").first()  # type: ignore[attr-defined]
+        owner = WebhookOwner(**values) if values is not None else None
+        with self._lock:
+            self._owners[name] = owner
+        return owner
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            self._owners.pop(name, None)
+
+
+class AsanaWebhookReceiverView(ABC, APIView):
+    """Receiver of asana webhook requests of owner model with "name" and "secret" fields.
+
+    Handshake request (X-Hook-Secret) saves secret. Other requests must have valid X-Hook-Signature
+    of raw body, request rejected before body parsed. Body parsed once and passed to handle_webhook.
+    """
+
+    owner_model: ClassVar[type[models.Model]]
+    owner_url_kwarg: ClassVar[str]
+    authentication_classes = ()
+    _owner_caches: ClassVar[dict[type[models.Model], WebhookOwnerCache]] = {}
+
+    @classmethod
+    def get_owner_cache(cls) -> WebhookOwnerCache:
+        if cls.owner_model not in cls._owner_caches:
+            cls._owner_caches[cls.owner_model] = WebhookOwnerCache(model=cls.owner_model)
+        return cls._owner_caches[cls.owner_model]
+
+    @abstractmethod
+    def handle_webhook(self, owner: WebhookOwner, headers: dict[str, str], payload: dict[str, Any]) -> None:
+        pass
+
+    def post(self, request: Request, format: str | None = None, **kwargs: str) -> Response:  # noqa: A002
+        _ = format
+        owner = self.get_owner_cache().get(name=kwargs[self.owner_url_kwarg])
+        if owner is None:
+            raise Http404
+        header_secret = request.headers.get(SECRET_HEADER)
+        if header_secret and owner.secret == "":
+            return self.create_webhook_response(owner=owner, secret=header_secret)
+        if owner.secret == "":
+            data = {
+                "success": False,
+                "message": f"Webhook {owner.name} has no secret key!",
+            }
+            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
+        body = request.body
+        if not is_valid_signature(secret=owner.secret, body=body, signature=request.headers.get(SIGNATURE_HEADER, "")):
+            logger.warning("Invalid webhook signature: %s", owner.name)
+            return Response(data={"success": False}, status=status.HTTP_401_UNAUTHORIZED)
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return Response(data={"success": False}, status=status.HTTP_400_BAD_REQUEST)
+        self.handle_webhook(owner=owner, headers=dict(request.headers), payload=payload)
+        data = {
+            "success": True,
+            "method": request.method,
+            "headers": request.headers,
+        }
+        response = Response(data=data)
+        response[SECRET_HEADER] = owner.secret
+        return response
+
+    def create_webhook_response(self, owner: WebhookOwner, secret: str) -> Response:
+        self.owner_model.objects.filter(pk=owner.pk).update(secret=secret)  # type: ignore[attr-defined]
+        self.get_owner_cache().invalidate(name=owner.name)
+        data = {
+            "status": True,
+            "message": f"webhook created for project {owner.name}",
+        }
+        response = Response(data=data, status=status.HTTP_201_CREATED)
+        response[SECRET_HEADER] = secret
+        return response
@@ -12,6 +12,7 @@ from django.utils.html import format_html
 from .models import Creative, CreativeAdaptation, CreativeGeoData, CreativeProjectSection, Task
 from .services import CreativeProjectSectionService, CreativeService
 
+# admin actions refresh data manually, so responses are not cached
 asana_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
 creative_service = CreativeService(asana_api_client=asana_client)
 logging.basicConfig(level=logging.INFO)
@@ -113,11 +114,11 @@ class CreativeGeoDataAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
 
 @admin.register(CreativeProjectSection)
 class CreativeProjectSectionAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
-    list_display = ("section_id", "section_name", "project_name", "created")
-    search_fields = ("section_id", "section_name", "project_name")
+    list_display = ("section_id", "section_name", "project_name", "is_fully_scanned", "created")
+    search_fields = ("section_id", "section_name", "project_id", "project_name")
     list_filter = ("project_name",)
     ordering = ("-created",)
-    readonly_fields = ("section_name", "project_name")
+    readonly_fields = ("section_name", "project_id", "project_name")
 
     def save_model(
         self,
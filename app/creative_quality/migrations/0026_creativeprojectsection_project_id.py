@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("creative_quality", "0025_rename_is_completed_task_is_completed_in_asana"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="creativeprojectsection",
+            name="project_id",
+            field=models.CharField(blank=True, max_length=30),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("creative_quality", "0026_creativeprojectsection_project_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="creativeprojectsection",
+            name="is_fully_scanned",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -293,10 +293,18 @@ class CreativeProjectSection(models.Model):
         max_length=254,
         blank=True,
     )
+    project_id = models.CharField(
+        max_length=30,
+        blank=True,
+    )
     project_name = models.CharField(
         max_length=254,
         blank=True,
     )
+    # all tasks of section loaded once, after that section synced by project events
+    is_fully_scanned = models.BooleanField(
+        default=False,
+    )
     created = models.DateTimeField(
         auto_now_add=True,
     )
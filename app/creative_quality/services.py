@@ -1,8 +1,10 @@
 import logging
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import timedelta
+from typing import Any
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, BatchAction, BatchActionResult, TaskProjection
 from asana.client.exception import AsanaApiClientError, AsanaForbiddenError, AsanaNotFoundError
 from common import MessageRenderer
 from constance import config
@@ -30,12 +32,48 @@ class CreativeProjectSectionService:
         """
         section_data = self.asana_api_client.get_section(section_id=creative_project_section.section_id)
         creative_project_section.section_name = section_data["name"]
+        creative_project_section.project_id = section_data["project"]["gid"]
         creative_project_section.project_name = section_data["project"]["name"]
         creative_project_section.save()
 
-    def fetch_tasks_ids(self, creative_project_section: CreativeProjectSection) -> list[str]:
-        section_tasks = self.asana_api_client.get_section_tasks(section_id=creative_project_section.section_id)
-        return [task["gid"] for task in section_tasks]
+    def get_project_id(self, creative_project_section: CreativeProjectSection) -> str:
+        """Return id of section project, loaded from asana if not saved yet.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        if not creative_project_section.project_id:
+            self.update_additional_info(creative_project_section=creative_project_section)
+        return creative_project_section.project_id
+
+    def fetch_tasks_ids(self, creative_project_section: CreativeProjectSection) -> Iterator[str]:
+        """Lazily fetch ids of all section tasks page by page.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        section_tasks = self.asana_api_client.iter_section_tasks(
+            section_id=creative_project_section.section_id,
+            opt_fields=["gid"],
+        )
+        return (task["gid"] for task in section_tasks)
+
+    def get_added_tasks_ids(
+        self,
+        creative_project_section: CreativeProjectSection,
+        events: list[dict[str, Any]],
+    ) -> Iterator[str]:
+        """Return ids of tasks added or moved to section by events of section project."""
+        for event in events:
+            parent = event.get("parent") or {}
+            if (
+                event.get("action") == "added"
+                and event["resource"].get("resource_type") == "task"
+                and parent.get("gid") == creative_project_section.section_id
+            ):
+                yield event["resource"]["gid"]
 
 
 @dataclass(frozen=True)
@@ -54,11 +92,13 @@ class CreativeTaskData:
 
 
 class CreativeService:
+    # each task needs 2 batch actions, asana batch accepts 10 actions
+    TASKS_PER_BATCH = 5
+
     def __init__(self, asana_api_client: AsanaApiClient):
         self.asana_api_client = asana_api_client
 
-    def _get_task_dto(self, creative_task: Task) -> CreativeTaskData:
-        task_data = self.asana_api_client.get_task(task_id=creative_task.task_id)
+    def _task_data_to_dto(self, task_data: dict[str, Any]) -> CreativeTaskData:
         assignee_id = "" if task_data["assignee"] is None else task_data["assignee"]["gid"]
         task_name = task_data["name"]
         url = task_data["permalink_url"]
@@ -82,10 +122,43 @@ class CreativeService:
             completed=completed,
         )
 
+    def _get_task_dto(self, creative_task: Task) -> CreativeTaskData:
+        task_data = self.asana_api_client.get_task(task_id=creative_task.task_id, projection=TaskProjection.CREATIVE)
+        return self._task_data_to_dto(task_data=task_data)
+
     def _get_sub_tasks(self, creative_task: Task) -> list[CreativeSubTask]:
         sub_tasks_data = self.asana_api_client.get_sub_tasks(task_id=creative_task.task_id)
         return [CreativeSubTask(name=sub_task["name"]) for sub_task in sub_tasks_data]
 
+    def _get_task_batch_actions(self, creative_task: Task) -> list[BatchAction]:
+        return [
+            BatchAction.get(f"/tasks/{creative_task.task_id}", projection=TaskProjection.CREATIVE),
+            BatchAction.get(
+                f"/tasks/{creative_task.task_id}/subtasks",
+                opt_fields=["name"],
+                limit=AsanaApiClient.PAGE_LIMIT,
+            ),
+        ]
+
+    def _parse_task_batch_results(
+        self,
+        creative_task: Task,
+        task_result: BatchActionResult,
+        sub_tasks_result: BatchActionResult,
+    ) -> tuple[CreativeTaskData, list[CreativeSubTask]]:
+        """Convert batch results to task data.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        task_dto = self._task_data_to_dto(task_data=task_result.get_data())
+        if sub_tasks_result.has_next_page:
+            # more subtasks than one page, load all by paginator
+            return task_dto, self._get_sub_tasks(creative_task=creative_task)
+        sub_tasks = [CreativeSubTask(name=sub_task["name"]) for sub_task in sub_tasks_result.get_data()]
+        return task_dto, sub_tasks
+
     def update_task(self, creative_task: Task, task_dto: CreativeTaskData, *, save: bool = True) -> Task:
         creative_task.assignee_id = task_dto.assignee_id
         creative_task.bayer_code = task_dto.bayer_code.strip().lower() if task_dto.bayer_code else ""
@@ -97,34 +170,83 @@ class CreativeService:
             creative_task.save()
         return creative_task
 
-    def create_creative(self, creative_task: Task) -> Creative | None:
+    def _save_creative(
+        self,
+        creative_task: Task,
+        task_dto: CreativeTaskData,
+        sub_tasks: list[CreativeSubTask],
+    ) -> Creative:
+        with transaction.atomic():
+            creative_task = self.update_task(creative_task=creative_task, task_dto=task_dto, save=False)
+            creative_task.status = TaskStatus.CREATED
+            creative_task.save()
+            need_rated_at = creative_task.created + timedelta(days=config.NEED_RATED_AT)
+            creative = Creative.objects.create(task=creative_task, need_rated_at=need_rated_at)
+            if len(sub_tasks) == 0:
+                sub_tasks = [CreativeSubTask(name=task_dto.name)]
+            creative_adaptations_to_create = []
+            for sub_task in sub_tasks:
+                creative_adaptation = CreativeAdaptation(
+                    name=sub_task.name,
+                    creative=creative,
+                )
+                creative_adaptations_to_create.append(creative_adaptation)
+            CreativeAdaptation.objects.bulk_create(creative_adaptations_to_create)
+            return creative
+
+    def _create_creative_from_results(
+        self,
+        creative_task: Task,
+        task_result: BatchActionResult,
+        sub_tasks_result: BatchActionResult,
+    ) -> Creative | None:
         try:
-            task_dto = self._get_task_dto(creative_task=creative_task)
-            sub_tasks = self._get_sub_tasks(creative_task=creative_task)
+            task_dto, sub_tasks = self._parse_task_batch_results(
+                creative_task=creative_task,
+                task_result=task_result,
+                sub_tasks_result=sub_tasks_result,
+            )
         except (AsanaNotFoundError, AsanaForbiddenError):
             creative_task.mark_deleted()
         except AsanaApiClientError:
             creative_task.mark_error_load_info()
         else:
-            with transaction.atomic():
-                creative_task = self.update_task(creative_task=creative_task, task_dto=task_dto, save=False)
-                creative_task.status = TaskStatus.CREATED
-                creative_task.save()
-                need_rated_at = creative_task.created + timedelta(days=config.NEED_RATED_AT)
-                creative = Creative.objects.create(task=creative_task, need_rated_at=need_rated_at)
-                if len(sub_tasks) == 0:
-                    sub_tasks = [CreativeSubTask(name=task_dto.name)]
-                creative_adaptations_to_create = []
-                for sub_task in sub_tasks:
-                    creative_adaptation = CreativeAdaptation(
-                        name=sub_task.name,
-                        creative=creative,
-                    )
-                    creative_adaptations_to_create.append(creative_adaptation)
-                CreativeAdaptation.objects.bulk_create(creative_adaptations_to_create)
-                return creative
+            return self._save_creative(creative_task=creative_task, task_dto=task_dto, sub_tasks=sub_tasks)
         return None
 
+    def create_creative(self, creative_task: Task) -> Creative | None:
+        return self.create_creatives(creative_tasks=[creative_task])[0]
+
+    def create_creatives(self, creative_tasks: Sequence[Task]) -> list[Creative | None]:
+        """Load tasks info by batch requests and create Creative for every task.
+
+        Result in order of creative_tasks, None if creative not created.
+        """
+        creatives: list[Creative | None] = []
+        for start in range(0, len(creative_tasks), self.TASKS_PER_BATCH):
+            tasks_chunk = creative_tasks[start : start + self.TASKS_PER_BATCH]
+            actions = [
+                action
+                for creative_task in tasks_chunk
+                for action in self._get_task_batch_actions(creative_task=creative_task)
+            ]
+            try:
+                results = self.asana_api_client.batch(actions)
+            except AsanaApiClientError:
+                logger.exception("Cant load tasks info by batch request")
+                for creative_task in tasks_chunk:
+                    creative_task.mark_error_load_info()
+                    creatives.append(None)
+                continue
+            for index, creative_task in enumerate(tasks_chunk):
+                creative = self._create_creative_from_results(
+                    creative_task=creative_task,
+                    task_result=results[index * 2],
+                    sub_tasks_result=results[index * 2 + 1],
+                )
+                creatives.append(creative)
+        return creatives
+
     def end_estimate(self, creative: Creative) -> None:
         creative.mark_rated()
         # make asana task complete
@@ -1,5 +1,6 @@
 # mypy: disable-error-code=type-arg
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, get_shared_response_cache
+from asana.services import AsanaEventsSyncService
 from celery import shared_task
 from celery.app.task import Task as CeleryTask
 from common import MessageRenderer
@@ -12,12 +13,13 @@ from .use_cases import (
     CreateCreativesForNewTasksUseCase,
     CreativesOverDueForEstimateUseCase,
     DataIntegrityCheckUseCase,
+    FetchMissingTasksResult,
     FetchMissingTasksUseCase,
     SendCreativesToGoogleSheetUseCase,
     SendEstimationMessageUseCase,
 )
 
-asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY)
+asana_api_client = AsanaApiClient(api_key=settings.ASANA_API_KEY, cache=get_shared_response_cache())
 message_sender = AtlasMessageSender(
     host=settings.MESSAGE_SENDER_HOST,
     api_key=settings.DOMAIN_MESSAGE_API_KEY,
@@ -55,9 +57,12 @@ def send_estimation_message_task() -> dict:
 
 
 @shared_task
-def fetch_missing_section_tasks_task() -> dict:
+def fetch_missing_section_tasks_task() -> FetchMissingTasksResult:
     creative_project_section_service = CreativeProjectSectionService(asana_api_client=asana_api_client)
-    use_case = FetchMissingTasksUseCase(creative_project_section_service=creative_project_section_service)
+    use_case = FetchMissingTasksUseCase(
+        creative_project_section_service=creative_project_section_service,
+        events_sync_service=AsanaEventsSyncService(asana_api_client=asana_api_client),
+    )
     return use_case.execute()
 
 
@@ -1,3 +1,4 @@
+from typing import Any
 from unittest.mock import Mock
 
 import pytest
@@ -13,12 +14,35 @@ class TestCreativeProjectSectionService:
         mock_sana = Mock(spec=AsanaApiClient)
         mock_sana.get_section.return_value = {
             "name": "111",
-            "project": {"name": "222"},
+            "project": {"gid": "200", "name": "222"},
         }
         service = CreativeProjectSectionService(asana_api_client=mock_sana)
         section = CreativeProjectSection.objects.create(section_id=100)
         service.update_additional_info(creative_project_section=section)
         section.refresh_from_db()
         assert section.section_name == "111"
+        assert section.project_id == "200"
         assert section.project_name == "222"
         mock_sana.get_section.assert_called_once_with(section_id=100)
+
+    def test_get_project_id(self) -> None:
+        mock_sana = Mock(spec=AsanaApiClient)
+        mock_sana.get_section.return_value = {"name": "111", "project": {"gid": "200", "name": "222"}}
+        service = CreativeProjectSectionService(asana_api_client=mock_sana)
+        section = CreativeProjectSection.objects.create(section_id="100")
+        assert service.get_project_id(creative_project_section=section) == "200"
+        # saved project id used without requests
+        assert service.get_project_id(creative_project_section=section) == "200"
+        mock_sana.get_section.assert_called_once_with(section_id="100")
+
+    def test_get_added_tasks_ids(self) -> None:
+        service = CreativeProjectSectionService(asana_api_client=Mock(spec=AsanaApiClient))
+        section = CreativeProjectSection(section_id="100")
+        events: list[dict[str, Any]] = [
+            {"action": "added", "resource": {"gid": "1", "resource_type": "task"}, "parent": {"gid": "100"}},
+            {"action": "removed", "resource": {"gid": "2", "resource_type": "task"}, "parent": {"gid": "100"}},
+            {"action": "added", "resource": {"gid": "3", "resource_type": "task"}, "parent": {"gid": "200"}},
+            {"action": "added", "resource": {"gid": "4", "resource_type": "story"}, "parent": {"gid": "1"}},
+            {"action": "changed", "resource": {"gid": "5", "resource_type": "task"}, "parent": None},
+        ]
+        assert list(service.get_added_tasks_ids(creative_project_section=section, events=events)) == ["1"]
@@ -4,7 +4,7 @@ from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, BatchAction, BatchActionResult
 from common import MessageRenderer
 from constance import config
 from constance.test import override_config
@@ -62,6 +62,33 @@ class TestCreativeService:
         creative_service.end_estimate(creative=creative)
         assert creative.mark_rated.called
 
+    def test_create_creatives_by_batch(self, creative_service: CreativeService) -> None:
+        tasks = [Task.objects.create(task_id=str(task_id)) for task_id in range(6)]
+        task_data = {"assignee": None, "name": "task", "permalink_url": "url", "completed": False}
+
+        def batch(actions: list[BatchAction]) -> list[BatchActionResult]:
+            results = []
+            for action in actions:
+                if action.relative_path == "/tasks/1":
+                    results.append(BatchActionResult(action=action, status_code=404, body=None))
+                elif action.relative_path.endswith("/subtasks"):
+                    body = {"data": [{"name": "adaptation 1"}, {"name": "adaptation 2"}]}
+                    results.append(BatchActionResult(action=action, status_code=200, body=body))
+                else:
+                    results.append(BatchActionResult(action=action, status_code=200, body={"data": task_data}))
+            return results
+
+        creative_service.asana_api_client.batch.side_effect = batch  # type: ignore[attr-defined]
+        creatives = creative_service.create_creatives(creative_tasks=tasks)
+        # 6 tasks, 2 actions per task, 5 tasks per batch request
+        assert creative_service.asana_api_client.batch.call_count == 2  # type: ignore[attr-defined]
+        assert creatives[1] is None
+        tasks[1].refresh_from_db()
+        assert tasks[1].status == TaskStatus.DELETED
+        created = [creative for creative in creatives if creative is not None]
+        assert len(created) == 5
+        assert created[0].adaptations.count() == 2
+
 
 @pytest.mark.django_db
 class TestSendEstimationMessageService:
@@ -0,0 +1,75 @@
+from unittest.mock import Mock
+
+import pytest
+from asana.constants import AsanaResourceType
+from asana.services import AsanaEventsSyncService, EventsDelta
+
+from creative_quality.models import CreativeProjectSection, Task
+from creative_quality.services import CreativeProjectSectionService
+from creative_quality.use_cases import FetchMissingTasksUseCase
+
+NEW_SYNC = "new"
+
+
+@pytest.mark.django_db
+def test_fetch_missing_tasks_by_project_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("creative_quality.use_cases.send_log_message_task", Mock())
+    CreativeProjectSection.objects.create(section_id="s1", project_id="p1", is_fully_scanned=True)
+    CreativeProjectSection.objects.create(section_id="s2", project_id="p1", is_fully_scanned=True)
+    events = [
+        {"action": "added", "resource": {"gid": "1", "resource_type": "task"}, "parent": {"gid": "s1"}},
+        {"action": "added", "resource": {"gid": "2", "resource_type": "task"}, "parent": {"gid": "s2"}},
+        {"action": "added", "resource": {"gid": "3", "resource_type": "task"}, "parent": {"gid": "p1"}},
+    ]
+    delta = EventsDelta(
+        resource_id="p1",
+        resource_type=AsanaResourceType.PROJECT,
+        events=events,
+        sync_token=NEW_SYNC,
+        is_full_rescan_required=False,
+    )
+    events_sync_service = Mock(spec=AsanaEventsSyncService)
+    events_sync_service.fetch.return_value = delta
+    asana_api_client = Mock()
+    use_case = FetchMissingTasksUseCase(
+        creative_project_section_service=CreativeProjectSectionService(asana_api_client=asana_api_client),
+        events_sync_service=events_sync_service,
+    )
+
+    result = use_case.execute()
+
+    assert result["new_found"] == ["1", "2"]
+    assert set(Task.objects.values_list("task_id", flat=True)) == {"1", "2"}
+    # sections of one project synced by one project events request
+    events_sync_service.fetch.assert_called_once_with(resource_id="p1", resource_type=AsanaResourceType.PROJECT)
+    events_sync_service.commit.assert_called_once_with(delta=delta)
+    asana_api_client.iter_section_tasks.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_new_section_fully_scanned_before_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("creative_quality.use_cases.send_log_message_task", Mock())
+    section = CreativeProjectSection.objects.create(section_id="s1", project_id="p1")
+    events_sync_service = Mock(spec=AsanaEventsSyncService)
+    events_sync_service.fetch.return_value = EventsDelta(
+        resource_id="p1",
+        resource_type=AsanaResourceType.PROJECT,
+        events=[{"action": "added", "resource": {"gid": "2", "resource_type": "task"}, "parent": {"gid": "s1"}}],
+        sync_token=NEW_SYNC,
+        is_full_rescan_required=False,
+    )
+    asana_api_client = Mock()
+    asana_api_client.iter_section_tasks.return_value = iter([{"gid": "1"}])
+    use_case = FetchMissingTasksUseCase(
+        creative_project_section_service=CreativeProjectSectionService(asana_api_client=asana_api_client),
+        events_sync_service=events_sync_service,
+    )
+
+    # tasks added to section before it was configured found by full scan
+    assert use_case.execute()["new_found"] == ["1"]
+    section.refresh_from_db()
+    assert section.is_fully_scanned
+
+    # scanned section synced by events
+    assert use_case.execute()["new_found"] == ["2"]
+    asana_api_client.iter_section_tasks.assert_called_once()
@@ -1,7 +1,11 @@
 import logging
-from typing import Any
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any, TypedDict
 
 import gspread
+from asana.constants import AsanaResourceType
+from asana.services import AsanaEventsSyncService, EventsDelta
 from django.conf import settings
 from django.db import IntegrityError
 from google.oauth2.service_account import Credentials
@@ -21,12 +25,9 @@ class CreateCreativesForNewTasksUseCase:
 
     def execute(self) -> dict[str, int]:
         """Load task info and create Creative."""
-        new_tasks = Task.objects.needs_update()
-        created_count = 0
-        for task in new_tasks:
-            creative = self.creative_service.create_creative(creative_task=task)
-            if creative is not None:
-                created_count += 1
+        new_tasks = list(Task.objects.needs_update())
+        creatives = self.creative_service.create_creatives(creative_tasks=new_tasks)
+        created_count = sum(creative is not None for creative in creatives)
         return {"created_count": created_count}
 
 
@@ -136,31 +137,91 @@ class SendCreativesToGoogleSheetUseCase:
         return dict(result)
 
 
+class FetchMissingTasksResult(TypedDict):
+    new_found: list[str]
+    with_errors: list[str]
+
+
 class FetchMissingTasksUseCase:
-    def __init__(self, creative_project_section_service: CreativeProjectSectionService):
+    def __init__(
+        self,
+        creative_project_section_service: CreativeProjectSectionService,
+        events_sync_service: AsanaEventsSyncService | None = None,
+    ):
         self.creative_project_section_service = creative_project_section_service
+        # without events sync service every section fully rescanned
+        self.events_sync_service = events_sync_service
 
-    def execute(self) -> dict[str, int | list[str]]:
-        logger.info("%s execute", self.__class__.__name__)
-        sections = CreativeProjectSection.objects.all()
-        new_found = []
-        with_errors = []
+    def _group_sections_by_project(
+        self,
+        sections: Iterable[CreativeProjectSection],
+    ) -> dict[str | None, list[CreativeProjectSection]]:
+        """Group sections by project id, asana events api not accepts sections so events synced by project.
+
+        Without events sync service project not needed, all sections in one group.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        if self.events_sync_service is None:
+            return {None: list(sections)}
+        sections_by_project: dict[str | None, list[CreativeProjectSection]] = defaultdict(list)
         for section in sections:
-            logger.info("Section: %s %s", section.section_id, section.section_name)
-            exist_task_ids = set(Task.objects.values_list("task_id", flat=True))
-            section_task_ids = self.creative_project_section_service.fetch_tasks_ids(
-                creative_project_section=section,
-            )
-            logger.info("Section tasks %s: %s", len(section_task_ids), section_task_ids)
-            for task_id in section_task_ids:
-                if task_id not in exist_task_ids:
-                    try:
-                        Task.objects.create(task_id=task_id)
-                        new_found.append(task_id)
-                        logger.info("Found new task: %s", task_id)
-                    except IntegrityError:
-                        logger.exception("Cant save task to db: %s", task_id)
-                        with_errors.append(task_id)
+            project_id = self.creative_project_section_service.get_project_id(creative_project_section=section)
+            sections_by_project[project_id].append(section)
+        return sections_by_project
+
+    def _fetch_section_tasks_ids(self, section: CreativeProjectSection, delta: EventsDelta | None) -> Iterator[str]:
+        """Return ids of tasks added since last sync or all section tasks ids on full rescan.
+
+        Section not scanned yet (added after project sync started) fully rescanned, events have only tasks
+        added after sync token.
+
+        Raises:
+             AsanaApiClientError: if cant get some data from asana
+
+        """
+        if delta is None or delta.is_full_rescan_required or not section.is_fully_scanned:
+            return self.creative_project_section_service.fetch_tasks_ids(creative_project_section=section)
+        return self.creative_project_section_service.get_added_tasks_ids(
+            creative_project_section=section,
+            events=delta.events,
+        )
+
+    def execute(self) -> FetchMissingTasksResult:
+        logger.info("%s execute", self.__class__.__name__)
+        sections_by_project = self._group_sections_by_project(sections=CreativeProjectSection.objects.all())
+        new_found: list[str] = []
+        with_errors: list[str] = []
+        for project_id, sections in sections_by_project.items():
+            delta = None
+            if self.events_sync_service is not None and project_id is not None:
+                delta = self.events_sync_service.fetch(resource_id=project_id, resource_type=AsanaResourceType.PROJECT)
+            for section in sections:
+                logger.info("Section: %s %s", section.section_id, section.section_name)
+                exist_task_ids = set(Task.objects.values_list("task_id", flat=True))
+                section_task_ids = self._fetch_section_tasks_ids(section=section, delta=delta)
+                section_tasks_count = 0
+                section_errors_count = 0
+                for task_id in section_task_ids:
+                    section_tasks_count += 1
+                    if task_id not in exist_task_ids:
+                        try:
+                            Task.objects.create(task_id=task_id)
+                            new_found.append(task_id)
+                            logger.info("Found new task: %s", task_id)
+                        except IntegrityError:
+                            logger.exception("Cant save task to db: %s", task_id)
+                            with_errors.append(task_id)
+                            section_errors_count += 1
+                logger.info("Section tasks: %s", section_tasks_count)
+                if not section.is_fully_scanned and section_errors_count == 0:
+                    section.is_fully_scanned = True
+                    section.save(update_fields=["is_fully_scanned"])
+            # token saved after all sections of project processed, events of project shared by sections
+            if self.events_sync_service is not None and delta is not None:
+                self.events_sync_service.commit(delta=delta)
         if any([new_found, with_errors]):
             message = (
                 f"⚠️ {self.__class__.__name__}:\n"
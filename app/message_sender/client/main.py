@@ -4,6 +4,7 @@ from functools import cached_property, wraps
 from typing import Any, Callable, NoReturn, TypeVar
 
 import requests
+from common.metrics import observe_call
 from requests.exceptions import HTTPError, RequestException
 
 from .exceptions import AtlasMessageSenderError
@@ -61,6 +62,12 @@ class AtlasMessageSender:
             },
         )
 
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+        with observe_call(service="message_sender", method=method, url=url) as call:
+            response = self.session.request(method, url, **kwargs)
+            call.set_response(response)
+        return response
+
     def _handle_error(self, handler_name: str, error: Exception) -> NoReturn:
         base = f"{AtlasMessageSenderError.__name__} {handler_name}:"
 
@@ -122,7 +129,7 @@ class AtlasMessageSender:
                 },
             )
         url = f"{self.base_url}/alert/custom"
-        response = self.session.post(url, json=data, timeout=timeout)
+        response = self._request("POST", url, json=data, timeout=timeout)
         response.raise_for_status()
         return response.json()
 
@@ -152,7 +159,7 @@ class AtlasMessageSender:
                 },
             )
         url = f"{self.base_url}/alert/custom"
-        response = self.session.post(url, json=data, timeout=timeout)
+        response = self._request("POST", url, json=data, timeout=timeout)
         response.raise_for_status()
         response_data = json.loads(response.text)
         if require_all and len(response_data["users"]) != len(user_tags):
@@ -189,7 +196,7 @@ class AtlasMessageSender:
 
     def users(self, timeout: int = REQUEST_TIMEOUT) -> list[UserData]:
         url = f"{self.base_url}/users"
-        response = self.session.get(url, timeout=timeout)
+        response = self._request("GET", url, timeout=timeout)
         response.raise_for_status()
         response_data = response.json().get("result", {}).get("users")
         if response_data is None:
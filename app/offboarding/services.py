@@ -2,7 +2,7 @@ import logging
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
-from asana.client import AsanaApiClient
+from asana.client import AsanaApiClient, TaskProjection
 from asana.client.exception import AsanaForbiddenError, AsanaNotFoundError
 from asana.constants import AsanaResourceType, AtlasProject
 from asana.models import AsanaWebhookRequestData
@@ -90,7 +90,10 @@ class NotifyOffboardingCreateTaskService:
 
         """
         try:
-            task_data: dict[str, Any] = self.asana_client.get_task(task_id=task.asana_task_id)
+            task_data: dict[str, Any] = self.asana_client.get_task(
+                task_id=task.asana_task_id,
+                projection=TaskProjection.OFFBOARDING,
+            )
             task_dto: TaskData = extract_offboarding_task_data(task_data)
             logger.debug("Task id: %s, %s", task.asana_task_id, task_dto)
             context = {
@@ -171,7 +174,7 @@ class OffboardingFinanceNotifierService:
         if is_target_subtasks_completed is False:
             logger.debug("Exit, no not completed target subtasks")
             return
-        task_data = self.asana_client.get_task(task_id=task.asana_task_id)
+        task_data = self.asana_client.get_task(task_id=task.asana_task_id, projection=TaskProjection.OFFBOARDING)
         try:
             task_dto: TaskData = extract_offboarding_task_data(task_data)
         except OffboardingAppError:
@@ -1,8 +1,10 @@
 from asana.client.exception import AsanaApiClientError
 from asana.client.main import AsanaApiClient
+from asana.constants import AsanaResourceType, AtlasProject
 from asana.models import AsanaWebhookRequestData
-from asana.webhook_actions.abstract import BaseWebhookAction, WebhookActionResult
+from asana.webhook_actions.abstract import BaseWebhookAction, EventFilter, WebhookActionResult
 from asana.webhook_actions.registry import register_webhook_action
+from constance import config
 from django.conf import settings
 from message_sender.client import AtlasMessageSender
 from message_sender.client.exceptions import AtlasMessageSenderError
@@ -22,6 +24,16 @@ message_sender = AtlasMessageSender(
     description="Offboarding project: Оповещение о новой карточки в проекте в чат HR",
 )
 class NotifyTaskCreateAction(BaseWebhookAction):
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...]:
+        return (
+            EventFilter(
+                resource_type=AsanaResourceType.TASK,
+                parent_type=AsanaResourceType.PROJECT,
+                parent_gids=frozenset({AtlasProject.OFFBOARDING.value}),
+            ),
+        )
+
     @retry(
         exceptions=(AsanaApiClientError, AtlasMessageSenderError),
         tries=3,
@@ -44,6 +56,16 @@ class NotifyTaskCreateAction(BaseWebhookAction):
     description="Offboarding project: Помечает таск завершенным",
 )
 class OffboardingTaskCompleteAction(BaseWebhookAction):
+    @classmethod
+    def get_event_filters(cls) -> tuple[EventFilter, ...]:
+        return (
+            EventFilter(
+                resource_type=AsanaResourceType.TASK,
+                parent_type=AsanaResourceType.SECTION,
+                parent_gids=frozenset({config.OFFBOARDING_COMPLETE_SECTION_ID}),
+            ),
+        )
+
     def handle(self, webhook_data: AsanaWebhookRequestData) -> WebhookActionResult:
         service = OffboardingTaskCompleteService()
         return service.detect_is_complete(webhook_data=webhook_data)
@@ -1,6 +1,7 @@
 import json
 from json.decoder import JSONDecodeError
 
+from common.admin import WebhookRequestAdminMixin
 from django.contrib import admin
 
 from .models import AsanaProject, AsanaWebhookRequestData, CompletedTask
@@ -13,9 +14,11 @@ class AsanaProjectAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
 
 
 @admin.register(AsanaWebhookRequestData)
-class AsanaWebhookRequestDataAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+class AsanaWebhookRequestDataAdmin(WebhookRequestAdminMixin, admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = ("id", "__str__", "is_target_event", "project__name", "created")
     list_display_links = ("id", "__str__")
+    list_select_related = ("project",)
+    readonly_fields = ("archived_request_data",)
 
 
 @admin.register(CompletedTask)
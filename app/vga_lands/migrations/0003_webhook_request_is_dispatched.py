@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:49
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes of big tables created without write lock
+    atomic = False
+
+    dependencies = [
+        ("vga_lands", "0002_webhook_request_archive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asanawebhookrequestdata",
+            name="is_dispatched",
+            field=models.BooleanField(default=True),
+        ),
+        AddIndexConcurrently(
+            model_name="asanawebhookrequestdata",
+            index=models.Index(
+                condition=models.Q(("is_dispatched", False)), fields=["is_dispatched"], name="vga_whreq_not_dispatched"
+            ),
+        ),
+    ]
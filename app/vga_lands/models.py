@@ -17,6 +17,21 @@ class AsanaWebhookRequestData(models.Model):
     headers = models.JSONField()
     payload = models.JSONField()
     is_target_event = models.BooleanField(null=True, default=None)
+    # False while saved by webhook queue and process task not sent
+    is_dispatched = models.BooleanField(default=True)
+    # gzip json of headers and payload of old request, fields itself cleared
+    archived_data = models.BinaryField(null=True, default=None, editable=False)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=("project", "is_target_event", "created"), name="vga_whreq_proj_target_created"),
+            models.Index(fields=("created",), name="vga_whreq_created"),
+            models.Index(
+                fields=("is_dispatched",),
+                condition=models.Q(is_dispatched=False),
+                name="vga_whreq_not_dispatched",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"<AsanaWebhookRequestData:{self.pk}>"
@@ -1,5 +1,8 @@
 from typing import Any
 
+from common.event_dedup import WebhookEventDeduplicator
+from django.db import transaction
+
 from .models import AsanaWebhookRequestData, CompletedTask
 
 SECTION_COMPLETE_ID = "1210393628043136"
@@ -15,15 +18,21 @@ def is_task_complete(event: dict[str, Any], target_section: str) -> bool:
 
 
 def completed_task_creator(asana_webhook_model: AsanaWebhookRequestData) -> list[CompletedTask]:
+    deduplicator = WebhookEventDeduplicator(scope=f"vga_lands:{asana_webhook_model.project_id}")
+    claimed = deduplicator.claim(events=asana_webhook_model.payload["events"])
     records = []
-    for event in asana_webhook_model.payload["events"]:
-        if is_task_complete(event=event, target_section=asana_webhook_model.project.complete_section_id):
-            completed_task = CompletedTask.objects.create(
-                webhook=asana_webhook_model,
-                event_data=event,
-                task_id=event["resource"]["gid"],
-                project=asana_webhook_model.project,
-            )
-            records.append(completed_task)
-
+    try:
+        with transaction.atomic():
+            for event in claimed.events:
+                if is_task_complete(event=event, target_section=asana_webhook_model.project.complete_section_id):
+                    completed_task = CompletedTask.objects.create(
+                        webhook=asana_webhook_model,
+                        event_data=event,
+                        task_id=event["resource"]["gid"],
+                        project=asana_webhook_model.project,
+                    )
+                    records.append(completed_task)
+    except Exception:
+        deduplicator.release(claimed=claimed)
+        raise
     return records
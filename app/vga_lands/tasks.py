@@ -1,4 +1,5 @@
 from celery import shared_task
+from common.webhook_queue import WebhookQueue
 from django.conf import settings
 from message_sender.client import AtlasMessageSender
 
@@ -16,3 +17,11 @@ def process_asana_webhook(asana_webhook_id: int) -> None:
     asana_webhook = AsanaWebhookRequestData.objects.select_related("project").get(pk=asana_webhook_id)
     use_case = ProcessAsanaWebhookUseCase()
     use_case.execute(asana_webhook=asana_webhook)
+
+
+webhook_queue = WebhookQueue(
+    name="vga_lands",
+    model=AsanaWebhookRequestData,
+    owner_field="project",
+    process_task_name=process_asana_webhook.name,  # type: ignore[attr-defined]
+)
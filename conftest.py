@@ -1,4 +1,5 @@
 import pytest
+from pytest_django.fixtures import SettingsWrapper
 from pytest_socket import disable_socket
 from rest_framework.test import APIClient
 
@@ -10,3 +11,18 @@ def pytest_runtest_setup() -> None:
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def disable_redis(settings: SettingsWrapper) -> None:
+    settings.REDIS_ENABLED = False
+
+
+@pytest.fixture(autouse=True)
+def clear_asana_user_identity_cache() -> None:
+    from asana.identity_cache import get_shared_user_identity_cache, reset_local_users_generation  # noqa: PLC0415
+    from asana.services import clear_comment_prettifier  # noqa: PLC0415
+
+    get_shared_user_identity_cache().clear_local()
+    reset_local_users_generation()
+    clear_comment_prettifier()